@@ -0,0 +1,1632 @@
+'''
+DESCRIPTION:
+    In-memory stand-in for the subset of maya.cmds and Maya's Python API
+    used by the Volume System, to run the tool outside Maya, for tests and
+    reproducible "commands per guide" benchmarks, see
+    volumeBenchmark.runCallBenchmark().
+
+    install() puts fake maya, maya.cmds, maya.OpenMaya, maya.api.OpenMaya
+    and maya.api.OpenMayaAnim modules in sys.modules, they must be installed
+    before volumeSystem is imported. Every cmds command and the API entry
+    points that touch the scene record call counts and time in the scene's
+    CallStats.
+
+    The scene keeps nodes, DAG hierarchy, attributes, dynamic attributes,
+    locks, connections, selection and anim curves. Transforms compose their
+    local matrix from translate / rotate / scale / rotateOrder / jointOrient,
+    without pivots or shear. A few utility nodes compute their outputs,
+    multMatrix, decomposeMatrix, quatToEuler, distanceBetween, multiplyDivide
+    and unitConversion, other outputs read 0. Anim curves interpolate
+    linearly, at the current time or in an MDGContext.
+    UI commands, dialogs, workspace controls, callbacks, do nothing.
+USAGE:
+    import volume_sys_velan.scripts.fakeMaya as fakeMaya
+
+    scene = fakeMaya.install()
+    import maya.cmds as cmds
+    cmds.createNode('joint', n='joint1')
+
+    scene.stats.reset()
+    ...
+    print(scene.stats.report())
+
+    fakeMaya.uninstall()
+'''
+
+import fnmatch
+import math
+import sys
+import time
+import types
+
+import numpy as np
+
+import volume_sys_velan.scripts.swingTwist as swingTwist
+
+
+# Node type : parent type, for ls(type=) and objectType(isType=)
+TYPE_PARENTS = {'dagNode'       : 'node',
+                'transform'     : 'dagNode',
+                'joint'         : 'transform',
+                'shape'         : 'dagNode',
+                'nurbsCurve'    : 'shape',
+                'mesh'          : 'shape',
+                'constraint'    : 'transform',
+                'aimConstraint' : 'constraint',
+                'animCurve'     : 'node',
+                'animCurveTL'   : 'animCurve',
+                'animCurveTA'   : 'animCurve',
+                'animCurveTU'   : 'animCurve',
+                'animCurveUL'   : 'animCurve',
+                'animCurveUA'   : 'animCurve',
+                'animCurveUU'   : 'animCurve'}
+
+ALIASES = {'t':'translate', 'tx':'translateX', 'ty':'translateY', 'tz':'translateZ',
+           'r':'rotate', 'rx':'rotateX', 'ry':'rotateY', 'rz':'rotateZ',
+           's':'scale', 'sx':'scaleX', 'sy':'scaleY', 'sz':'scaleZ',
+           'jo':'jointOrient', 'jox':'jointOrientX', 'joy':'jointOrientY', 'joz':'jointOrientZ',
+           'ro':'rotateOrder', 'v':'visibility', 'm':'matrix', 'im':'inverseMatrix',
+           'wm':'worldMatrix', 'wim':'worldInverseMatrix', 'pm':'parentMatrix', 'pim':'parentInverseMatrix'}
+
+_XYZ = ['X', 'Y', 'Z']
+
+COMPOUNDS = dict((attr, [attr+axis for axis in _XYZ]) for attr in [
+    'translate', 'rotate', 'scale', 'jointOrient', 'outputTranslate', 'outputRotate', 'outputScale',
+    'inputTranslate', 'inputRotate', 'inputScale', 'input1', 'input2', 'output', 'inRotate1', 'inRotate2',
+    'outRotate', 'inTranslate1', 'inTranslate2', 'outTranslate', 'point1', 'point2', 'output3D', 'position'])
+COMPOUNDS.update(dict((attr, [attr+axis for axis in 'RGB']) for attr in [
+    'outColor', 'color', 'colorIfTrue', 'colorIfFalse', 'input', 'output', 'min', 'max', 'outValue']
+    if attr not in COMPOUNDS))
+COMPOUNDS.update(dict((attr, [attr+axis for axis in 'XYZW']) for attr in ['outputQuat', 'inputQuat']))
+COMPOUND_PARENTS = dict((child, (attr, i)) for attr, children in COMPOUNDS.items() for i, child in enumerate(children))
+
+ANGLE_ATTRS = set(['rotate', 'jointOrient', 'outputRotate', 'inputRotate', 'inRotate1', 'inRotate2', 'outRotate'])
+
+# Array attrs addressed without an index, worldMatrix == worldMatrix[0]
+SINGLE_ARRAYS = set(['worldMatrix', 'worldInverseMatrix', 'parentMatrix', 'parentInverseMatrix', 'worldSpace', 'instObjGroups'])
+
+DAG_MATRICES = set(['matrix', 'inverseMatrix', 'worldMatrix', 'worldInverseMatrix', 'parentMatrix', 'parentInverseMatrix'])
+
+DEFAULTS = {'scaleX':1.0, 'scaleY':1.0, 'scaleZ':1.0, 'visibility':True, 'rotateOrder':0,
+            'input2X':1.0, 'input2Y':1.0, 'input2Z':1.0, 'operation':1, 'conversionFactor':1.0,
+            'outputScaleX':1.0, 'outputScaleY':1.0, 'outputScaleZ':1.0, 'radius':1.0, 'envelope':1.0}
+
+TRANSFORM_ATTRS = set(list(COMPOUNDS['translate']) + COMPOUNDS['rotate'] + COMPOUNDS['scale'] + COMPOUNDS['jointOrient'] +
+                      ['translate', 'rotate', 'scale', 'jointOrient', 'rotateOrder', 'visibility', 'radius', 'frozen', 'nodeState']
+                      + list(DAG_MATRICES))
+
+
+# Static attributes per node type, they exist before being set or connected.
+# Compound children are added below, types inherit the attrs of TYPE_PARENTS.
+NODE_ATTRS = {
+    'node'             : ['message', 'frozen', 'nodeState', 'caching'],
+    'dagNode'          : list(DAG_MATRICES) + ['visibility', 'instObjGroups', 'outlinerColor', 'useOutlinerColor'],
+    'nurbsCurve'       : ['create', 'local', 'worldSpace', 'controlPoints', 'lineWidth'],
+    'animCurve'        : ['input', 'output', 'keyTimeValue'],
+    'aimConstraint'    : ['target', 'constraintParentInverseMatrix', 'constraintRotate', 'constraintRotateOrder',
+                          'constraintTranslate', 'aimVector', 'upVector', 'worldUpType', 'worldUpVector', 'worldUpMatrix', 'offset'],
+    'blendMatrix'      : ['inputMatrix', 'target', 'envelope', 'outputMatrix'],
+    'clamp'            : ['input', 'min', 'max', 'output'],
+    'composeMatrix'    : ['inputTranslate', 'inputRotate', 'inputScale', 'inputQuat', 'inputRotateOrder',
+                          'useEulerRotation', 'outputMatrix'],
+    'condition'        : ['operation', 'firstTerm', 'secondTerm', 'colorIfTrue', 'colorIfFalse', 'outColor'],
+    'decomposeMatrix'  : ['inputMatrix', 'inputRotateOrder', 'outputTranslate', 'outputRotate', 'outputScale',
+                          'outputQuat', 'outputShear'],
+    'distanceBetween'  : ['point1', 'point2', 'inMatrix1', 'inMatrix2', 'distance'],
+    'motionPath'       : ['geometryPath', 'uValue', 'fractionMode', 'follow', 'frontAxis', 'upAxis', 'inverseFront',
+                          'inverseUp', 'worldUpType', 'worldUpVector', 'worldUpMatrix', 'bank', 'rotateOrder',
+                          'allCoordinates', 'rotate', 'orientMatrix'],
+    'multMatrix'       : ['matrixIn', 'matrixSum'],
+    'multiplyDivide'   : ['operation', 'input1', 'input2', 'output'],
+    'pairBlend'        : ['weight', 'rotInterpolation', 'inTranslate1', 'inTranslate2', 'inRotate1', 'inRotate2',
+                          'outTranslate', 'outRotate'],
+    'plusMinusAverage' : ['operation', 'input1D', 'input2D', 'input3D', 'output1D', 'output2D', 'output3D'],
+    'pointOnCurveInfo' : ['inputCurve', 'parameter', 'turnOnPercentage', 'position', 'normal', 'tangent',
+                          'normalizedTangent', 'normalizedNormal'],
+    'quatToEuler'      : ['inputQuat', 'inputRotateOrder', 'outputRotate'],
+    'remapValue'       : ['inputValue', 'inputMin', 'inputMax', 'outputMin', 'outputMax', 'value', 'color',
+                          'outValue', 'outColor'],
+    'time'             : ['outTime'],
+    'unitConversion'   : ['input', 'output', 'conversionFactor']}
+NODE_ATTRS = dict((nodeType, set(attrs + [child for attr in attrs for child in COMPOUNDS.get(attr, [])]))
+                  for nodeType, attrs in NODE_ATTRS.items())
+
+
+def nodeTypeAttrs(nodeType):
+    '''
+    Returns static attrs of a node type and the types it inherits from
+    '''
+    attrs = set(NODE_ATTRS['node'])
+    while nodeType:
+        attrs |= NODE_ATTRS.get(nodeType, set())
+        nodeType = TYPE_PARENTS.get(nodeType)
+    return attrs
+
+
+class CallStats(object):
+    '''
+    Call counts and seconds per command
+    '''
+    def __init__(self):
+        self.counts = {}
+        self.seconds = {}
+
+    def record(self, name, seconds):
+        self.counts[name] = self.counts.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def reset(self):
+        self.counts.clear()
+        self.seconds.clear()
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def snapshot(self):
+        '''
+        Returns {'calls', 'seconds', 'commands' : {name : {'calls', 'seconds'}}}
+        '''
+        return {'calls'    : self.total(),
+                'seconds'  : sum(self.seconds.values()),
+                'commands' : dict((name, {'calls':count, 'seconds':self.seconds[name]}) for name, count in self.counts.items())}
+
+    def report(self, top=20):
+        lines = ['%s call(s), %.3f s' % (self.total(), sum(self.seconds.values()))]
+        for name, count in sorted(self.counts.items(), key=lambda item: -item[1])[:top]:
+            lines.append('  %-32s %8s  %8.3f ms' % (name, count, self.seconds[name] * 1000.0))
+        return '\n'.join(lines)
+
+
+class Node(object):
+    def __init__(self, name, nodeType, parent=None):
+        self.name     = name
+        self.type     = nodeType
+        self.parent   = parent
+        self.children = []
+        self.values   = {}
+        self.dynamic  = {} # attr : {'type', 'default'}
+        self.locked   = set()
+        self.keys     = [] # Anim curve (time, value)
+
+    def isType(self, nodeType):
+        current = self.type
+        while current:
+            if current == nodeType:
+                return True
+            current = TYPE_PARENTS.get(current)
+        return False
+
+    def isDag(self):
+        return self.isType('dagNode')
+
+
+def attrName(attr):
+    '''
+    Returns normalized attr name, long names, outputRotate.outputRotateX as
+    outputRotateX, worldMatrix[0] as worldMatrix
+    '''
+    parts = attr.split('.')
+    if len(parts) > 1 and '[' not in parts[0]:
+        attr = parts[-1]
+    base, bracket, index = attr.partition('[')
+    base = ALIASES.get(base, base)
+    if bracket and base in SINGLE_ARRAYS:
+        return base
+    return base + bracket + index
+
+
+def _baseAttr(attr):
+    return attr.split('[')[0].split('.')[-1]
+
+
+def _matrix(values):
+    return np.reshape(np.asarray(values, dtype=np.float64), (4, 4))
+
+
+class FakeScene(object):
+    '''
+    In-memory Maya scene, see module description
+    '''
+    def __init__(self):
+        self.stats = CallStats()
+        self.reset()
+
+    def reset(self):
+        self.nodes = {}
+        self.sources = {} # destination plug : source plug
+        self.destinations = {} # source plug : [destination plugs]
+        self.selection = []
+        self.time = 1.0
+        self.contextTime = None
+        self.playback = {'minTime':1.0, 'maxTime':120.0, 'animationStartTime':1.0, 'animationEndTime':120.0, 'loop':'continuous',
+                         'playbackSpeed':1.0, 'maxPlaybackSpeed':0.0}
+        self.evaluationMode = 'off'
+        self.callbacks = {}
+        self.evaluating = set()
+        self.createNode('time', n='time1')
+
+    # Nodes
+    def uniqueName(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip('0123456789')
+        i = 1
+        while base+str(i) in self.nodes:
+            i += 1
+        return base+str(i)
+
+    def getNode(self, name, required=True):
+        if isinstance(name, (list, tuple)):
+            name = name[0]
+        node = self.nodes.get(str(name).split('.')[0].split('|')[-1])
+        if node is None and required:
+            raise ValueError('No object matches name: %s' % name)
+        return node
+
+    def fullPath(self, node):
+        path = []
+        while node is not None:
+            path.insert(0, node.name)
+            node = node.parent
+        return '|' + '|'.join(path)
+
+    def createNode(self, nodeType, n=None, name=None, p=None, parent=None, ss=False, skipSelect=False):
+        name = self.uniqueName(n or name or nodeType+'1')
+        parentNode = self.getNode(p or parent) if (p or parent) else None
+        node = Node(name, nodeType, parentNode)
+        if parentNode is not None:
+            parentNode.children.append(node)
+        self.nodes[name] = node
+        if node.isDag() and not (ss or skipSelect):
+            self.selection = [name]
+        return name
+
+    def deleteNode(self, node):
+        for child in list(node.children):
+            self.deleteNode(child)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        prefix = node.name + '.'
+        for destination in [plug for plug in self.sources if plug.startswith(prefix) or self.sources[plug].startswith(prefix)]:
+            self.disconnect(self.sources[destination], destination)
+        self.nodes.pop(node.name, None)
+        if node.name in self.selection:
+            self.selection.remove(node.name)
+
+    def reparent(self, node, parentNode, keepWorld=True):
+        world = self.worldMatrix(node) if keepWorld and node.isType('transform') else None
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parentNode
+        if parentNode is not None:
+            parentNode.children.append(node)
+        if world is not None:
+            self.setWorldMatrix(node, world)
+
+    # Plugs
+    def splitPlug(self, plug):
+        nodeName, _, attr = str(plug).partition('.')
+        if nodeName == '' and self.selection:# '.attr' is on the first selected node
+            nodeName = self.selection[0]
+        return self.getNode(nodeName), attrName(attr)
+
+    def plugName(self, plug):
+        node, attr = self.splitPlug(plug)
+        return node.name + '.' + attr
+
+    def connect(self, source, destination, force=False):
+        source = self.plugName(source)
+        destination = self.plugName(destination)
+        current = self.sources.get(destination)
+        if current == source:
+            raise RuntimeError('%s is already connected to %s' % (source, destination))
+        if current is not None:
+            if not force:
+                raise RuntimeError('%s already has an incoming connection from %s' % (destination, current))
+            self.disconnect(current, destination)
+        self.sources[destination] = source
+        self.destinations.setdefault(source, []).append(destination)
+
+    def disconnect(self, source, destination):
+        source = self.plugName(source)
+        destination = self.plugName(destination)
+        if self.sources.get(destination) != source:
+            raise RuntimeError('%s is not connected to %s' % (source, destination))
+        del self.sources[destination]
+        self.destinations[source].remove(destination)
+        if self.destinations[source] == []:
+            del self.destinations[source]
+
+    def sourcePlug(self, node, attr):
+        '''
+        Returns source plug of node.attr, through compound parent connections, or None
+        '''
+        source = self.sources.get(node.name+'.'+attr)
+        if source is not None:
+            return source
+        if attr in COMPOUND_PARENTS:
+            parent, index = COMPOUND_PARENTS[attr]
+            source = self.sources.get(node.name+'.'+parent)
+            if source is not None:
+                sourceNode, sourceAttr = source.split('.', 1)
+                children = COMPOUNDS.get(sourceAttr)
+                return sourceNode+'.'+(children[index] if children else sourceAttr+_XYZ[index])
+        return None
+
+    def value(self, node, attr):
+        '''
+        Returns value of node.attr, from its connection, computed outputs,
+        anim curves or stored values. Angles are in degrees.
+        '''
+        source = self.sourcePlug(node, attr)
+        if source is not None and source not in self.evaluating:
+            # A cycle reads the stored value, as Maya does after its cycle warning
+            self.evaluating.add(source)
+            try:
+                sourceNode, sourceAttr = self.splitPlug(source)
+                return self.value(sourceNode, sourceAttr)
+            finally:
+                self.evaluating.discard(source)
+
+        if node.isDag() and _baseAttr(attr) in DAG_MATRICES:
+            return self.dagMatrix(node, _baseAttr(attr)).flatten().tolist()
+        computed = self.compute(node, attr)
+        if computed is not None:
+            return computed
+        if attr in COMPOUNDS and attr not in node.values:
+            return tuple(self.value(node, child) for child in COMPOUNDS[attr])
+        if attr in node.values:
+            return node.values[attr]
+        if attr in node.dynamic:
+            return node.dynamic[attr]['default']
+        return DEFAULTS.get(attr, 0.0)
+
+    def setValue(self, node, attr, value):
+        if attr in COMPOUNDS and isinstance(value, (list, tuple)) and len(value) == len(COMPOUNDS[attr]):
+            for child, childValue in zip(COMPOUNDS[attr], value):
+                node.values[child] = childValue
+        else:
+            node.values[attr] = value
+
+    # Matrices
+    def localMatrix(self, node):
+        if not node.isType('transform'):
+            return np.eye(4)
+        translate = [self.value(node, 'translate'+axis) for axis in _XYZ]
+        rotate = np.radians([[self.value(node, 'rotate'+axis) for axis in _XYZ]])
+        scale = [self.value(node, 'scale'+axis) for axis in _XYZ]
+        order = swingTwist.ROTATE_ORDERS[int(self.value(node, 'rotateOrder'))]
+        matrix = swingTwist.eulerToMatrices(rotate, order)[0]
+        if node.isType('joint'):
+            orient = np.radians([[self.value(node, 'jointOrient'+axis) for axis in _XYZ]])
+            matrix = np.matmul(matrix, swingTwist.eulerToMatrices(orient, 'xyz')[0])
+        matrix[:3, :3] *= np.array(scale)[:, None]
+        matrix[3, :3] = translate
+        return matrix
+
+    def worldMatrix(self, node):
+        matrix = self.localMatrix(node)
+        parent = node.parent
+        while parent is not None:
+            matrix = np.matmul(matrix, self.localMatrix(parent))
+            parent = parent.parent
+        return matrix
+
+    def parentMatrix(self, node):
+        return self.worldMatrix(node.parent) if node.parent is not None else np.eye(4)
+
+    def dagMatrix(self, node, attr):
+        return {'matrix'              : lambda: self.localMatrix(node),
+                'inverseMatrix'       : lambda: np.linalg.inv(self.localMatrix(node)),
+                'worldMatrix'         : lambda: self.worldMatrix(node),
+                'worldInverseMatrix'  : lambda: np.linalg.inv(self.worldMatrix(node)),
+                'parentMatrix'        : lambda: self.parentMatrix(node),
+                'parentInverseMatrix' : lambda: np.linalg.inv(self.parentMatrix(node))}[attr]()
+
+    def setLocalMatrix(self, node, matrix):
+        matrix = _matrix(matrix)
+        scale = swingTwist.scales(matrix)[0]
+        rotation = swingTwist.rotationMatrices(matrix)
+        if node.isType('joint'):
+            orient = np.radians([[self.value(node, 'jointOrient'+axis) for axis in _XYZ]])
+            rotation = np.matmul(rotation, np.linalg.inv(swingTwist.eulerToMatrices(orient, 'xyz')[:, :3, :3]))
+        order = swingTwist.ROTATE_ORDERS[int(self.value(node, 'rotateOrder'))]
+        rotate = np.degrees(swingTwist.eulerFromMatrices(swingTwist.homogeneous(rotation), order)[0])
+        for i, axis in enumerate(_XYZ):
+            node.values['translate'+axis] = float(matrix[3, i])
+            node.values['rotate'+axis] = float(rotate[i])
+            node.values['scale'+axis] = float(scale[i])
+
+    def setWorldMatrix(self, node, matrix):
+        self.setLocalMatrix(node, np.matmul(_matrix(matrix), np.linalg.inv(self.parentMatrix(node))))
+
+    # Utility node outputs
+    def compute(self, node, attr):
+        nodeType = node.type
+        if nodeType == 'multMatrix' and attr == 'matrixSum':
+            indices = sorted(set(int(plug.split('[')[1].split(']')[0]) for plug in list(node.values) + [
+                             dst.split('.', 1)[1] for dst in self.sources if dst.startswith(node.name+'.')]
+                             if plug.startswith('matrixIn[')))
+            matrix = np.eye(4)
+            for index in indices:
+                matrix = np.matmul(matrix, _matrix(self.value(node, 'matrixIn[%s]' % index)))
+            return matrix.flatten().tolist()
+        if nodeType == 'decomposeMatrix' and attr.startswith('output'):
+            matrix = _matrix(self.value(node, 'inputMatrix')) if self.hasValue(node, 'inputMatrix') else np.eye(4)
+            rotation = swingTwist.homogeneous(swingTwist.rotationMatrices(matrix))
+            outputs = {'outputTranslate' : matrix[3, :3].tolist(),
+                       'outputRotate'    : np.degrees(swingTwist.eulerFromMatrices(rotation, 'xyz')[0]).tolist(),
+                       'outputScale'     : swingTwist.scales(matrix)[0].tolist(),
+                       'outputQuat'      : swingTwist.matricesToQuaternions(rotation)[0].tolist()}
+            return self._compoundOutput(outputs, attr)
+        if nodeType == 'quatToEuler' and attr.startswith('outputRotate'):
+            quat = [self.value(node, 'inputQuat'+axis) for axis in 'XYZW']
+            if not any(quat):
+                quat = [0.0, 0.0, 0.0, 1.0]
+            order = swingTwist.ROTATE_ORDERS[int(self.value(node, 'inputRotateOrder'))]
+            outputs = {'outputRotate' : np.degrees(swingTwist.quaternionsToEuler([quat], order)[0]).tolist()}
+            return self._compoundOutput(outputs, attr)
+        if nodeType == 'distanceBetween' and attr == 'distance':
+            point1 = np.array([self.value(node, 'point1'+axis) for axis in _XYZ], dtype=np.float64)
+            point2 = np.array([self.value(node, 'point2'+axis) for axis in _XYZ], dtype=np.float64)
+            if self.hasValue(node, 'inMatrix1'):
+                point1 = point1 + _matrix(self.value(node, 'inMatrix1'))[3, :3]
+            if self.hasValue(node, 'inMatrix2'):
+                point2 = point2 + _matrix(self.value(node, 'inMatrix2'))[3, :3]
+            return float(np.linalg.norm(point2 - point1))
+        if nodeType == 'multiplyDivide' and attr in ['output'+axis for axis in _XYZ]:
+            axis = attr[-1]
+            a, b = self.value(node, 'input1'+axis), self.value(node, 'input2'+axis)
+            operation = int(self.value(node, 'operation'))
+            if operation == 2:
+                return a / b if b else 0.0
+            if operation == 3:
+                return math.pow(a, b) if a > 0.0 or float(b).is_integer() else 0.0
+            return a * b if operation == 1 else a
+        if nodeType == 'unitConversion' and attr == 'output':
+            return self.value(node, 'input') * self.value(node, 'conversionFactor')
+        if node.isType('animCurve') and attr == 'output':
+            return self.evaluateCurve(node)
+        return None
+
+    def _compoundOutput(self, outputs, attr):
+        for parent, values in outputs.items():
+            if attr == parent:
+                return tuple(values)
+            if attr in COMPOUNDS[parent]:
+                return float(values[COMPOUNDS[parent].index(attr)])
+        return None
+
+    def hasValue(self, node, attr):
+        return attr in node.values or node.name+'.'+attr in self.sources
+
+    def evaluateCurve(self, node, frame=None):
+        if node.keys == []:
+            return 0.0
+        if frame is None:
+            driver = self.sources.get(node.name+'.input')
+            if driver is not None and not self.getNode(driver).isType('time'):
+                frame = self.value(*self.splitPlug(driver))
+            else:
+                frame = self.contextTime if self.contextTime is not None else self.time
+        times = [key[0] for key in node.keys]
+        values = [key[1] for key in node.keys]
+        return float(np.interp(frame, times, values))
+
+    def setKey(self, node, frame, value):
+        node.keys = sorted([key for key in node.keys if key[0] != frame] + [(float(frame), float(value))])
+
+
+# Commands, bound to the installed scene
+_SCENE = None
+
+# Short flags shared by all commands, the others are per command, see _flags()
+_FLAGS = {'q':'query', 'e':'edit', 'n':'name', 'typ':'type'}
+
+_COMMAND_FLAGS = {
+    'ls'              : {'sl':'selection', 'l':'long', 'tr':'transforms'},
+    'parent'          : {'w':'world', 'r':'relative'},
+    'listRelatives'   : {'p':'parent', 'c':'children', 'ad':'allDescendents', 'f':'fullPath', 's':'shapes'},
+    'getAttr'         : {'l':'lock', 'k':'keyable'},
+    'setAttr'         : {'l':'lock', 'k':'keyable', 'cb':'channelBox'},
+    'addAttr'         : {'ln':'longName', 'sn':'shortName', 'at':'attributeType', 'dt':'dataType', 'dv':'defaultValue', 'k':'keyable'},
+    'listAttr'        : {'ud':'userDefined'},
+    'deleteAttr'      : {'at':'attribute'},
+    'attributeQuery'  : {'ex':'exists', 'at':'attributeType'},
+    'connectAttr'     : {'f':'force'},
+    'listConnections' : {'s':'source', 'd':'destination', 'p':'plugs', 'c':'connections', 't':'type', 'scn':'skipConversionNodes'},
+    'listHistory'     : {'f':'future'},
+    'xform'           : {'ws':'worldSpace', 'os':'objectSpace', 'm':'matrix', 't':'translation', 'ro':'rotation'},
+    'select'          : {'r':'replace', 'add':'add', 'd':'deselect', 'cl':'clear', 'hi':'hierarchy'},
+    'objectType'      : {'i':'isType'},
+    'curve'           : {'p':'point', 'd':'degree'},
+    'aimConstraint'   : {'aim':'aimVector', 'u':'upVector', 'mo':'maintainOffset'},
+    'setKeyframe'     : {'at':'attribute', 't':'time', 'v':'value'},
+    'keyframe'        : {'at':'attribute', 't':'time', 'vc':'valueChange', 'ev':'eval'},
+    'playbackOptions' : {'min':'minTime', 'max':'maxTime', 'ast':'animationStartTime', 'aet':'animationEndTime'},
+    'evaluationManager' : {'m':'mode'},
+    'about'           : {'b':'batch', 'v':'version'},
+    'file'            : {'f':'force', 'sn':'sceneName'}}
+
+
+def _flags(kwargs, command):
+    aliases = dict(_FLAGS, **_COMMAND_FLAGS.get(command, {}))
+    return dict((aliases.get(key, key), value) for key, value in kwargs.items())
+
+
+def _names(args):
+    names = []
+    for arg in args:
+        if arg is None:
+            continue
+        if isinstance(arg, (list, tuple)):
+            names += _names(arg)
+        else:
+            names.append(str(arg))
+    return names
+
+
+def _ls(*args, **kwargs):
+    flags = _flags(kwargs, 'ls')
+    if flags.get('selection'):
+        nodes = [_SCENE.nodes[name] for name in _SCENE.selection if name in _SCENE.nodes]
+    elif args:
+        nodes = []
+        for pattern in _names(args):
+            pattern = pattern.split('.')[0].split('|')[-1]
+            if any(char in pattern for char in '*?['):
+                nodes += [node for name, node in _SCENE.nodes.items() if fnmatch.fnmatchcase(name, pattern)]
+            elif pattern in _SCENE.nodes:
+                nodes.append(_SCENE.nodes[pattern])
+    else:
+        nodes = list(_SCENE.nodes.values())
+
+    if flags.get('dag'):
+        expanded = []
+        for node in nodes:
+            if node.isDag():
+                stack = [node]
+                while stack:
+                    current = stack.pop(0)
+                    expanded.append(current)
+                    stack = current.children + stack
+        nodes = expanded
+    nodeTypes = flags.get('type')
+    if nodeTypes:
+        nodeTypes = [nodeTypes] if isinstance(nodeTypes, str) else nodeTypes
+        nodes = [node for node in nodes if any(node.isType(nodeType) for nodeType in nodeTypes)]
+    if flags.get('transforms'):
+        nodes = [node for node in nodes if node.isType('transform')]
+
+    result = []
+    for node in nodes:
+        name = _SCENE.fullPath(node) if flags.get('long') and node.isDag() else node.name
+        if name not in result:
+            result.append(name)
+    return result
+
+
+def _objExists(name):
+    node = _SCENE.getNode(name, required=False)
+    if node is None:
+        return False
+    if '.' in str(name):
+        attr = attrName(str(name).partition('.')[2])
+        return _attributeExists(node, attr)
+    return True
+
+
+def _attributeExists(node, attr):
+    base = attr.split('[')[0]
+    return (base in node.dynamic or base in node.values or base in COMPOUNDS and all(child in node.values for child in COMPOUNDS[base])
+            or node.isType('transform') and base in TRANSFORM_ATTRS
+            or base.split('.')[0] in nodeTypeAttrs(node.type))
+
+
+def _createNode(nodeType, **kwargs):
+    return _SCENE.createNode(nodeType, **dict((key, value) for key, value in kwargs.items() if key in ['n', 'name', 'p', 'parent', 'ss', 'skipSelect']))
+
+
+def _delete(*args, **kwargs):
+    for name in _names(args):
+        node = _SCENE.getNode(name, required=False)
+        if node is not None and node.name in _SCENE.nodes:
+            _SCENE.deleteNode(node)
+
+
+def _rename(old, new):
+    node = _SCENE.getNode(old)
+    new = _SCENE.uniqueName(new.split('|')[-1])
+    for plugs in [_SCENE.sources, _SCENE.destinations]:
+        for key in [key for key in plugs if key.split('.')[0] == node.name]:
+            plugs[new+key[len(node.name):]] = plugs.pop(key)
+    prefix = node.name+'.'
+    for key, value in list(_SCENE.sources.items()):
+        if value.startswith(prefix):
+            _SCENE.sources[key] = new+'.'+value[len(prefix):]
+    for key, values in _SCENE.destinations.items():
+        _SCENE.destinations[key] = [new+'.'+value[len(prefix):] if value.startswith(prefix) else value for value in values]
+    del _SCENE.nodes[node.name]
+    _SCENE.selection = [new if name == node.name else name for name in _SCENE.selection]
+    node.name = new
+    _SCENE.nodes[new] = node
+    return new
+
+
+def _parent(*args, **kwargs):
+    flags = _flags(kwargs, 'parent')
+    names = _names(args)
+    if flags.get('world'):
+        children, parentNode = names, None
+    else:
+        children, parentNode = names[:-1], _SCENE.getNode(names[-1])
+    result = []
+    for name in children:
+        node = _SCENE.getNode(name)
+        _SCENE.reparent(node, parentNode, keepWorld=not flags.get('relative'))
+        result.append(node.name)
+    return result
+
+
+def _listRelatives(*args, **kwargs):
+    flags = _flags(kwargs, 'listRelatives')
+    nodes = [_SCENE.getNode(name) for name in _names(args)] if args else [_SCENE.getNode(name) for name in _SCENE.selection]
+    result = []
+    for node in nodes:
+        if flags.get('parent') or flags.get('allParents'):
+            relatives = [node.parent] if node.parent is not None else []
+        elif flags.get('allDescendents'):
+            relatives = []
+            stack = list(node.children)
+            while stack:
+                current = stack.pop()
+                relatives.append(current)
+                stack += current.children
+        else:
+            relatives = list(node.children)
+        if flags.get('shapes'):
+            relatives = [relative for relative in relatives if relative.isType('shape')]
+        nodeTypes = flags.get('type')
+        if nodeTypes:
+            nodeTypes = [nodeTypes] if isinstance(nodeTypes, str) else nodeTypes
+            relatives = [relative for relative in relatives if any(relative.isType(nodeType) for nodeType in nodeTypes)]
+        result += [_SCENE.fullPath(relative) if flags.get('fullPath') else relative.name for relative in relatives]
+    return result or None
+
+
+def _getAttr(plug, **kwargs):
+    flags = _flags(kwargs, 'getAttr')
+    node, attr = _SCENE.splitPlug(plug)
+    if flags.get('lock'):
+        return attr in node.locked
+    if flags.get('keyable'):
+        return node.dynamic.get(attr, {}).get('keyable', False)
+    value = _SCENE.value(node, attr)
+    if isinstance(value, tuple):
+        return [value]
+    return value
+
+
+def _setAttr(plug, *values, **kwargs):
+    flags = _flags(kwargs, 'setAttr')
+    node, attr = _SCENE.splitPlug(plug)
+    if values:
+        if attr in node.locked:
+            raise RuntimeError('The attribute \'%s\' is locked or connected and cannot be modified.' % plug)
+        if _SCENE.sourcePlug(node, attr) is not None:
+            raise RuntimeError('The attribute \'%s\' is locked or connected and cannot be modified.' % plug)
+        if flags.get('type') == 'matrix':
+            value = list(values[0]) if len(values) == 1 else list(values)
+        elif len(values) == 1:
+            value = values[0]
+        else:
+            value = tuple(values)
+        _SCENE.setValue(node, attr, value)
+    if 'lock' in flags:
+        node.locked.add(attr) if flags['lock'] else node.locked.discard(attr)
+
+
+def _addAttr(*args, **kwargs):
+    flags = _flags(kwargs, 'addAttr')
+    node = _SCENE.getNode(args[0] if args else _SCENE.selection[0])
+    attr = flags.get('longName') or flags.get('shortName')
+    if attr in node.dynamic:
+        raise RuntimeError('Found an attribute with the same name: %s' % attr)
+    dataType = flags.get('dataType')
+    node.dynamic[attr] = {'type'    : dataType or flags.get('attributeType', 'double'),
+                          'default' : None if dataType else flags.get('defaultValue', 0.0),
+                          'keyable' : flags.get('keyable', False)}
+
+
+def _listAttr(*args, **kwargs):
+    flags = _flags(kwargs, 'listAttr')
+    node = _SCENE.getNode(args[0] if args else _SCENE.selection[0])
+    if flags.get('userDefined'):
+        return list(node.dynamic) or None
+    return list(node.dynamic) + list(node.values) or None
+
+
+def _deleteAttr(*args, **kwargs):
+    flags = _flags(kwargs, 'deleteAttr')
+    if flags.get('attribute'):
+        node, attr = _SCENE.getNode(args[0]), flags['attribute']
+    else:
+        node, attr = _SCENE.splitPlug(args[0])
+    node.dynamic.pop(attr, None)
+    node.values.pop(attr, None)
+    node.locked.discard(attr)
+
+
+def _attributeQuery(attr, **kwargs):
+    flags = _flags(kwargs, 'attributeQuery')
+    node = _SCENE.getNode(flags['node'])
+    if flags.get('exists'):
+        return _attributeExists(node, attrName(attr))
+    if flags.get('attributeType'):
+        return node.dynamic.get(attr, {}).get('type')
+    return None
+
+
+def _connectAttr(source, destination, **kwargs):
+    _SCENE.connect(source, destination, force=_flags(kwargs, 'connectAttr').get('force', False))
+
+
+def _disconnectAttr(source, destination, **kwargs):
+    _SCENE.disconnect(source, destination)
+
+
+def _isConnected(source, destination, **kwargs):
+    return _SCENE.sources.get(_SCENE.plugName(destination)) == _SCENE.plugName(source)
+
+
+def _skipConversion(plug, upstream):
+    node = _SCENE.getNode(plug)
+    while node.type == 'unitConversion':
+        if upstream:
+            plug = _SCENE.sources.get(node.name+'.input')
+        else:
+            plugs = _SCENE.destinations.get(node.name+'.output', [])
+            plug = plugs[0] if plugs else None
+        if plug is None:
+            return None
+        node = _SCENE.getNode(plug)
+    return plug
+
+
+def _listConnections(*args, **kwargs):
+    flags = _flags(kwargs, 'listConnections')
+    source = flags.get('source', True)
+    destination = flags.get('destination', True)
+    result = []
+    for name in _names(args):
+        node = _SCENE.getNode(name)
+        if '.' in name:
+            plugs = [node.name+'.'+attrName(name.partition('.')[2])]
+            match = lambda plug: plug in plugs
+        else:
+            match = lambda plug: plug.split('.')[0] == node.name
+
+        pairs = []
+        if source:
+            pairs += [(dst, src, True) for dst, src in _SCENE.sources.items() if match(dst)]
+        if destination:
+            pairs += [(src, dst, False) for src, dsts in _SCENE.destinations.items() if match(src) for dst in dsts]
+
+        for own, other, upstream in pairs:
+            if flags.get('skipConversionNodes'):
+                other = _skipConversion(other, upstream)
+                if other is None:
+                    continue
+            otherNode = _SCENE.getNode(other)
+            nodeTypes = flags.get('type')
+            if nodeTypes and not otherNode.isType(nodeTypes):
+                continue
+            if flags.get('connections'):
+                result.append(own)
+            result.append(other if flags.get('plugs') else otherNode.name)
+    return result or None
+
+
+def _listHistory(*args, **kwargs):
+    flags = _flags(kwargs, 'listHistory')
+    result = []
+    queue = [_SCENE.getNode(name).name for name in _names(args)]
+    while queue:
+        name = queue.pop(0)
+        if name in result:
+            continue
+        result.append(name)
+        if flags.get('future'):
+            queue += [dst.split('.')[0] for src, dsts in _SCENE.destinations.items() if src.split('.')[0] == name for dst in dsts]
+        else:
+            queue += [src.split('.')[0] for dst, src in _SCENE.sources.items() if dst.split('.')[0] == name]
+    return result
+
+
+def _xform(*args, **kwargs):
+    flags = _flags(kwargs, 'xform')
+    node = _SCENE.getNode(args[0] if args else _SCENE.selection[0])
+    worldSpace = flags.get('worldSpace', False)
+    if flags.get('query'):
+        if flags.get('matrix'):
+            matrix = _SCENE.worldMatrix(node) if worldSpace else _SCENE.localMatrix(node)
+            return matrix.flatten().tolist()
+        if flags.get('translation'):
+            matrix = _SCENE.worldMatrix(node) if worldSpace else _SCENE.localMatrix(node)
+            return matrix[3, :3].tolist()
+        if flags.get('rotation'):
+            return [_SCENE.value(node, 'rotate'+axis) for axis in _XYZ]
+        return None
+
+    if flags.get('matrix') is not None:
+        if worldSpace:
+            _SCENE.setWorldMatrix(node, flags['matrix'])
+        else:
+            _SCENE.setLocalMatrix(node, flags['matrix'])
+    if flags.get('translation') is not None:
+        translate = list(flags['translation'])
+        if worldSpace:
+            matrix = _SCENE.worldMatrix(node)
+            matrix[3, :3] = translate
+            _SCENE.setWorldMatrix(node, matrix)
+        else:
+            for axis, value in zip(_XYZ, translate):
+                node.values['translate'+axis] = float(value)
+    if flags.get('rotation') is not None:
+        for axis, value in zip(_XYZ, flags['rotation']):
+            node.values['rotate'+axis] = float(value)
+
+
+def _select(*args, **kwargs):
+    flags = _flags(kwargs, 'select')
+    names = [_SCENE.getNode(name).name for name in _names(args)]
+    if flags.get('hierarchy'):
+        names = _ls(names, dag=True)
+    if flags.get('clear') or (args and args[0] is None):
+        _SCENE.selection = []
+    elif flags.get('add'):
+        _SCENE.selection += [name for name in names if name not in _SCENE.selection]
+    elif flags.get('deselect'):
+        _SCENE.selection = [name for name in _SCENE.selection if name not in names]
+    else:
+        _SCENE.selection = names
+
+
+def _nodeType(node, **kwargs):
+    return _SCENE.getNode(node).type
+
+
+def _objectType(node, **kwargs):
+    flags = _flags(kwargs, 'objectType')
+    if flags.get('isType'):
+        return _SCENE.getNode(node).isType(flags['isType'])
+    return _SCENE.getNode(node).type
+
+
+def _curve(**kwargs):
+    flags = _flags(kwargs, 'curve')
+    transform = _SCENE.createNode('transform', n=flags.get('name') or 'curve1')
+    shape = _SCENE.createNode('nurbsCurve', n=transform+'Shape', p=transform)
+    for i, point in enumerate(flags.get('point') or []):
+        _SCENE.nodes[shape].values['controlPoints[%s]' % i] = tuple(point)
+    return transform
+
+
+def _aimConstraint(*args, **kwargs):
+    '''
+    Creates a constraint node and rotates the object's aim axis to the target,
+    shortest rotation, the up vector is ignored
+    '''
+    flags = _flags(kwargs, 'aimConstraint')
+    names = _names(args)
+    target, node = _SCENE.getNode(names[0]), _SCENE.getNode(names[-1])
+    world = _SCENE.worldMatrix(node)
+    direction = _SCENE.worldMatrix(target)[3, :3] - world[3, :3]
+    aim = np.asarray(flags.get('aimVector') or (1.0, 0.0, 0.0), dtype=np.float64)
+    if np.linalg.norm(direction) > 1e-12:
+        direction /= np.linalg.norm(direction)
+        axis = np.cross(aim, direction)
+        angle = math.atan2(np.linalg.norm(axis), np.dot(aim, direction))
+        quat = [0.0, 0.0, 0.0, 1.0]
+        if np.linalg.norm(axis) > 1e-12:
+            axis /= np.linalg.norm(axis)
+            quat = list(axis * math.sin(angle * 0.5)) + [math.cos(angle * 0.5)]
+        rotation = swingTwist.quaternionsToMatrices([quat])[0]
+        rotation[3, :3] = world[3, :3]
+        _SCENE.setWorldMatrix(node, rotation)
+    return [_SCENE.createNode('aimConstraint', n=node.name+'_aimConstraint1', p=node.name)]
+
+
+def _setKeyframe(*args, **kwargs):
+    flags = _flags(kwargs, 'setKeyframe')
+    result = 0
+    for name in _names(args):
+        node = _SCENE.getNode(name)
+        attrs = flags.get('attribute') or flags.get('attributeType') or ['translateX']
+        for attr in ([attrs] if isinstance(attrs, str) else attrs):
+            attr = attrName(attr)
+            curve = _SCENE.sources.get(node.name+'.'+attr)
+            if curve is None:
+                curveType = 'animCurveTA' if _baseAttr(attr)[:-1] in ANGLE_ATTRS else 'animCurveTL' if attr.startswith('translate') else 'animCurveTU'
+                curve = _SCENE.createNode(curveType, n=node.name+'_'+attr, ss=True)+'.output'
+                _SCENE.connect(curve, node.name+'.'+attr)
+            frame = flags.get('time', _SCENE.time)
+            frame = frame[0] if isinstance(frame, (list, tuple)) else frame
+            value = flags.get('value', _SCENE.value(node, attr))
+            _SCENE.setKey(_SCENE.getNode(curve), frame, value)
+            result += 1
+    return result
+
+
+def _keyframe(*args, **kwargs):
+    flags = _flags(kwargs, 'keyframe')
+    nodes = [_SCENE.getNode(name) for name in _names(args)]
+    frames = flags.get('time')
+    if isinstance(frames, (list, tuple)) and len(frames) == 1:
+        frames = frames[0]
+    if isinstance(frames, (int, float)):
+        frames = (frames, frames)
+    values = []
+    for node in nodes:
+        keys = [key for key in node.keys if frames is None or frames[0] <= key[0] <= frames[1]]
+        if flags.get('eval'):
+            values += [_SCENE.evaluateCurve(node, frame) for frame in ([frames[0]] if frames else [_SCENE.time])]
+        elif flags.get('valueChange'):
+            values += [key[1] for key in keys]
+        elif flags.get('query'):
+            values += [key[0] for key in keys]
+    return values or None
+
+
+def _currentTime(*args, **kwargs):
+    flags = _flags(kwargs, 'currentTime')
+    if flags.get('query'):
+        return _SCENE.time
+    _SCENE.time = float(args[0])
+    return _SCENE.time
+
+
+def _playbackOptions(**kwargs):
+    flags = _flags(kwargs, 'playbackOptions')
+    if flags.pop('query', False):
+        return [_SCENE.playback.get(key) for key in flags][0]
+    _SCENE.playback.update(flags)
+    return None
+
+
+def _evaluationManager(*args, **kwargs):
+    flags = _flags(kwargs, 'evaluationManager')
+    if flags.get('query'):
+        return [_SCENE.evaluationMode]
+    if 'mode' in flags:
+        _SCENE.evaluationMode = flags['mode']
+    return None
+
+
+def _about(**kwargs):
+    flags = _flags(kwargs, 'about')
+    if flags.get('batch'):
+        return True
+    if flags.get('version') or flags.get('apiVersion'):
+        return 'fakeMaya'
+    return None
+
+
+def _file(*args, **kwargs):
+    flags = _flags(kwargs, 'file')
+    if flags.get('new'):
+        _SCENE.reset()
+        return ''
+    if flags.get('query'):
+        return ''
+    return None
+
+
+def _undoInfo(**kwargs):
+    return True if _flags(kwargs, 'undoInfo').get('query') else None
+
+
+def _warning(message, **kwargs):
+    print('Warning: %s' % message)
+
+
+def _pluginInfo(*args, **kwargs):
+    return True
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+COMMANDS = {'about'             : _about,
+            'addAttr'           : _addAttr,
+            'aimConstraint'     : _aimConstraint,
+            'attributeQuery'    : _attributeQuery,
+            'color'             : _noop,
+            'confirmDialog'     : lambda *args, **kwargs: kwargs.get('cancelButton', 'Cancel'),
+            'connectAttr'       : _connectAttr,
+            'createNode'        : _createNode,
+            'currentTime'       : _currentTime,
+            'curve'             : _curve,
+            'delete'            : _delete,
+            'deleteAttr'        : _deleteAttr,
+            'dgeval'            : _noop,
+            'disconnectAttr'    : _disconnectAttr,
+            'evaluationManager' : _evaluationManager,
+            'file'              : _file,
+            'flushUndo'         : _noop,
+            'fileDialog2'       : _noop,
+            'getAttr'           : _getAttr,
+            'isConnected'       : _isConnected,
+            'joint'             : _noop,
+            'keyframe'          : _keyframe,
+            'listAttr'          : _listAttr,
+            'listConnections'   : _listConnections,
+            'listHistory'       : _listHistory,
+            'listRelatives'     : _listRelatives,
+            'loadPlugin'        : _noop,
+            'ls'                : _ls,
+            'nodeType'          : _nodeType,
+            'objExists'         : _objExists,
+            'objectType'        : _objectType,
+            'parent'            : _parent,
+            'playbackOptions'   : _playbackOptions,
+            'pluginInfo'        : _pluginInfo,
+            'promptDialog'      : lambda *args, **kwargs: 'Cancel',
+            'refresh'           : _noop,
+            'rename'            : _rename,
+            'select'            : _select,
+            'setAttr'           : _setAttr,
+            'setKeyframe'       : _setKeyframe,
+            'showHidden'        : _noop,
+            'undoInfo'          : _undoInfo,
+            'warning'           : _warning,
+            'workspaceControl'  : lambda *args, **kwargs: False,
+            'xform'             : _xform}
+
+
+def _counted(name, function):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _SCENE.stats.record(name, time.perf_counter() - start)
+    wrapper.__name__ = name
+    return wrapper
+
+
+# OpenMaya
+class MFn(object):
+    kWorld     = 'world'
+    kDagNode   = 'dagNode'
+    kTransform = 'transform'
+    kJoint     = 'joint'
+    kMesh      = 'mesh'
+
+
+class MFnData(object):
+    kString = 'string'
+    kMatrix = 'matrix'
+
+
+class MFnNumericData(object):
+    kFloat   = 'float'
+    kDouble  = 'double'
+    kInt     = 'long'
+    kBoolean = 'bool'
+
+
+class MSpace(object):
+    kTransform = 'transform'
+    kObject    = 'object'
+    kWorld     = 'world'
+
+
+class MMatrix(object):
+    def __init__(self, values=None):
+        if values is None:
+            self.values = np.eye(4)
+        else:
+            self.values = _matrix(list(values) if not isinstance(values, MMatrix) else values.values)
+
+    def __iter__(self):
+        return iter(self.values.flatten().tolist())
+
+    def __len__(self):
+        return 16
+
+    def __getitem__(self, index):
+        return self.values.flatten()[index]
+
+    def __mul__(self, other):
+        return MMatrix(np.matmul(self.values, other.values).flatten())
+
+    def inverse(self):
+        return MMatrix(np.linalg.inv(self.values).flatten())
+
+
+class MAngle(object):
+    def __init__(self, value=0.0):
+        self.value = float(value)
+
+    def asRadians(self):
+        return self.value
+
+    def asDegrees(self):
+        return math.degrees(self.value)
+
+
+class MTime(object):
+    kFilm = 'film'
+    k24FPS = 'film'
+
+    def __init__(self, value=0.0, unit='film'):
+        self.value = float(value)
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return 'film'
+
+
+class MTimeArray(list):
+    pass
+
+
+class MDoubleArray(list):
+    pass
+
+
+class MPoint(tuple):
+    def __new__(cls, x=0.0, y=0.0, z=0.0, w=1.0):
+        return tuple.__new__(cls, (x, y, z, w))
+
+
+class MPointArray(list):
+    pass
+
+
+class MObject(object):
+    def __init__(self, node=None, data=None):
+        self.node = node
+        self.data = data
+
+    def hasFn(self, fn):
+        if fn == MFn.kWorld:
+            return self.node is None
+        return self.node is not None and self.node.isType(fn)
+
+    def isNull(self):
+        return self.node is None and self.data is None
+
+
+class MDagPath(object):
+    def __init__(self, node):
+        self.node = node
+
+    def fullPathName(self):
+        return _SCENE.fullPath(self.node)
+
+    def partialPathName(self):
+        return self.node.name
+
+    def node(self):
+        return MObject(self.node)
+
+    def inclusiveMatrix(self):
+        return MMatrix(_SCENE.worldMatrix(self.node).flatten())
+
+    def exclusiveMatrix(self):
+        return MMatrix(_SCENE.parentMatrix(self.node).flatten())
+
+
+class MPlug(object):
+    def __init__(self, node, attr):
+        self.node = node
+        self.attr = attr
+
+    def name(self):
+        return self.node.name + '.' + self.attr
+
+    def partialName(self, *args, **kwargs):
+        return self.attr
+
+    @property
+    def isArray(self):
+        return self.attr in SINGLE_ARRAYS
+
+    @property
+    def isLocked(self):
+        return self.attr in self.node.locked
+
+    @isLocked.setter
+    def isLocked(self, value):
+        self.node.locked.add(self.attr) if value else self.node.locked.discard(self.attr)
+
+    def elementByLogicalIndex(self, index):
+        return MPlug(self.node, self.attr if self.attr in SINGLE_ARRAYS else '%s[%s]' % (self.attr, index))
+
+    def _value(self, context=None):
+        previous = _SCENE.contextTime
+        if context is not None:
+            _SCENE.contextTime = context.time
+        try:
+            return _SCENE.value(self.node, self.attr)
+        finally:
+            _SCENE.contextTime = previous
+
+    def asString(self, context=None):
+        value = self._value(context)
+        return '' if value is None else str(value)
+
+    def asDouble(self, context=None):
+        value = float(self._value(context))
+        if _baseAttr(self.attr)[:-1] in ANGLE_ATTRS:
+            return math.radians(value)
+        return value
+
+    def asFloat(self, context=None):
+        return float(np.float32(self.asDouble(context)))
+
+    def asInt(self, context=None):
+        return int(self._value(context))
+
+    def asBool(self, context=None):
+        return bool(self._value(context))
+
+    def asMAngle(self, context=None):
+        return MAngle(self.asDouble(context))
+
+    def asMObject(self, context=None):
+        return MObject(data=self._value(context))
+
+
+class MSelectionList(object):
+    def __init__(self):
+        self.items = []
+
+    def add(self, name):
+        node = _SCENE.getNode(name, required=False)
+        if node is None:
+            raise RuntimeError('(kInvalidParameter): Object does not exist: %s' % name)
+        self.items.append((node, attrName(str(name).partition('.')[2]) if '.' in str(name) else None))
+        return self
+
+    def length(self):
+        return len(self.items)
+
+    def getDependNode(self, index):
+        return MObject(self.items[index][0])
+
+    def getDagPath(self, index):
+        return MDagPath(self.items[index][0])
+
+    def getPlug(self, index):
+        node, attr = self.items[index]
+        return MPlug(node, attr)
+
+
+class MFnDependencyNode(object):
+    def __init__(self, obj=None):
+        self.node = obj.node if obj is not None else None
+
+    def setObject(self, obj):
+        self.node = obj.node
+
+    def name(self):
+        return self.node.name
+
+    def typeName(self):
+        return self.node.type
+
+    def hasAttribute(self, attr):
+        return _attributeExists(self.node, attrName(attr))
+
+    def findPlug(self, attr, wantNetworked=False):
+        return MPlug(self.node, attrName(attr))
+
+
+class MFnDagNode(MFnDependencyNode):
+    def __init__(self, obj=None):
+        self.node = obj.node if obj is not None else None
+
+    def fullPathName(self):
+        return _SCENE.fullPath(self.node)
+
+    def partialPathName(self):
+        return self.node.name
+
+    def parentCount(self):
+        return 1
+
+    def parent(self, index):
+        return MObject(self.node.parent)
+
+    def childCount(self):
+        return len(self.node.children)
+
+    def child(self, index):
+        return MObject(self.node.children[index])
+
+    def getPath(self):
+        return MDagPath(self.node)
+
+
+class MFnTransform(MFnDagNode):
+    def rotationOrder(self):
+        return int(_SCENE.value(self.node, 'rotateOrder')) + 1 # MTransformationMatrix.kXYZ is 1
+
+
+class MFnMatrixData(object):
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    def matrix(self):
+        return MMatrix(self.obj.data)
+
+
+class MTransformationMatrix(object):
+    kXYZ, kYZX, kZXY, kXZY, kYXZ, kZYX = range(1, 7)
+
+    def __init__(self, matrix=None):
+        self.values = _matrix(list(matrix)) if matrix is not None else np.eye(4)
+        self.order = 1
+
+    def reorderRotation(self, order):
+        self.order = order
+
+    def translation(self, space=None):
+        return self.values[3, :3].tolist()
+
+    def rotation(self, asQuaternion=False):
+        rotation = swingTwist.homogeneous(swingTwist.rotationMatrices(self.values))
+        if asQuaternion:
+            return swingTwist.matricesToQuaternions(rotation)[0].tolist()
+        return swingTwist.eulerFromMatrices(rotation, swingTwist.ROTATE_ORDERS[self.order - 1])[0].tolist()
+
+    def scale(self, space=None):
+        return swingTwist.scales(self.values)[0].tolist()
+
+    def asMatrix(self):
+        return MMatrix(self.values.flatten())
+
+
+class MDGContext(object):
+    def __init__(self, mtime=None):
+        self.time = mtime.value if mtime is not None else None
+
+
+class MDGContextGuard(object):
+    def __init__(self, context):
+        self.context = context
+
+    def __enter__(self):
+        self.previous = _SCENE.contextTime
+        _SCENE.contextTime = self.context.time
+        return self
+
+    def __exit__(self, *args):
+        _SCENE.contextTime = self.previous
+
+
+class _AttributeSpec(object):
+    def __init__(self, name, attrType, default=None):
+        self.name = name
+        self.type = attrType
+        self.default = default
+        self.min = None
+        self.max = None
+        self.keyable = False
+
+
+class MFnTypedAttribute(object):
+    def create(self, longName, shortName, dataType, default=None):
+        self.spec = _AttributeSpec(longName, dataType)
+        return self.spec
+
+    @property
+    def keyable(self):
+        return self.spec.keyable
+
+    @keyable.setter
+    def keyable(self, value):
+        self.spec.keyable = value
+
+
+class MFnNumericAttribute(MFnTypedAttribute):
+    def create(self, longName, shortName, dataType, default=0):
+        self.spec = _AttributeSpec(longName, dataType, default)
+        return self.spec
+
+    def setMin(self, value):
+        self.spec.min = value
+
+    def setMax(self, value):
+        self.spec.max = value
+
+
+class MDGModifier(object):
+    '''
+    Queues operations, doIt() runs them, as the API modifier
+    '''
+    def __init__(self):
+        self.operations = []
+
+    def addAttribute(self, obj, spec):
+        def add():
+            default = None if spec.type == MFnData.kString else spec.default
+            obj.node.dynamic[spec.name] = {'type':spec.type, 'default':default, 'keyable':spec.keyable}
+        self.operations.append(add)
+
+    def removeAttribute(self, obj, spec):
+        self.operations.append(lambda: obj.node.dynamic.pop(getattr(spec, 'name', spec), None))
+
+    def _newValue(self, plug, value):
+        self.operations.append(lambda: _SCENE.setValue(plug.node, plug.attr, value))
+
+    def newPlugValueString(self, plug, value):
+        self._newValue(plug, value)
+
+    def newPlugValueBool(self, plug, value):
+        self._newValue(plug, bool(value))
+
+    def newPlugValueInt(self, plug, value):
+        self._newValue(plug, int(value))
+
+    def newPlugValueFloat(self, plug, value):
+        self._newValue(plug, float(np.float32(value)))
+
+    def newPlugValueDouble(self, plug, value):
+        self._newValue(plug, float(value))
+
+    def newPlugValueMAngle(self, plug, angle):
+        self._newValue(plug, math.degrees(angle.asRadians()))
+
+    def connect(self, source, destination):
+        self.operations.append(lambda: _SCENE.connect(source.name(), destination.name()))
+
+    def disconnect(self, source, destination):
+        self.operations.append(lambda: _SCENE.disconnect(source.name(), destination.name()))
+
+    def doIt(self):
+        operations, self.operations = self.operations, []
+        for operation in operations:
+            operation()
+
+    def undoIt(self):
+        pass
+
+
+class MFnNurbsCurve(MFnDagNode):
+    kOpen = 'open'
+    kClosed = 'closed'
+    kPeriodic = 'periodic'
+
+    def create(self, points, knots, degree, form, is2D, rational, parent=None):
+        parentName = parent.node.name if parent is not None and parent.node is not None else None
+        shape = _SCENE.createNode('nurbsCurve', n='curveShape1', p=parentName)
+        self.node = _SCENE.nodes[shape]
+        for i, point in enumerate(points):
+            self.node.values['controlPoints[%s]' % i] = tuple(point[:3])
+        return MObject(self.node)
+
+
+class MFnAnimCurve(MFnDependencyNode):
+    kTangentGlobal = 'global'
+    kTangentLinear = 'linear'
+    kTangentFlat = 'flat'
+    kTangentAuto = 'auto'
+
+    def create(self, target, animCurveType=None, modifier=None):
+        attr = target.attr
+        curveType = 'animCurveTA' if _baseAttr(attr)[:-1] in ANGLE_ATTRS else 'animCurveTL' if attr.startswith('translate') else 'animCurveTU'
+        name = _SCENE.createNode(curveType, n=target.node.name+'_'+attr, ss=True)
+        self.node = _SCENE.nodes[name]
+        _SCENE.connect(name+'.output', target.name())
+        return MObject(self.node)
+
+    def addKeys(self, times, values, tangentInType=None, tangentOutType=None, keepExistingKeys=False, change=None):
+        angular = self.node.type == 'animCurveTA'
+        keys = [(mtime.value, math.degrees(value) if angular else value) for mtime, value in zip(times, values)]
+        if keepExistingKeys:
+            keys = [key for key in self.node.keys if key[0] not in [k[0] for k in keys]] + keys
+        self.node.keys = sorted(keys)
+
+    def numKeys(self):
+        return len(self.node.keys)
+
+
+class MSceneMessage(object):
+    kAfterOpen = 'afterOpen'
+    kAfterNew = 'afterNew'
+    kAfterImport = 'afterImport'
+    kBeforeSave = 'beforeSave'
+
+    @staticmethod
+    def addCallback(message, function, clientData=None):
+        callbackId = len(_SCENE.callbacks) + 1
+        _SCENE.callbacks[callbackId] = (message, function)
+        return callbackId
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callbackId):
+        _SCENE.callbacks.pop(callbackId, None)
+
+
+# API entry points that touch the scene, recorded in CallStats
+_API_COUNTED = {MSelectionList     : ['add'],
+                MFnDependencyNode  : ['findPlug', 'hasAttribute'],
+                MPlug              : ['asString', 'asDouble', 'asFloat', 'asInt', 'asBool', 'asMObject'],
+                MDGModifier        : ['doIt'],
+                MDagPath           : ['inclusiveMatrix', 'exclusiveMatrix'],
+                MFnNurbsCurve      : ['create'],
+                MFnAnimCurve       : ['create', 'addKeys']}
+
+
+def _countApi(moduleName):
+    for cls, methods in _API_COUNTED.items():
+        for method in methods:
+            function = cls.__dict__.get(method)
+            if function is not None and not hasattr(function, 'counted'):
+                wrapped = _counted('%s.%s.%s' % (moduleName, cls.__name__, method), function)
+                wrapped.counted = True
+                setattr(cls, method, wrapped)
+
+
+def _module(name, attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+_MODULE_NAMES = ['maya', 'maya.cmds', 'maya.OpenMaya', 'maya.api', 'maya.api.OpenMaya', 'maya.api.OpenMayaAnim']
+_PREVIOUS = {}
+
+
+def install(scene=None):
+    '''
+    Returns the FakeScene commands run on, installed as the maya modules
+    '''
+    global _SCENE
+    _SCENE = scene or FakeScene()
+
+    api = dict((name, value) for name, value in globals().items()
+               if isinstance(value, type) and name.startswith('M') and name not in ['MFnAnimCurve'])
+    _countApi('om2')
+
+    cmds = _module('maya.cmds', dict((name, _counted(name, function)) for name, function in COMMANDS.items()))
+    om2 = _module('maya.api.OpenMaya', api)
+    oma = _module('maya.api.OpenMayaAnim', {'MFnAnimCurve':MFnAnimCurve})
+    om1 = _module('maya.OpenMaya', dict(api, MSceneMessage=MSceneMessage, MMessage=MMessage))
+    apiPackage = _module('maya.api', {'OpenMaya':om2, 'OpenMayaAnim':oma})
+    apiPackage.__path__ = []
+    maya = _module('maya', {'cmds':cmds, 'OpenMaya':om1, 'api':apiPackage, 'fakeScene':_SCENE})
+    maya.__path__ = []
+
+    modules = {'maya':maya, 'maya.cmds':cmds, 'maya.OpenMaya':om1, 'maya.api':apiPackage,
+               'maya.api.OpenMaya':om2, 'maya.api.OpenMayaAnim':oma}
+    for name, module in modules.items():
+        if name not in _PREVIOUS:
+            _PREVIOUS[name] = sys.modules.get(name)
+        sys.modules[name] = module
+    _SCENE.cmds = cmds
+    return _SCENE
+
+
+def uninstall():
+    '''
+    Restores the maya modules replaced by install()
+    '''
+    for name, module in _PREVIOUS.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _PREVIOUS.clear()
+
+
+def getScene():
+    return _SCENE
@@ -0,0 +1,113 @@
+'''
+DESCRIPTION:
+    Diff between a guide file and the guides in a scene, used by the
+    merge restore mode to only touch what changed.
+    Both sides are guideFile.GuideRecord, matched by backup key
+    ('L_TestSys_slider'), so a live scene is diffed the same way as a
+    second file.
+    Pure NumPy, no Maya dependency.
+USAGE:
+    import volume_sys_velan.scripts.guideDiff as guideDiff
+
+    diff = guideDiff.GuideDiff(fileRecords, liveRecords)
+    print(diff.report())
+    for record in diff.create: ...
+    for fileRecord, liveRecord, attrs, matrices in diff.update: ...
+'''
+
+import numpy as np
+
+
+# Allowed difference of float settings, float attrs are stored as float32
+FLOAT_TOLERANCE = 1e-4
+
+# Identity attrs, part of the key, never updated
+IDENTITY_ATTRS = ['guideType', 'guideName']
+
+
+class GuideDiff(object):
+    '''
+    Diff of guide records.
+
+    fileRecords  = ([GuideRecord]) Guides to merge in
+    liveRecords  = ([GuideRecord]) Guides already there
+    posTolerance = (float) Allowed start / end position difference
+    rotTolerance = (float) Allowed difference of the matrix axes
+    tolerance    = (float) Allowed difference of float settings
+
+    After construction:
+    create    = [GuideRecord] File guides missing from the scene
+    update    = [(file record, live record, {attr : (live value, file value)}, matrices changed (bol))]
+    remove    = [GuideRecord] Live guides missing from the file
+    unchanged = [key]
+    '''
+    def __init__(self, fileRecords, liveRecords, posTolerance=1e-4, rotTolerance=1e-4, tolerance=FLOAT_TOLERANCE):
+        self.posTolerance = posTolerance
+        self.rotTolerance = rotTolerance
+        self.tolerance    = tolerance
+
+        self.create    = []
+        self.update    = []
+        self.remove    = []
+        self.unchanged = []
+
+        live = dict((record.key, record) for record in liveRecords)
+        files = dict((record.key, record) for record in fileRecords)
+        self.create = [record for key, record in files.items() if key not in live]
+        self.remove = [record for key, record in live.items() if key not in files]
+        self.compare([(files[key], live[key]) for key in files if key in live])
+
+    def settingChanged(self, liveValue, fileValue):
+        if isinstance(fileValue, float) and isinstance(liveValue, (int, float)):
+            return abs(fileValue - liveValue) > self.tolerance
+        return fileValue != liveValue
+
+    def compare(self, pairs):
+        '''
+        Compares settings and matrices of matched guides, matrices in one vectorized pass
+        '''
+        if pairs == []:
+            return
+
+        fileMats = np.stack([fileRecord.matrices for fileRecord, liveRecord in pairs])
+        liveMats = np.stack([liveRecord.matrices for fileRecord, liveRecord in pairs])
+        posDrift = np.linalg.norm(fileMats[:, :, 3, :3] - liveMats[:, :, 3, :3], axis=2).max(axis=1) > self.posTolerance
+        rotDrift = np.abs(fileMats[:, :, :3, :3] - liveMats[:, :, :3, :3]).max(axis=(1, 2, 3)) > self.rotTolerance
+        matDrift = (posDrift | rotDrift).tolist()
+
+        for (fileRecord, liveRecord), matrices in zip(pairs, matDrift):
+            attrs = {}
+            for attr, fileValue in fileRecord.settings.items():# Unset file values never clear a guide
+                if attr in IDENTITY_ATTRS:
+                    continue
+                liveValue = liveRecord.settings.get(attr)
+                if self.settingChanged(liveValue, fileValue):
+                    attrs[attr] = (liveValue, fileValue)
+
+            if attrs or matrices:
+                self.update.append((fileRecord, liveRecord, attrs, matrices))
+            else:
+                self.unchanged.append(fileRecord.key)
+
+    def isEmpty(self, removeExtras=False):
+        return not (self.create or self.update or (removeExtras and self.remove))
+
+    def report(self, removeExtras=False):
+        '''
+        Returns readable preview of the diff
+
+        removeExtras = (bol) Live guides missing from the file will be removed
+        '''
+        lines = ['Guide merge: %s to create, %s to update, %s %s, %s unchanged' % (
+                 len(self.create), len(self.update), len(self.remove),
+                 'to remove' if removeExtras else 'extra (kept)', len(self.unchanged))]
+        for record in self.create:
+            lines.append('  CREATE  %s' % record.key)
+        for fileRecord, liveRecord, attrs, matrices in self.update:
+            changes = ['%s: %r -> %r' % (attr, old, new) for attr, (old, new) in sorted(attrs.items())]
+            if matrices:
+                changes.append('matrices')
+            lines.append('  UPDATE  %s : %s' % (fileRecord.key, ', '.join(changes)))
+        for record in self.remove:
+            lines.append('  %s  %s' % ('REMOVE' if removeExtras else 'EXTRA ', record.key))
+        return '\n'.join(lines)
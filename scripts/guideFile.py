@@ -0,0 +1,291 @@
+'''
+DESCRIPTION:
+    Guide backup files.
+    Guides are saved either as the original JSON layout, see
+    VolumeSystemUI.restoreGuides(), or as a columnar NumPy .npz file with
+    one array per attribute and one (N, 2, 4, 4) start / end matrix block.
+    The two layouts convert to each other without loss.
+    No Maya dependency.
+
+    npz arrays, strings are stored as utf-8 bytes:
+        header          json {'version', 'columns' : {attr : encoding}}
+        keys            (N,) guide keys, 'L_TestSys_slider'
+        roots           (N,) guide root names
+        ctls            (N,2) start / end control names
+        matrices        (N,2,4,4) start / end world matrices
+        order           (N,) attr names of each guide, in file order, comma separated
+        attr.<name>     (N,) values, encoding is 'bool', 'int', 'float', 'str' or 'json'
+        mask.<name>     (N,) True where the guide has a value
+        type.<name>     (N,) attr type strings of the JSON layout
+USAGE:
+    import volume_sys_velan.scripts.guideFile as guideFile
+
+    gdeBackupDict = guideFile.readGuideFile('/path/to/guides.npz')
+    guideFile.writeGuideFile('/path/to/guides.json', gdeBackupDict)
+
+    # One typed record per guide, parsed once
+    for record in guideFile.iterGuideRecords(gdeBackupDict):
+        print(record.guideName, record.settings.get('guideParent'), record.matrices[0])
+
+    # Columns, for tools that work on all guides at once
+    columns = guideFile.readColumns('/path/to/guides.npz')
+    columns['matrices'][:, 0, 3, :3] # Start positions
+'''
+
+import json
+import os
+
+import numpy as np
+
+import volume_sys_velan.scripts.guideSchema as guideSchema
+
+
+FORMAT_VERSION = 1
+
+FILE_TYPES = ['.json', '.npz']
+
+# Node name tag per guide type, 'Hbfr_L_TestSys_SldGuideRoot'
+GUIDE_TAGS = {'slider':'Sld', 'stretch':'Str'}
+
+
+def guideNodeNames(guideType, guideName):
+    '''
+    Returns (root, start ctl, end ctl) node names of a guide
+    '''
+    tag = GUIDE_TAGS[guideType]
+    return ('Hbfr_%s_%sGuideRoot' % (guideName, tag),
+            'Ctl_%s_%sGuideStart' % (guideName, tag),
+            'Ctl_%s_%sGuideEnd' % (guideName, tag))
+
+
+def splitGuideRecord(gdeAttrDict):
+    '''
+    Returns (root, [(attr, value, attrType)], [start ctl, end ctl], [start matrix, end matrix])
+    from one guide of the JSON layout. Attr entries are [value, type] pairs,
+    control entries are 16 float matrices.
+    '''
+    root = None
+    attrs = []
+    ctls = []
+    matrices = []
+    for key, value in gdeAttrDict.items():
+        if '.' in key:
+            root, attr = key.rsplit('.', 1)
+            attrs.append((attr, value[0], value[1]))
+        else:
+            ctls.append(key)
+            matrices.append(value)
+    return root, attrs, ctls, matrices
+
+
+class GuideRecord(object):
+    '''
+    One guide of a backup dict, parsed once.
+
+    key       = (str) Backup key, 'L_TestSys_slider'
+    guideType = (str) 'slider' or 'stretch'
+    guideName = (str) 'L_TestSys'
+    root      = (str) Guide root name in the file
+    attrs     = ([(attr, value, attrType)]) Attrs as stored, in file order
+    settings  = ({}) attr : value, typed by the guide schema, unset values are left out
+    ctls      = ([str]) Start and end control names in the file
+    matrices  = ((2,4,4)) Start and end world matrices
+    '''
+    __slots__ = ['key', 'guideType', 'guideName', 'root', 'attrs', 'settings', 'ctls', 'matrices']
+
+    def __init__(self, key, gdeAttrDict):
+        self.key = key
+        self.guideType = key.split('_')[-1]
+        self.guideName = key[:-(len(self.guideType)+1)]
+        # Malformed guides raise ValueError, so callers can skip them
+        try:
+            self.root, self.attrs, self.ctls, matrices = splitGuideRecord(gdeAttrDict)
+        except (AttributeError, TypeError, IndexError) as error:
+            raise ValueError('Guide %s: attrs must be [value, type] pairs, %s' % (key, error))
+
+        if len(self.ctls) != 2:
+            raise ValueError('Guide %s: expected start and end matrices, found %s' % (key, len(self.ctls)))
+        try:
+            self.matrices = np.array(matrices, dtype=np.float64).reshape(2, 4, 4)
+        except (TypeError, ValueError) as error:
+            raise ValueError('Guide %s: matrices must be 16 floats, %s' % (key, error))
+
+        self.settings = {}
+        if self.guideType in guideSchema.SCHEMAS:
+            values = dict((attr, value) for attr, value, attrType in self.attrs if value is not None)
+            try:
+                self.settings = guideSchema.castValues(self.guideType, values)
+            except (TypeError, ValueError) as error:
+                raise ValueError('Guide %s: %s' % (key, error))
+
+    def __repr__(self):
+        return 'GuideRecord(%r)' % self.key
+
+    def toBackup(self):
+        '''
+        Returns the guide in the JSON layout
+        '''
+        gdeAttrDict = dict((self.root+'.'+attr, [value, attrType]) for attr, value, attrType in self.attrs)
+        for ctl, matrix in zip(self.ctls, self.matrices.reshape(2, 16).tolist()):
+            gdeAttrDict[ctl] = matrix
+        return gdeAttrDict
+
+
+def iterGuideRecords(gdeBackupDict):
+    '''
+    Yields GuideRecord per guide of a backup dict
+    '''
+    for key, gdeAttrDict in gdeBackupDict.items():
+        yield GuideRecord(key, gdeAttrDict)
+
+
+def _strings(values):
+    '''
+    Returns utf-8 byte string array, one byte per character for ascii names
+    '''
+    return np.array([value.encode('utf-8') for value in values], dtype=bytes)
+
+
+def _unstrings(array):
+    return [value.decode('utf-8') for value in array.tolist()]
+
+
+def _encoding(values):
+    kinds = set(type(value) for value in values if value is not None)
+    if kinds == set([bool]):
+        return 'bool'
+    if kinds == set([int]):
+        return 'int'
+    if kinds == set([float]):
+        return 'float'
+    if kinds <= set([str]):
+        return 'str'
+    return 'json'
+
+
+def toColumns(gdeBackupDict):
+    '''
+    Returns {array name : array} columns of a backup dict, see module description
+    '''
+    keys = list(gdeBackupDict)
+    records = [splitGuideRecord(gdeBackupDict[key]) for key in keys]
+
+    attrNames = []
+    for root, attrs, ctls, matrices in records:
+        for attr, value, attrType in attrs:
+            if attr not in attrNames:
+                attrNames.append(attr)
+
+    columns = {'keys'     : _strings(keys),
+               'roots'    : _strings([root or '' for root, attrs, ctls, matrices in records]),
+               'ctls'     : _strings([ctl for root, attrs, ctls, matrices in records for ctl in ctls]).reshape(-1, 2),
+               'matrices' : np.array([matrices for root, attrs, ctls, matrices in records], dtype=np.float64).reshape(-1, 2, 4, 4),
+               'order'    : _strings([','.join(attr for attr, value, attrType in attrs) for root, attrs, ctls, matrices in records])}
+
+    encodings = {}
+    for name in attrNames:
+        entries = [dict((attr, (value, attrType)) for attr, value, attrType in attrs).get(name, (None, ''))
+                   for root, attrs, ctls, matrices in records]
+        values = [value for value, attrType in entries]
+        mask = np.array([value is not None for value in values], dtype=bool)
+        encoding = encodings[name] = _encoding(values)
+
+        if encoding == 'json':
+            column = _strings([json.dumps(value) for value in values])
+        elif encoding == 'str':
+            column = _strings([value or '' for value in values])
+        else:
+            dtype = {'bool':bool, 'int':np.int64, 'float':np.float64}[encoding]
+            column = np.array([value if value is not None else 0 for value in values], dtype=dtype)
+
+        columns['attr.'+name] = column
+        columns['mask.'+name] = mask
+        columns['type.'+name] = _strings([attrType for value, attrType in entries])
+
+    columns['header'] = np.array(json.dumps({'version':FORMAT_VERSION, 'columns':encodings}).encode('utf-8'))
+    return columns
+
+
+def fromColumns(columns, rows=None):
+    '''
+    Returns backup dict, in the JSON layout, from columns
+
+    rows = ([int]) Only these guides, all if None
+    '''
+    header = json.loads(columns['header'].tolist().decode('utf-8'))
+    if header['version'] > FORMAT_VERSION:
+        raise ValueError('Guide file version %s is newer than supported version %s' % (header['version'], FORMAT_VERSION))
+
+    encodings = header['columns']
+    values = {}
+    for name, encoding in encodings.items():
+        if encoding in ['str', 'json']:
+            column = _unstrings(columns['attr.'+name])
+        else:
+            column = columns['attr.'+name].tolist()
+        if encoding == 'json':
+            column = [json.loads(value) for value in column]
+        values[name] = (column, columns['mask.'+name].tolist(), _unstrings(columns['type.'+name]))
+
+    ctls = _unstrings(columns['ctls'].reshape(-1))
+    matrices = columns['matrices'].reshape(-1, 2, 16).tolist()
+    roots = _unstrings(columns['roots'])
+
+    keys = _unstrings(columns['keys'])
+    orders = _unstrings(columns['order'])
+    gdeBackupDict = {}
+    for i in (range(len(keys)) if rows is None else rows):
+        key, order = keys[i], orders[i]
+        gdeAttrDict = {}
+        for name in (order.split(',') if order else []):
+            column, mask, attrTypes = values[name]
+            gdeAttrDict[roots[i]+'.'+name] = [column[i] if mask[i] else None, attrTypes[i]]
+
+        # Matrix need to be added last for restoreGuides()
+        gdeAttrDict[ctls[i*2]] = matrices[i][0]
+        gdeAttrDict[ctls[i*2+1]] = matrices[i][1]
+        gdeBackupDict[key] = gdeAttrDict
+
+    return gdeBackupDict
+
+
+def readGuideFile(path):
+    '''
+    Returns backup dict from a .json or .npz guide file
+    '''
+    if os.path.splitext(path)[-1].lower() == '.npz':
+        return fromColumns(readColumns(path))
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def readColumns(path):
+    '''
+    Returns columns from a .json or .npz guide file, see toColumns()
+    '''
+    if os.path.splitext(path)[-1].lower() == '.npz':
+        with np.load(path, allow_pickle=False) as data:
+            return dict((name, data[name]) for name in data.files)
+
+    return toColumns(readGuideFile(path))
+
+
+def writeGuideFile(path, gdeBackupDict, compress=False):
+    '''
+    Writes backup dict to a .json or .npz guide file, chosen by extension
+
+    compress = (bol) Compress .npz files, smaller but slower
+    '''
+    if os.path.splitext(path)[-1].lower() == '.npz':
+        with open(path, 'wb') as f:# File object, so numpy does not append its own extension
+            (np.savez_compressed if compress else np.savez)(f, **toColumns(gdeBackupDict))
+        return
+
+    # One guide per line, still plain JSON, lets guideLibrary read single guides
+    keys = list(gdeBackupDict)
+    with open(path, 'w') as f:
+        f.write('{\n')
+        for i, key in enumerate(keys):
+            f.write('%s: %s%s\n' % (json.dumps(key), json.dumps(gdeBackupDict[key]), ',' if i < len(keys) - 1 else ''))
+        f.write('}\n')
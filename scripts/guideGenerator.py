@@ -0,0 +1,159 @@
+'''
+DESCRIPTION:
+    Plans slider and stretch guides for a skeleton, from a list of joints
+    or a rule table. Planning only needs the joint hierarchy and world
+    matrices, so it has no Maya dependency. VolumeSystemUI.generateGuides()
+    reads the skeleton and creates the planned guides.
+
+    Slider guide on joint J:
+        root at J, guideParent = parent of J, guideTracker = J
+    Stretch guide on joint J, spanning the joint:
+        start between J and its parent, startParent = parent of J
+        end between J and its child, endParent = J
+USAGE:
+    import volume_sys_velan.scripts.guideGenerator as guideGenerator
+
+    rules = [guideGenerator.GuideRule('elbow|knee', 'slider', suffix='Vol'),
+             guideGenerator.GuideRule('elbow', 'stretch', suffix='Bicep', endBlend=0.3,
+                                      settings={'enableSns':True})]
+    specs, skipped = guideGenerator.planGuides(joints, parents, children, matrices, rules)
+
+    # Rule table, json list of GuideRule kwargs
+    rules = guideGenerator.loadRules('/path/to/guideRules.json')
+'''
+
+import json
+import re
+
+import numpy as np
+
+
+# Joint name tokens that are not part of the guide description
+IGNORE_TOKENS = ['jnt', 'joint', 'jj', 'bnd', 'bind', 'skin', 'def', 'drv']
+
+
+class GuideRule(object):
+    '''
+    Creates one guide per matching joint.
+
+    pattern    = (str) Regex searched in joint names
+    guideType  = (str) 'slider' or 'stretch'
+    suffix     = (str) Added to the guide description, ie. 'Vol'
+    settings   = ({}) Guide root attr : value, see guideSchema
+    startBlend = (float) Stretch start, 0 at the joint, 1 at its parent
+    endBlend   = (float) Stretch end, 0 at the joint, 1 at its child
+    '''
+    def __init__(self, pattern, guideType, suffix='', settings=None, startBlend=0.5, endBlend=0.5):
+        if guideType not in ['slider', 'stretch']:
+            raise ValueError('Guide rule %r: guideType must be slider or stretch' % pattern)
+        self.pattern    = pattern
+        self.regex      = re.compile(pattern)
+        self.guideType  = guideType
+        self.suffix     = suffix
+        self.settings   = dict(settings or {})
+        self.startBlend = startBlend
+        self.endBlend   = endBlend
+
+    def matches(self, joint):
+        return self.regex.search(joint.split('|')[-1]) is not None
+
+
+def loadRules(path):
+    '''
+    Returns list of GuideRule from a json rule table
+
+    path = (str) json file, list of {'pattern', 'guideType', 'suffix', 'settings', 'startBlend', 'endBlend'}
+    '''
+    with open(path, 'r') as f:
+        return [GuideRule(**rule) for rule in json.load(f)]
+
+
+def guideNameFromJoint(joint, suffix=''):
+    '''
+    Returns guide name, 'Side_Description', for a joint.
+    The side is read from an L / R token in the joint name, 'M' without one.
+
+    joint  = (str) Joint name, ie. 'L_elbow_jnt' or 'elbow_L0_jnt'
+    suffix = (str) Added to the description
+    '''
+    side = 'M'
+    desc = []
+    for token in re.split('[^A-Za-z0-9]+', joint.split('|')[-1]):
+        if not token:
+            continue
+        sideMatch = re.match('^([LRMlrm])[0-9]*$', token)
+        if sideMatch and side == 'M':
+            side = sideMatch.group(1).upper()
+            continue
+        if token.lower() in IGNORE_TOKENS:
+            continue
+        desc.append(token[0].upper() + token[1:])
+    return side + '_' + ''.join(desc) + suffix
+
+
+def _blend(matA, matB, weight):
+    '''
+    Returns matA with its translation moved towards matB by weight
+    '''
+    mat = np.array(matA, dtype=np.float64).reshape(4, 4)
+    posB = np.asarray(matB, dtype=np.float64).reshape(4, 4)[3, :3]
+    mat[3, :3] += (posB - mat[3, :3]) * weight
+    return mat
+
+
+def planGuides(joints, parents, children, matrices, rules, existing=()):
+    '''
+    Returns (specs, skipped), the guides to create for the joints.
+
+    joints   = ([str]) Joints, in creation order
+    parents  = ({}) joint : parent transform or None
+    children = ({}) joint : first child joint or None
+    matrices = ({}) node : (4,4) world matrix, for the joints, parents and children
+    rules    = ([GuideRule]) Every matching rule creates a guide
+    existing = ([(guideType, guideName)]) Guides already in the scene
+
+    specs   = [{'guideType', 'guideName', 'joint', 'settings', 'matrices'}],
+              matrices is {'root' : (4,4)} for sliders and
+              {'start' : (4,4), 'end' : (4,4)} for stretch guides
+    skipped = [(joint, guideName, reason)]
+    '''
+    taken = set(existing)
+    specs = []
+    skipped = []
+    for joint in joints:
+        for rule in rules:
+            if not rule.matches(joint):
+                continue
+            guideName = guideNameFromJoint(joint, rule.suffix)
+            parent = parents.get(joint)
+            child = children.get(joint)
+
+            if (rule.guideType, guideName) in taken:
+                skipped.append((joint, guideName, '%s guide already exists' % rule.guideType))
+                continue
+            if parent is None:
+                skipped.append((joint, guideName, 'joint has no parent'))
+                continue
+            if rule.guideType == 'stretch' and child is None:
+                skipped.append((joint, guideName, 'joint has no child joint'))
+                continue
+
+            settings = dict(rule.settings)
+            if rule.guideType == 'slider':
+                settings.update(guideParent=parent, guideTracker=joint)
+                guideMatrices = {'root' : np.asarray(matrices[joint], dtype=np.float64).reshape(4, 4)}
+            else:
+                settings.update(startParent=parent, endParent=joint)
+                guideMatrices = {'start' : _blend(matrices[joint], matrices[parent], rule.startBlend),
+                                 'end'   : _blend(matrices[joint], matrices[child], rule.endBlend)}
+                # Start keeps the orientation of the segment it is attached to
+                guideMatrices['start'][:3, :3] = np.asarray(matrices[parent], dtype=np.float64).reshape(4, 4)[:3, :3]
+
+            taken.add((rule.guideType, guideName))
+            specs.append({'guideType' : rule.guideType,
+                          'guideName' : guideName,
+                          'joint'     : joint,
+                          'settings'  : settings,
+                          'matrices'  : guideMatrices})
+
+    return specs, skipped
@@ -0,0 +1,306 @@
+'''
+DESCRIPTION:
+    Studio guide template library.
+    Templates are guide files, .json or .npz, under one library folder,
+    named by their path relative to it ('biped', 'quad/dog').
+    An index file in the library folder keeps per template guide names,
+    types, sides and content hashes, so templates can be browsed and
+    filtered without being read. It is only rebuilt for templates whose
+    file changed.
+
+    Single guides are loaded without parsing the whole template:
+        .json, one guide per line, see guideFile.writeGuideFile(), index keeps
+               the byte range of each guide
+        .npz   index keeps the row of each guide
+        .json  in any other layout is parsed whole, once
+    Loaded guides are cached for the session, repeat loads of a template
+    that did not change skip parsing.
+USAGE:
+    import volume_sys_velan.scripts.guideLibrary as guideLibrary
+
+    library = guideLibrary.getLibrary()
+    library.templates()
+    keys = library.guides('biped', pattern='Shoulder', side='L')
+    gdeBackupDict = library.loadGuides('biped', keys)
+
+    library.saveTemplate('biped', gdeBackupDict)
+'''
+
+import hashlib
+import json
+import os
+import re
+
+import volume_sys_velan.scripts.guideFile as guideFile
+
+
+INDEX_VERSION = 1
+
+INDEX_FILE = 'guideLibrary.index.json'
+
+LIBRARY_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '../elements/template'))
+
+# (path, mtime, size) : {guide key : gdeAttrDict}, shared by all libraries
+_SESSION_CACHE = {}
+
+_LIBRARIES = {}
+
+
+def getLibrary(root=None):
+    '''
+    Returns the shared GuideLibrary of a folder, LIBRARY_DIR if None
+    '''
+    root = os.path.normpath(root or LIBRARY_DIR)
+    if root not in _LIBRARIES:
+        _LIBRARIES[root] = GuideLibrary(root)
+    return _LIBRARIES[root]
+
+
+def clearCache():
+    _SESSION_CACHE.clear()
+
+
+def guideHash(gdeAttrDict):
+    '''
+    Returns content hash of one guide, independent of attr order
+    '''
+    return hashlib.sha1(json.dumps(gdeAttrDict, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def guideEntry(key, gdeAttrDict):
+    '''
+    Returns index entry {'guideType', 'guideName', 'side', 'hash'} of one guide
+    '''
+    guideType = key.split('_')[-1]
+    guideName = key[:-(len(guideType)+1)]
+    return {'guideType' : guideType,
+            'guideName' : guideName,
+            'side'      : guideName.split('_')[0],
+            'hash'      : guideHash(gdeAttrDict)}
+
+
+def _fileStamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def scanTemplate(path):
+    '''
+    Returns {guide key : entry} of a template file, see guideEntry().
+    Entries also get 'offset' and 'length' (bytes) for one guide per line
+    .json files, or 'row' for .npz files.
+    '''
+    if os.path.splitext(path)[-1].lower() == '.npz':
+        gdeBackupDict = guideFile.readGuideFile(path)
+        entries = {}
+        for row, (key, gdeAttrDict) in enumerate(gdeBackupDict.items()):
+            entries[key] = guideEntry(key, gdeAttrDict)
+            entries[key]['row'] = row
+        return entries
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    decoder = json.JSONDecoder()
+    lines = data.split(b'\n')
+    if lines[0].strip() == b'{':
+        entries = {}
+        offset = len(lines[0]) + 1
+        for line in lines[1:]:
+            text = line.decode('utf-8').rstrip().rstrip(',')
+            if text in ['', '}']:
+                offset += len(line) + 1
+                continue
+            try:
+                key, keyEnd = decoder.raw_decode(text)
+                valueStart = len(text) - len(text[keyEnd:].lstrip().lstrip(':').lstrip())
+                gdeAttrDict = json.loads(text[valueStart:])
+            except ValueError:
+                break # Not one guide per line
+            entries[key] = guideEntry(key, gdeAttrDict)
+            entries[key]['offset'] = offset + len(text[:valueStart].encode('utf-8'))
+            entries[key]['length'] = len(text[valueStart:].encode('utf-8'))
+            offset += len(line) + 1
+        else:
+            return entries
+
+    gdeBackupDict = json.loads(data.decode('utf-8'))
+    return dict((key, guideEntry(key, gdeAttrDict)) for key, gdeAttrDict in gdeBackupDict.items())
+
+
+class GuideLibrary(object):
+    '''
+    Indexed guide template folder, see module description.
+
+    root = (str) Library folder
+    '''
+    def __init__(self, root=LIBRARY_DIR):
+        self.root      = os.path.normpath(root)
+        self.indexPath = os.path.join(self.root, INDEX_FILE)
+        self.index     = {'version':INDEX_VERSION, 'templates':{}}
+
+        if os.path.isfile(self.indexPath):
+            with open(self.indexPath, 'r') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                self.index = index
+        self.refresh()
+
+    def templatePath(self, template):
+        return os.path.join(self.root, self.index['templates'][template]['file'])
+
+    def templates(self):
+        return sorted(self.index['templates'])
+
+    def refresh(self):
+        '''
+        Re-indexes templates that were added or changed on disk, and drops
+        removed ones. Returns list of re-indexed template names.
+        '''
+        found = {}
+        if os.path.isdir(self.root):
+            for dirPath, dirNames, fileNames in os.walk(self.root):
+                for fileName in fileNames:
+                    name, ext = os.path.splitext(fileName)
+                    if fileName == INDEX_FILE or ext.lower() not in guideFile.FILE_TYPES:
+                        continue
+                    relPath = os.path.relpath(os.path.join(dirPath, fileName), self.root).replace(os.sep, '/')
+                    found[os.path.splitext(relPath)[0]] = relPath
+
+        templates = self.index['templates']
+        changed = [template for template in templates if template not in found]
+        for template in changed:
+            templates.pop(template)
+
+        reindexed = []
+        for template, relPath in sorted(found.items()):
+            path = os.path.join(self.root, relPath)
+            mtime, size = _fileStamp(path)
+            entry = templates.get(template)
+            if entry and entry['file'] == relPath and entry['mtime'] == mtime and entry['size'] == size:
+                continue
+            try:
+                guides = scanTemplate(path)
+            except (ValueError, KeyError, IOError) as error:
+                print('Guide library: cannot index %s: %s' % (relPath, error))
+                templates.pop(template, None)
+                continue
+            templates[template] = {'file':relPath, 'mtime':mtime, 'size':size, 'guides':guides}
+            reindexed.append(template)
+
+        if changed or reindexed:
+            self.saveIndex()
+        return reindexed
+
+    def saveIndex(self):
+        '''
+        Writes the index file. On a read-only library the index is only
+        kept in memory, and rebuilt by the next session.
+        '''
+        try:
+            if not os.path.isdir(self.root):
+                os.makedirs(self.root)
+            with open(self.indexPath, 'w') as f:
+                json.dump(self.index, f)
+        except (IOError, OSError) as error:
+            print('Guide library: cannot write index %s: %s' % (self.indexPath, error))
+
+    def guides(self, template, pattern=None, guideType=None, side=None):
+        '''
+        Returns guide keys of a template, in file order, from the index
+
+        pattern   = (str) Regex searched in guide names
+        guideType = (str) 'slider' or 'stretch'
+        side      = (str) Side token, 'L', 'R', 'M'
+        '''
+        regex = re.compile(pattern) if pattern else None
+        keys = []
+        for key, entry in self.index['templates'][template]['guides'].items():
+            if guideType and entry['guideType'] != guideType:
+                continue
+            if side and entry['side'] != side:
+                continue
+            if regex and not regex.search(entry['guideName']):
+                continue
+            keys.append(key)
+        return keys
+
+    def find(self, pattern=None, guideType=None, side=None):
+        '''
+        Returns [(template, guide key)] of all templates, see guides()
+        '''
+        return [(template, key) for template in self.templates()
+                for key in self.guides(template, pattern, guideType, side)]
+
+    def loadGuides(self, template, keys=None):
+        '''
+        Returns backup dict of a template's guides, see VolumeSystemUI.restoreGuides().
+        Only the requested guides are read, guides read before come from the session cache.
+        The returned guide dicts are shared with the cache, do not edit them.
+
+        keys = ([str]) Guide keys, all guides if None
+        '''
+        entry = self.index['templates'][template]
+        path = self.templatePath(template)
+        stamp = _fileStamp(path)
+        if stamp != (entry['mtime'], entry['size']):# Changed on disk, offsets are stale
+            self.refresh()
+            entry = self.index['templates'][template]
+            stamp = (entry['mtime'], entry['size'])
+
+        guides = entry['guides']
+        keys = list(guides) if keys is None else list(keys)
+        missing = [key for key in keys if key not in guides]
+        if missing:
+            raise KeyError('Template %s has no guide(s) %s' % (template, ', '.join(missing)))
+
+        cache = _SESSION_CACHE.setdefault((path,) + stamp, {})
+        toRead = [key for key in keys if key not in cache]
+        if toRead:
+            cache.update(self._readGuides(path, guides, toRead))
+
+        return dict((key, cache[key]) for key in keys)
+
+    def _readGuides(self, path, guides, keys):
+        if all('row' in guides[key] for key in keys):
+            rows = sorted(guides[key]['row'] for key in keys)
+            return guideFile.fromColumns(guideFile.readColumns(path), rows)
+
+        if all('offset' in guides[key] for key in keys):
+            gdeBackupDict = {}
+            with open(path, 'rb') as f:
+                for key in sorted(keys, key=lambda key: guides[key]['offset']):
+                    f.seek(guides[key]['offset'])
+                    gdeBackupDict[key] = json.loads(f.read(guides[key]['length']).decode('utf-8'))
+            return gdeBackupDict
+
+        return guideFile.readGuideFile(path)
+
+    def saveTemplate(self, template, gdeBackupDict, ext='.json'):
+        '''
+        Writes a template into the library and indexes it. Returns the file path.
+
+        template = (str) Template name, relative path without extension, 'biped'
+        ext      = (str) '.json' or '.npz', ignored when the template already exists
+        '''
+        if template in self.index['templates']:
+            path = self.templatePath(template)
+        else:
+            path = os.path.join(self.root, *(template + ext).split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        guideFile.writeGuideFile(path, gdeBackupDict)
+        self.refresh()
+        return path
+
+    def changedGuides(self, template, gdeBackupDict):
+        '''
+        Returns (added, changed, removed) guide keys of a backup dict compared
+        to a template, by content hash, without reading the template
+        '''
+        guides = self.index['templates'][template]['guides']
+        added = [key for key in gdeBackupDict if key not in guides]
+        changed = [key for key in gdeBackupDict if key in guides and guides[key]['hash'] != guideHash(gdeBackupDict[key])]
+        removed = [key for key in guides if key not in gdeBackupDict]
+        return added, changed, removed
@@ -0,0 +1,164 @@
+'''
+DESCRIPTION:
+    Guide attribute schema, declared once per guide node type.
+    The schema drives guide creation, backup, restore and the guide
+    frame widgets, so an attribute is only ever described here.
+    No Maya dependency.
+
+    SCHEMA_VERSION is stored on every guide root in 'schemaVersion'.
+    Applying the schema to an older guide adds the attributes it is
+    missing with their defaults, and updates the version.
+USAGE:
+    import volume_sys_velan.scripts.guideSchema as guideSchema
+
+    for attr in guideSchema.getSchema('slider'):
+        print(attr.name, attr.type, attr.default)
+
+    guideSchema.defaults('stretch')                 # {attr : default}
+    guideSchema.attrNames('slider', backup=True)    # Attrs written to guide files
+'''
+
+SCHEMA_VERSION = 2 # 1 = guides created before the schema
+
+
+class GuideAttr(object):
+    '''
+    A guide attribute.
+
+    name    = (str) Attribute name, used as long and short name
+    type    = (str) 'string', 'float', 'double', 'long' or 'bool'
+    default = Value set when the attribute is created, None leaves it unset
+    min     = (float) Minimum value, numeric types only
+    max     = (float) Maximum value, numeric types only
+    lock    = (bol) Lock the attribute after setting its value
+    keyable = (bol) Show the attribute in the channel box
+    backup  = (bol) Write the attribute to guide files
+    ui      = ({}) Guide frame widget hints, see VolumeSystemUI.buildSchemaWidget()
+    '''
+    __slots__ = ['name', 'type', 'default', 'min', 'max', 'lock', 'keyable', 'backup', 'ui']
+
+    TYPES = ['string', 'float', 'double', 'long', 'bool']
+
+    def __init__(self, name, type, default=None, min=None, max=None, lock=False, keyable=False, backup=True, ui=None):
+        if type not in self.TYPES:
+            raise ValueError('Guide attr %s: type must be one of %s' % (name, self.TYPES))
+        self.name    = name
+        self.type    = type
+        self.default = default
+        self.min     = min
+        self.max     = max
+        self.lock    = lock
+        self.keyable = keyable
+        self.backup  = backup
+        self.ui      = ui or {}
+
+    def __repr__(self):
+        return 'GuideAttr(%r, %r)' % (self.name, self.type)
+
+    def cast(self, value):
+        '''
+        Returns value converted to the attribute type, None stays None
+        '''
+        if value is None:
+            return None
+        if self.type == 'string':
+            return str(value)
+        if self.type == 'bool':
+            return bool(value)
+        if self.type == 'long':
+            return int(value)
+        return float(value)
+
+
+# Attributes on every guide node, root and controls
+_IDENTITY = [
+    GuideAttr('guideType', 'string', lock=True),
+    GuideAttr('guideName', 'string', lock=True),
+]
+
+SCHEMAS = {
+    'slider': _IDENTITY + [
+        GuideAttr('guideParent',   'string'),
+        GuideAttr('guideTracker',  'string'),
+        GuideAttr('globalScale',   'float', default=1.0),
+        GuideAttr('trackerMinRot', 'float', default=0.0, min=-360, max=360,
+                  ui={'widget':'spin', 'label':'Start', 'decimals':2, 'step':1, 'min':-360.0, 'max':360.0}),
+        GuideAttr('trackerMaxRot', 'float', default=-30.0, min=-360, max=360,
+                  ui={'widget':'spin', 'label':'End', 'decimals':2, 'step':1, 'min':-360.0, 'max':360.0}),
+        GuideAttr('currentValRef', 'float', backup=False),
+        GuideAttr('XYZ',           'long', default=1, min=0, max=2,
+                  ui={'widget':'combo', 'label':'Axis', 'items':['X', 'Y', 'Z']}),
+        GuideAttr('trackerRev',    'bool', default=False, ui={'widget':'check', 'label':'+ / -'}),
+        GuideAttr('sliderJoint',   'bool', default=True, ui={'widget':'check', 'label':'jnt'}),
+        GuideAttr('sliderDorito',  'bool', default=False, ui={'widget':'check', 'label':'dor'}),
+        GuideAttr('schemaVersion', 'long', default=SCHEMA_VERSION, lock=True, backup=False),
+    ],
+    'stretch': _IDENTITY + [
+        GuideAttr('startParent',   'string'),
+        GuideAttr('endParent',     'string'),
+        GuideAttr('globalScale',   'float', default=1.0),
+        GuideAttr('enableSns',     'bool', default=False, ui={'widget':'check', 'label':'Enable SNS'}),
+        GuideAttr('snsMultiplier', 'double', default=1.0, keyable=True,
+                  ui={'widget':'spin', 'label':'SNS Mult', 'decimals':2, 'step':1, 'min':0.01, 'max':50.0}),
+        GuideAttr('twist',         'bool', default=False, ui={'widget':'check', 'label':'Twist'}),
+        GuideAttr('stretchJoint',  'bool', default=True, ui={'widget':'check', 'label':'jnt'}),
+        GuideAttr('stretchDorito', 'bool', default=False, ui={'widget':'check', 'label':'dor'}),
+        GuideAttr('strDefPos',     'float', default=0.5, min=0, max=1,
+                  ui={'widget':'spin', 'label':'Str Def Pos', 'decimals':1, 'step':0.1, 'min':0.0, 'max':1.0}),
+        GuideAttr('schemaVersion', 'long', default=SCHEMA_VERSION, lock=True, backup=False),
+    ],
+    # Start, end and path curves
+    'control': list(_IDENTITY),
+}
+
+
+def getSchema(schema):
+    '''
+    Returns list of GuideAttr
+
+    schema = (str) 'slider', 'stretch' or 'control'
+    '''
+    if schema not in SCHEMAS:
+        raise KeyError('No guide schema for %r' % (schema,))
+    return SCHEMAS[schema]
+
+
+def getAttr(schema, name):
+    '''
+    Returns GuideAttr of a schema attribute, None if it is not in the schema
+    '''
+    for attr in getSchema(schema):
+        if attr.name == name:
+            return attr
+    return None
+
+
+def attrNames(schema, backup=None):
+    '''
+    Returns attribute names in schema order
+
+    backup = (bol) Only attrs written to guide files when True, only attrs
+             not written when False, all attrs when None
+    '''
+    return [attr.name for attr in getSchema(schema) if backup is None or attr.backup == backup]
+
+
+def defaults(schema):
+    '''
+    Returns {attr : default} for attributes with a default
+    '''
+    return dict((attr.name, attr.default) for attr in getSchema(schema) if attr.default is not None)
+
+
+def castValues(schema, values):
+    '''
+    Returns values converted to their attribute types.
+    Attributes that are not in the schema are dropped.
+
+    values = ({}) attr : value
+    '''
+    cast = {}
+    for attr in getSchema(schema):
+        if attr.name in values:
+            cast[attr.name] = attr.cast(values[attr.name])
+    return cast
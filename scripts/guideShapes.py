@@ -0,0 +1,166 @@
+'''
+DESCRIPTION:
+    Guide control shapes, defined once as point arrays.
+    Shapes are linear curves with one knot per point. Extra shapes, or
+    replacements for the defaults, can be loaded from a shape library.
+    No Maya dependency.
+USAGE:
+    import volume_sys_velan.scripts.guideShapes as guideShapes
+
+    points, knots, degree = guideShapes.getShape('sliderStart', scale=2.0)
+
+    # Shape library, json file of {shapeName : {'points' : [[x,y,z]], 'degree' : 1}}
+    guideShapes.loadShapeLibrary('/path/to/guideShapes.json')
+'''
+
+import json
+
+import numpy as np
+
+
+SHAPES = {}
+
+
+def addShape(name, points, degree=1, knots=None):
+    '''
+    Adds or replaces a shape
+
+    name   = (str) Shape name
+    points = ([(x,y,z)]) Control points
+    degree = (int) Curve degree
+    knots  = ([]) Knot vector, one knot per point when None and degree == 1
+    '''
+    points = np.array(points, dtype=np.float64).reshape(-1, 3)
+    if knots is None:
+        if degree != 1:
+            raise ValueError('Shape %s needs a knot vector for degree %s' % (name, degree))
+        knots = range(len(points))
+    points.setflags(write=False)
+    SHAPES[name] = (points, tuple(float(k) for k in knots), degree)
+
+
+def getShape(name, scale=1.0):
+    '''
+    Returns points ((N,3) array), knots and degree of a shape
+
+    name  = (str) Shape name
+    scale = (float) Uniform scale applied to the points
+    '''
+    if name not in SHAPES:
+        raise KeyError('Unknown guide shape %r' % name)
+    points, knots, degree = SHAPES[name]
+    if scale != 1.0:
+        points = points * scale
+    return points, knots, degree
+
+
+def loadShapeLibrary(path):
+    '''
+    Loads shapes from a json shape library, returns list of loaded shape names
+
+    path = (str) json file of {shapeName : {'points' : [[x,y,z]], 'degree' : 1, 'knots' : []}}
+    '''
+    with open(path, 'r') as f:
+        library = json.load(f)
+
+    for name, shape in library.items():
+        addShape(name, shape['points'], shape.get('degree', 1), shape.get('knots'))
+
+    return list(library)
+
+
+def saveShapeLibrary(path, names=None):
+    '''
+    Writes shapes to a json shape library
+
+    path  = (str) json file path
+    names = ([]) Shapes to write, all shapes if None
+    '''
+    if names is None:
+        names = list(SHAPES)
+
+    library = {}
+    for name in names:
+        points, knots, degree = SHAPES[name]
+        library[name] = {'points' : points.tolist(), 'knots' : list(knots), 'degree' : degree}
+
+    with open(path, 'w') as f:
+        json.dump(library, f, indent=2)
+
+
+addShape('sliderStart', [
+        (0.65043, 0, 0), (0.600919, 0, -0.248908), (0.248908, 0, -0.600919), (0, 0, -0.65043),
+        (-0.248908, 0, -0.600919), (-0.459923, 0, -0.459923), (-0.600919, 0, -0.248908),
+        (-0.65043, 0, 0), (-0.600919, 0, 0.248908), (-0.459923, 0, 0.459923),
+        (-0.248908, 0, 0.600919), (0, 0, 0.65043), (0.248908, 0, 0.600919),
+        (0.459923, 0, 0.459923), (0.600919, 0, 0.248908), (0.65043, 0, 0), (0.600919, 0.248908, 0),
+        (0.459923, 0.459923, 0), (0.248908, 0.600919, 0), (0, 0.65043, 0),
+        (-0.248908, 0.600919, 0), (-0.459923, 0.459923, 0), (-0.600919, 0.248908, 0),
+        (-0.65043, 0, 0), (-0.600919, -0.248908, 0), (-0.459923, -0.459923, 0),
+        (-0.248908, -0.600919, 0), (0, -0.65043, 0), (0, -0.600919, -0.248908),
+        (0, -0.459923, -0.459923), (0, -0.248908, -0.600919), (0, 0, -0.65043),
+        (0, 0.248908, -0.600919), (0, 0.459923, -0.459923), (0, 0.600919, -0.248908),
+        (0, 0.65043, 0), (0, 0.600919, 0.248908), (0, 0.459923, 0.459923), (0, 0.248908, 0.600919),
+        (0, 0, 0.65043), (0, -0.248908, 0.600919), (0, -0.459923, 0.459923),
+        (0, -0.600919, 0.248908), (0, -0.65043, 0), (0.248908, -0.600919, 0),
+        (0.459923, -0.459923, 0), (0.600919, -0.248908, 0), (0.65043, 0, 0),
+        (0.600919, 0.248908, 0), (0.459923, 0.459923, 0), (0.248908, 0.600919, 0), (0, 0.65043, 0)])
+
+addShape('sliderEnd', [
+        (-2, 0, 0), (0, 0, 0), (0, 0, 2), (0, 0, 0), (2, 0, 0), (0, 0, 0), (0, 0, -2), (0, 0, 0),
+        (0, 2, 0), (0, 0, 0), (0, -2, 0), (0, 0, 0), (0.650566, 0, 0), (0.601045, 0, -0.248961),
+        (0.46002, 0, -0.46002), (0.248961, 0, -0.601045), (0, 0, -0.650566),
+        (-0.248961, 0, -0.601045), (-0.46002, 0, -0.46002), (-0.601045, 0, -0.248961),
+        (-0.650566, 0, 0), (-0.601045, 0, 0.248961), (-0.46002, 0, 0.46002),
+        (-0.248961, 0, 0.601045), (0, 0, 0.650566), (0.248961, 0, 0.601045), (0.46002, 0, 0.46002),
+        (0.601045, 0, 0.248961), (0.650566, 0, 0), (0.601045, 0.248961, 0), (0.46002, 0.46002, 0),
+        (0.248961, 0.601045, 0), (0, 0.650566, 0), (-0.248961, 0.601045, 0),
+        (-0.46002, 0.46002, 0), (-0.601045, 0.248961, 0), (-0.650566, 0, 0),
+        (-0.601045, -0.248961, 0), (-0.46002, -0.46002, 0), (-0.248961, -0.601045, 0),
+        (0, -0.650566, 0), (0, -0.601045, -0.248961), (0, -0.46002, -0.46002),
+        (0, -0.248961, -0.601045), (0, 0, -0.650566), (0, 0.248961, -0.601045),
+        (0, 0.46002, -0.46002), (0, 0.601045, -0.248961), (0, 0.650566, 0),
+        (0, 0.601045, 0.248961), (0, 0.46002, 0.46002), (0, 0.248961, 0.601045), (0, 0, 0.650566),
+        (0, -0.248961, 0.601045), (0, -0.46002, 0.46002), (0, -0.601045, 0.248961),
+        (0, -0.650566, 0), (0.248961, -0.601045, 0), (0.46002, -0.46002, 0),
+        (0.601045, -0.248961, 0), (0.650566, 0, 0), (0.601045, 0.248961, 0), (0.46002, 0.46002, 0),
+        (0.248961, 0.601045, 0), (0, 0.650566, 0)])
+
+addShape('stretchStart', [
+        (0, 0, 0.81), (0.309973, 0, 0.748343), (0.572757, 0, 0.572757), (0.748343, 0, 0.309973),
+        (0.81, 0, 0), (0.748343, 0, -0.309973), (0.572757, 0, -0.572757), (0.309973, 0, -0.748343),
+        (0, 0, -0.81), (-0.309973, 0, -0.748343), (-0.572757, 0, -0.572757),
+        (-0.748343, 0, -0.309973), (-0.81, 0, 0), (-0.748343, 0, 0.309973),
+        (-0.572757, 0, 0.572757), (-0.309973, 0, 0.748343), (0, 0, 0.81), (0, 0.309973, 0.748343),
+        (0, 0.572757, 0.572757), (0, 0.748343, 0.309973), (0, 0.81, 0), (0.309973, 0.748343, 0),
+        (0.572757, 0.572757, 0), (0.748343, 0.309973, 0), (0.81, 0, 0), (0.748343, -0.309973, 0),
+        (0.572757, -0.572757, 0), (0.309973, -0.748343, 0), (0, -0.81, 0),
+        (-0.309973, -0.748343, 0), (-0.572757, -0.572757, 0), (-0.748343, -0.309973, 0),
+        (-0.81, 0, 0), (-0.748343, 0.309973, 0), (-0.572757, 0.572757, 0),
+        (-0.309973, 0.748343, 0), (0, 0.81, 0), (0, 0.748343, -0.309973), (0, 0.572757, -0.572757),
+        (0, 0.309973, -0.748343), (0, 0, -0.81), (0, -0.309973, -0.748343),
+        (0, -0.572757, -0.572757), (0, -0.748343, -0.309973), (0, -0.81, 0),
+        (0, -0.748343, 0.309973), (0, -0.572757, 0.572757), (0, -0.309973, 0.748343), (0, 0, 0.81)])
+
+addShape('stretchEnd', [
+        (0, 0, 0.696254), (0.266445, 0, 0.643255), (0.492326, 0, 0.492326),
+        (0.643255, 0, 0.266445), (0.696254, 0, 0), (0.643255, 0, -0.266445),
+        (0.492326, 0, -0.492326), (0.266445, 0, -0.643255), (0, 0, -0.696254),
+        (-0.266445, 0, -0.643255), (-0.492326, 0, -0.492326), (-0.643255, 0, -0.266445),
+        (-0.696254, 0, 0), (-0.643255, 0, 0.266445), (-0.492326, 0, 0.492326),
+        (-0.266445, 0, 0.643255), (0, 0, 0.696254), (0, 0.266445, 0.643255),
+        (0, 0.492326, 0.492326), (0, 0.643255, 0.266445), (0, 0.696254, 0),
+        (0.266445, 0.643255, 0), (0.492326, 0.492326, 0), (0.643255, 0.266445, 0),
+        (0.696254, 0, 0), (0.643255, -0.266445, 0), (0.492326, -0.492326, 0),
+        (0.266445, -0.643255, 0), (0, -0.696254, 0), (-0.266445, -0.643255, 0),
+        (-0.492326, -0.492326, 0), (-0.643255, -0.266445, 0), (-0.696254, 0, 0),
+        (-0.643255, 0.266445, 0), (-0.492326, 0.492326, 0), (-0.266445, 0.643255, 0),
+        (0, 0.696254, 0), (0, 0.643255, -0.266445), (0, 0.492326, -0.492326),
+        (0, 0.266445, -0.643255), (0, 0, -0.696254), (0, -0.266445, -0.643255),
+        (0, -0.492326, -0.492326), (0, -0.643255, -0.266445), (0, -0.696254, 0),
+        (0, -0.643255, 0.266445), (0, -0.492326, 0.492326), (0, -0.266445, 0.643255),
+        (0, 0, 0.696254), (0, 0, 2), (0, 0, -2), (0, 0, 0), (0, 2, 0), (0, -2, 0), (0, 0, 0),
+        (-2, 0, 0), (2, 0, 0)])
+
+addShape('guidePath', [
+        (0, 0, 1), (0, 0, 0)])
@@ -0,0 +1,277 @@
+'''
+DESCRIPTION:
+    Offline guide file toolkit, runs without Maya.
+    Validates, diffs, merges, mirrors, renames and converts .json / .npz
+    guide files, using the same schema, naming and mirror rules as the
+    Volume System UI.
+USAGE:
+    python -m volume_sys_velan.scripts.guideTool validate biped.json quad.npz
+    python -m volume_sys_velan.scripts.guideTool diff old.json new.json
+    python -m volume_sys_velan.scripts.guideTool merge base.json update.json -o merged.json --remove-extras
+    python -m volume_sys_velan.scripts.guideTool mirror biped.json -o biped.json --side L
+    python -m volume_sys_velan.scripts.guideTool rename biped.json -o biped.json --pattern Bicep --replace Biceps
+    python -m volume_sys_velan.scripts.guideTool convert biped.json biped.npz
+
+    # As a library
+    import volume_sys_velan.scripts.guideTool as guideTool
+    issues = guideTool.validateGuides(guideFile.readGuideFile(path))
+'''
+
+import argparse
+import re
+import sys
+
+import numpy as np
+
+import volume_sys_velan.scripts.guideFile as guideFile
+import volume_sys_velan.scripts.guideDiff as guideDiff
+import volume_sys_velan.scripts.guideSchema as guideSchema
+import volume_sys_velan.scripts.sideNaming as sideNaming
+import volume_sys_velan.scripts.symmetry as sym
+
+
+ERROR = 'ERROR'
+WARNING = 'WARNING'
+
+
+def validateRecord(record):
+    '''
+    Returns list of (level, message) for one GuideRecord
+    '''
+    issues = []
+    if record.guideType not in guideFile.GUIDE_TAGS:
+        return [(ERROR, 'unknown guide type %r' % record.guideType)]
+
+    if record.settings.get('guideName') != record.guideName:
+        issues.append((ERROR, 'guideName attr %r does not match key' % record.settings.get('guideName')))
+    if record.settings.get('guideType') != record.guideType:
+        issues.append((ERROR, 'guideType attr %r does not match key' % record.settings.get('guideType')))
+
+    root, start, end = guideFile.guideNodeNames(record.guideType, record.guideName)
+    if record.root != root:
+        issues.append((WARNING, 'root %r, expected %r' % (record.root, root)))
+    if record.ctls != [start, end]:
+        issues.append((WARNING, 'controls %r, expected %r' % (record.ctls, [start, end])))
+
+    for attr, value, attrType in record.attrs:
+        schemaAttr = guideSchema.getAttr(record.guideType, attr)
+        if schemaAttr is None:
+            issues.append((WARNING, 'attr %s is not in the %s schema' % (attr, record.guideType)))
+            continue
+        if attrType != schemaAttr.type:
+            issues.append((WARNING, 'attr %s stored as %s, schema type is %s' % (attr, attrType, schemaAttr.type)))
+        value = record.settings.get(attr)# Typed by the schema, the stored value can be a string
+        if value is None:
+            continue
+        if schemaAttr.min is not None and value < schemaAttr.min or schemaAttr.max is not None and value > schemaAttr.max:
+            issues.append((WARNING, 'attr %s = %r is outside %s..%s' % (attr, value, schemaAttr.min, schemaAttr.max)))
+    if 'globalScale' not in record.settings:
+        issues.append((WARNING, 'no globalScale, 1.0 is used'))
+
+    matrices = record.matrices
+    if not np.isfinite(matrices).all():
+        issues.append((ERROR, 'matrices are not finite'))
+    elif not np.allclose(matrices[:, :, 3], [0, 0, 0, 1]):
+        issues.append((ERROR, 'matrices are not affine'))
+    elif (np.abs(np.linalg.det(matrices[:, :3, :3])) < 1e-9).any():
+        issues.append((ERROR, 'matrices have zero scale'))
+
+    return issues
+
+
+def validateGuides(gdeBackupDict):
+    '''
+    Returns list of (guide key, level, message) for a backup dict
+    '''
+    issues = []
+    for key, gdeAttrDict in gdeBackupDict.items():
+        try:
+            record = guideFile.GuideRecord(key, gdeAttrDict)
+        except (ValueError, TypeError, IndexError) as error:
+            issues.append((key, ERROR, 'cannot parse guide: %s' % error))
+            continue
+        issues += [(key, level, message) for level, message in validateRecord(record)]
+    return issues
+
+
+def diffGuides(baseDict, otherDict):
+    '''
+    Returns GuideDiff of otherDict merged into baseDict
+    '''
+    return guideDiff.GuideDiff(list(guideFile.iterGuideRecords(otherDict)),
+                               list(guideFile.iterGuideRecords(baseDict)))
+
+
+def mergeGuides(baseDict, otherDict, removeExtras=False):
+    '''
+    Returns (merged backup dict, GuideDiff). Guides of otherDict are added to
+    or replace those of baseDict, base guides missing from otherDict are
+    dropped when removeExtras is True.
+    '''
+    diff = diffGuides(baseDict, otherDict)
+    merged = dict(baseDict)
+    for record in diff.create:
+        merged[record.key] = otherDict[record.key]
+    for fileRecord, liveRecord, attrs, matrices in diff.update:
+        merged[fileRecord.key] = otherDict[fileRecord.key]
+    if removeExtras:
+        for record in diff.remove:
+            merged.pop(record.key)
+    return merged, diff
+
+
+def renameRecord(record, guideName):
+    '''
+    Renames a GuideRecord in place, key, guideName attr and node names
+    '''
+    record.key = guideName + '_' + record.guideType
+    record.guideName = guideName
+    root, start, end = guideFile.guideNodeNames(record.guideType, guideName)
+    record.root = root
+    record.ctls = [start, end]
+    record.attrs = [(attr, guideName if attr == 'guideName' else value, attrType) for attr, value, attrType in record.attrs]
+    record.settings['guideName'] = guideName
+    return record
+
+
+def renameGuides(gdeBackupDict, pattern, replace):
+    '''
+    Returns (renamed backup dict, [(old key, new key)]), guide names are
+    renamed with re.sub(pattern, replace, guideName)
+    '''
+    renamed = {}
+    changes = []
+    for record in guideFile.iterGuideRecords(gdeBackupDict):
+        oldKey = record.key
+        guideName = re.sub(pattern, replace, record.guideName)
+        if guideName != record.guideName:
+            renameRecord(record, guideName)
+            changes.append((oldKey, record.key))
+        if record.key in renamed:
+            raise ValueError('Renaming %s collides with guide %s' % (oldKey, record.key))
+        renamed[record.key] = record.toBackup()
+    return renamed, changes
+
+
+def mirrorGuides(gdeBackupDict, sourceSide='L', axis='yz', plane=None, replace=True):
+    '''
+    Returns (backup dict with mirrored guides added, [(source key, target key)]).
+    Guides of sourceSide are mirrored with the UI naming and mirror rules,
+    see symmetry and sideNaming.
+
+    replace = (bol) Overwrite existing opposite side guides
+    '''
+    records = list(guideFile.iterGuideRecords(gdeBackupDict))
+    sources = [record for record in records if record.guideName.split('_')[0] == sourceSide]
+    mirrored = dict(gdeBackupDict)
+    pairs = []
+    if sources == []:
+        return mirrored, pairs
+
+    matrices = sym.mirrorMatrices(np.stack([record.matrices for record in sources]).reshape(-1, 4, 4), axis, plane).reshape(-1, 2, 4, 4)
+    convertName = sideNaming.getConverter(0).convert
+    for record, recordMatrices in zip(sources, matrices):
+        mirrName = sideNaming.convertName(record.guideName, side_format=1)
+        if mirrName == record.guideName:
+            continue
+        if not replace and mirrName + '_' + record.guideType in mirrored:
+            continue
+
+        settings = sym.mirrorGuideSettings(record.guideType, record.settings, convertName)
+        record.attrs = [(attr, settings[attr] if settings.get(attr) is not None else value, attrType)
+                        for attr, value, attrType in record.attrs]
+        record.settings.update((attr, value) for attr, value in settings.items() if value is not None)
+        record.matrices = recordMatrices
+
+        sourceKey = record.key
+        renameRecord(record, mirrName)
+        mirrored[record.key] = record.toBackup()
+        pairs.append((sourceKey, record.key))
+
+    return mirrored, pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='guideTool', description='Volume System guide file toolkit')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    validate = commands.add_parser('validate', help='Check guide files against the guide schema')
+    validate.add_argument('files', nargs='+')
+    validate.add_argument('--strict', action='store_true', help='Fail on warnings too')
+
+    diff = commands.add_parser('diff', help='Show what merging other into base would change')
+    diff.add_argument('base')
+    diff.add_argument('other')
+
+    merge = commands.add_parser('merge', help='Merge other into base')
+    merge.add_argument('base')
+    merge.add_argument('other')
+    merge.add_argument('-o', '--output', required=True)
+    merge.add_argument('--remove-extras', action='store_true', help='Drop base guides missing from other')
+
+    mirror = commands.add_parser('mirror', help='Mirror guides of one side to the other')
+    mirror.add_argument('file')
+    mirror.add_argument('-o', '--output', required=True)
+    mirror.add_argument('--side', default='L', help='Side to mirror from')
+    mirror.add_argument('--axis', default='yz', choices=sorted(sym.MIRROR_AXES))
+    mirror.add_argument('--keep-existing', action='store_true', help='Do not overwrite existing opposite side guides')
+
+    rename = commands.add_parser('rename', help='Rename guides with a regex')
+    rename.add_argument('file')
+    rename.add_argument('-o', '--output', required=True)
+    rename.add_argument('--pattern', required=True)
+    rename.add_argument('--replace', required=True)
+
+    convert = commands.add_parser('convert', help='Convert between .json and .npz')
+    convert.add_argument('input')
+    convert.add_argument('output')
+    convert.add_argument('--compress', action='store_true')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'validate':
+        failed = False
+        for path in args.files:
+            issues = validateGuides(guideFile.readGuideFile(path))
+            errors = [issue for issue in issues if issue[1] == ERROR]
+            print('%s: %s error(s), %s warning(s)' % (path, len(errors), len(issues) - len(errors)))
+            for key, level, message in issues:
+                print('  %-7s %s: %s' % (level, key, message))
+            failed = failed or bool(errors) or (args.strict and bool(issues))
+        return 1 if failed else 0
+
+    if args.command == 'diff':
+        result = diffGuides(guideFile.readGuideFile(args.base), guideFile.readGuideFile(args.other))
+        print(result.report())
+        return 0 if result.isEmpty() else 1
+
+    if args.command == 'merge':
+        merged, result = mergeGuides(guideFile.readGuideFile(args.base), guideFile.readGuideFile(args.other), args.remove_extras)
+        print(result.report(args.remove_extras))
+        guideFile.writeGuideFile(args.output, merged)
+        return 0
+
+    if args.command == 'mirror':
+        mirrored, pairs = mirrorGuides(guideFile.readGuideFile(args.file), args.side, args.axis, replace=not args.keep_existing)
+        for source, target in pairs:
+            print('  %s -> %s' % (source, target))
+        print('Mirrored %s guide(s)' % len(pairs))
+        guideFile.writeGuideFile(args.output, mirrored)
+        return 0
+
+    if args.command == 'rename':
+        renamed, changes = renameGuides(guideFile.readGuideFile(args.file), args.pattern, args.replace)
+        for old, new in changes:
+            print('  %s -> %s' % (old, new))
+        print('Renamed %s guide(s)' % len(changes))
+        guideFile.writeGuideFile(args.output, renamed)
+        return 0
+
+    if args.command == 'convert':
+        guideFile.writeGuideFile(args.output, guideFile.readGuideFile(args.input), compress=args.compress)
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+'''
+DESCRIPTION:
+    Nearest joint lookup for assigning guide parents and trackers.
+    Distances from every guide start / end to all joint positions, or
+    bone samples, are computed in one NumPy batch and reduced to the
+    nearest sample per joint, a skeleton is small enough to need no tree.
+    Pure NumPy, no Maya dependency.
+
+    Slider guide:  guideTracker = joint nearest to the start,
+                   guideParent  = parent of that joint
+    Stretch guide: startParent  = joint driving the bone nearest to the start,
+                   endParent    = joint driving the bone nearest to the end
+
+    Bones are sampled between each joint and its parent, and samples are
+    driven by the parent, so a point half way down the upper arm resolves
+    to the shoulder.
+USAGE:
+    import volume_sys_velan.scripts.jointIndex as jointIndex
+
+    index = jointIndex.JointIndex(joints, parents, matrices)
+    suggestions, ambiguous = index.suggest(guideRecords)
+    print(index.report(suggestions, ambiguous))
+'''
+
+import numpy as np
+
+
+class JointIndex(object):
+    '''
+    Spatial index of a skeleton.
+
+    joints   = ([str]) Joint names
+    parents  = ({}) joint : parent transform or None
+    matrices = ((N,4,4)) Joint world matrices, in joints order
+    samples  = (int) Samples per bone, between a joint and its parent joint
+    ratio    = (float) A suggestion is ambiguous when the nearest distance is
+               more than ratio * the distance to the next candidate
+    '''
+    def __init__(self, joints, parents, matrices, samples=3, ratio=0.8):
+        self.joints  = list(joints)
+        self.parents = parents
+        self.ratio   = ratio
+
+        positions = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)[:, 3, :3]
+        self.jointPoints = positions
+
+        # Joint positions drive themselves, bone samples are driven by the parent joint
+        jointIds = dict((joint, i) for i, joint in enumerate(self.joints))
+        bonePoints = [positions]
+        boneDrivers = [np.arange(len(self.joints))]
+        weights = np.arange(1, samples + 1) / float(samples + 1)
+        for i, joint in enumerate(self.joints):
+            parent = parents.get(joint)
+            if parent in jointIds:
+                start = positions[jointIds[parent]]
+                bonePoints.append(start + (positions[i] - start) * weights[:, None])
+                boneDrivers.append(np.full(samples, jointIds[parent]))
+        self.bonePoints = np.concatenate(bonePoints)
+        self.boneDrivers = np.concatenate(boneDrivers)
+
+    def nearest(self, points, bones=False, count=2):
+        '''
+        Returns per point list of up to count (joint, distance), nearest first,
+        one entry per joint. All points are measured in one batch, bone samples
+        are reduced to their nearest sample per driver joint first.
+
+        points = ((M,3)) Query points
+        bones  = (bol) Match against bone drivers instead of joint positions
+        '''
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if self.joints == [] or len(points) == 0:
+            return [[] for p in points]
+
+        targets = self.bonePoints if bones else self.jointPoints
+        dists = ((points[:, None] - targets[None]) ** 2).sum(axis=-1) # (M, targets)
+        if bones:
+            jointDists = np.full((len(points), len(self.joints)), np.inf)
+            np.minimum.at(jointDists, (slice(None), self.boneDrivers), dists)
+            dists = jointDists
+
+        k = min(count, len(self.joints))
+        nearest = np.argpartition(dists, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(dists, nearest, axis=1).argsort(axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearestDists = np.sqrt(np.take_along_axis(dists, nearest, axis=1))
+
+        return [[(self.joints[j], d) for j, d in zip(rowIdx, rowDist) if d != np.inf]
+                for rowIdx, rowDist in zip(nearest.tolist(), nearestDists.tolist())]
+
+    def isAmbiguous(self, candidates):
+        return len(candidates) > 1 and candidates[0][1] > self.ratio * candidates[1][1]
+
+    def suggest(self, records):
+        '''
+        Returns (suggestions, ambiguous) for guides, in one query per tree.
+
+        records = ({}) guide key : {'guideType', 'start' (3,), 'end' (3,)}
+
+        suggestions = {guide key : {attr : joint}}
+        ambiguous   = [(guide key, attr, [(joint, distance)])]
+        '''
+        keys = list(records)
+        sliders = [key for key in keys if records[key]['guideType'] == 'slider']
+        stretches = [key for key in keys if records[key]['guideType'] == 'stretch']
+
+        suggestions = dict((key, {}) for key in keys)
+        ambiguous = []
+
+        if sliders:
+            points = np.array([records[key]['start'] for key in sliders], dtype=np.float64)
+            for key, candidates in zip(sliders, self.nearest(points)):
+                if candidates == []:
+                    continue
+                tracker = candidates[0][0]
+                suggestions[key]['guideTracker'] = tracker
+                if self.parents.get(tracker):
+                    suggestions[key]['guideParent'] = self.parents[tracker]
+                if self.isAmbiguous(candidates):
+                    ambiguous.append((key, 'guideTracker', candidates))
+
+        if stretches:
+            points = np.array([records[key][end] for key in stretches for end in ['start', 'end']], dtype=np.float64)
+            results = self.nearest(points, bones=True)
+            for i, key in enumerate(stretches):
+                for attr, candidates in zip(['startParent', 'endParent'], results[i*2:i*2+2]):
+                    if candidates == []:
+                        continue
+                    suggestions[key][attr] = candidates[0][0]
+                    if self.isAmbiguous(candidates):
+                        ambiguous.append((key, attr, candidates))
+
+        return suggestions, ambiguous
+
+    def report(self, suggestions, ambiguous):
+        '''
+        Returns readable summary of suggestions
+        '''
+        lines = ['Joint suggestions: %s guide(s), %s ambiguous' % (len(suggestions), len(ambiguous))]
+        for key, attrs in suggestions.items():
+            lines.append('  %s : %s' % (key, ', '.join('%s=%s' % (attr, joint) for attr, joint in sorted(attrs.items()))))
+        for key, attr, candidates in ambiguous:
+            lines.append('  AMBIGUOUS  %s.%s : %s' % (key, attr, ', '.join('%s (%.3f)' % c for c in candidates)))
+        return '\n'.join(lines)
@@ -0,0 +1,141 @@
+'''
+DESCRIPTION:
+    Side name translation used when mirroring guides, L <-> R.
+    Patterns are compiled once per convention, and converted names are
+    kept in a bounded LRU cache, so mirroring a full character spends
+    next to no time on naming.
+    No Maya dependency.
+USAGE:
+    import volume_sys_velan.scripts.sideNaming as sideNaming
+
+    sideNaming.convertName('L_Bicep', side_format=1)       # 'R_Bicep'
+    sideNaming.convertName('shoulder_L0_jnt')              # 'shoulder_R0_jnt'
+    sideNaming.convertNames(names)                         # Bulk
+
+    # Custom convention, ie. 'Lf' / 'Rt' tokens
+    sideNaming.registerConvention('leftRight', sideNaming.SideConvention(
+        {'Lf':'Rt', 'Rt':'Lf'}, prefix=True, middle=True, suffix=True))
+    sideNaming.convertName('arm_Lf_jnt', side_format='leftRight')
+'''
+
+import re
+from functools import lru_cache
+
+
+class SideConvention(object):
+    '''
+    A side naming convention.
+    Defines which side tokens are swapped, and where in a name they may
+    appear. Tokens are separated by underscores, and may carry an index
+    when digits is enabled, ie. 'arm_L0_fk0'.
+
+    pairs  = ({}) Side token : opposite side token
+    prefix = (bol) Token can start the name, 'L_arm'
+    middle = (bol) Token can be between underscores, 'arm_L_jnt'
+    suffix = (bol) Token can end the name, 'arm_L'
+    digits = (bol) Token can be followed by an index, 'arm_L0_jnt'
+    '''
+    def __init__(self, pairs, prefix=True, middle=True, suffix=True, digits=True):
+        self.pairs = dict(pairs)
+
+        # Longest tokens first, so 'Lf' wins over 'L'
+        sides = '|'.join(re.escape(side) for side in sorted(self.pairs, key=len, reverse=True))
+        index = '[0-9]*' if digits else ''
+        positions = []
+        if prefix:
+            positions.append('^(?=(?:%s)%s_)' % (sides, index))
+        if middle:
+            positions.append('(?<=_)(?=(?:%s)%s_)' % (sides, index))
+        if suffix:
+            positions.append('(?<=_)(?=(?:%s)%s$)' % (sides, index))
+        if positions == []:
+            raise ValueError('Side convention needs at least one token position')
+
+        self.pattern = re.compile('(?:%s)(?:%s)' % ('|'.join(positions), sides))
+
+    def swap(self, match):
+        return self.pairs[match.group(0)]
+
+
+class SideNameConverter(object):
+    '''
+    Converts names to the opposite side with one convention.
+    Results are memoized in a bounded LRU cache.
+
+    convention = (SideConvention) Naming convention to use
+    cacheSize  = (int) Maximum number of cached names
+    '''
+    def __init__(self, convention, cacheSize=8192):
+        self.convention = convention
+        self.convert = lru_cache(maxsize=cacheSize)(self._convert)
+
+    def _convert(self, name):
+        if not name or '_' not in name:
+            return name
+        return self.convention.pattern.sub(self.convention.swap, name)
+
+    def convertMany(self, names):
+        '''
+        Returns list of converted names, in matching order
+        '''
+        convert = self.convert
+        return [convert(name) for name in names]
+
+    def clearCache(self):
+        self.convert.cache_clear()
+
+
+_LEFT_RIGHT = {'L':'R', 'R':'L', 'l':'r', 'r':'l'}
+
+# side_format keys, matching VolumeSystemUI.convertRLName
+CONVENTIONS = {
+    0 : SideConvention(_LEFT_RIGHT, prefix=False, middle=True, suffix=False), # 'arm_L_jnt'
+    1 : SideConvention(_LEFT_RIGHT, prefix=True, middle=True, suffix=False),  # 'L_arm'
+    2 : SideConvention(_LEFT_RIGHT, prefix=False, middle=True, suffix=True),  # 'arm_L'
+}
+
+_converters = {}
+
+
+def registerConvention(key, convention):
+    '''
+    Adds or replaces a naming convention
+
+    key        = (str, int) side_format key
+    convention = (SideConvention) Naming convention
+    '''
+    CONVENTIONS[key] = convention
+    _converters.pop(key, None)
+
+
+def getConverter(side_format=0):
+    '''
+    Returns the cached SideNameConverter for a convention
+    '''
+    converter = _converters.get(side_format)
+    if converter is None:
+        if side_format not in CONVENTIONS:
+            raise KeyError('No side naming convention registered for %r' % (side_format,))
+        converter = _converters[side_format] = SideNameConverter(CONVENTIONS[side_format])
+    return converter
+
+
+def convertName(name, side_format=0):
+    '''
+    Returns name converted to the opposite side.
+    Names without a side token are returned unchanged.
+
+    name        = (str) Name to convert
+    side_format = (str, int) Naming convention key
+    '''
+    return getConverter(side_format).convert(name)
+
+
+def convertNames(names, side_format=0):
+    '''
+    Returns list of names converted to the opposite side, in matching order
+
+    names       = ([str]) Names to convert
+    side_format = (str, int) Naming convention key
+    '''
+    return getConverter(side_format).convertMany(names)
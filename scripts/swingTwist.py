@@ -0,0 +1,281 @@
+'''
+DESCRIPTION:
+    Batched rotation math for twist extraction, over (N,4,4) matrix arrays.
+    Pure NumPy, no Maya dependency, and no quatNodes plugin.
+
+    extractTwist() gives the same value as the VolumeSystemUI.extractTwist()
+    network, tip.worldMatrix * root.worldInverseMatrix -> decomposeMatrix ->
+    quatToEuler, read on the twist axis with the same rotate order:
+        x twist   xyz order
+        y twist   yzx order
+        z twist   zxy order
+    The twist axis is applied first, so its angle is the rotation about the
+    tip's own axis, and the two other euler channels are the swing.
+
+    swingTwist() is the quaternion swing-twist decomposition, q = twist * swing,
+    twist applied first as above, with the shortest swing. Both agree when the
+    swing is about one axis, and differ by how the swing is measured otherwise.
+    The swing-twist twist only needs the axis and w components of the offset
+    quaternion, 2 * atan2(q.axis, q.w), so it is the reference for a leaner
+    network without quatToEuler.
+
+    Quaternions are (N,4) x, y, z, w arrays, multiplied in Maya's order,
+    a * b rotates by a then b, like MQuaternion and row-vector matrices.
+USAGE:
+    import volume_sys_velan.scripts.swingTwist as swingTwist
+
+    # Same as the extractTwist network, in radians
+    twist = swingTwist.extractTwist(tipMatrices, rootMatrices, axis='x')
+
+    # Decomposition
+    quats = swingTwist.matricesToQuaternions(offsetMatrices)
+    swing, twist = swingTwist.swingTwist(quats, axis='x')
+    angles = swingTwist.twistAngles(quats, axis='x')
+'''
+
+import numpy as np
+
+import volume_sys_velan.scripts.symmetry as sym
+
+
+# Maya rotateOrder enum, first axis is applied first
+ROTATE_ORDERS = ['xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx']
+
+# quatToEuler.inputRotateOrder used by extractTwist, per twist axis
+TWIST_ROTATE_ORDERS = {'x':'xyz', 'y':'yzx', 'z':'zxy'}
+
+AXES = {'x':0, 'y':1, 'z':2}
+
+
+def homogeneous(rotations):
+    '''
+    Returns (N,4,4) matrices from (N,3,3) rotations
+    '''
+    mats = np.tile(np.eye(4), (len(rotations), 1, 1))
+    mats[:, :3, :3] = rotations
+    return mats
+
+
+def rotationMatrices(matrices):
+    '''
+    Returns (N,3,3) rotations of matrices with scale and shear removed,
+    rows orthonormalized in x, y, z order like decomposeMatrix
+    '''
+    rows = sym.asMatrixArray(matrices)[:, :3, :3]
+    x = rows[:, 0] / np.linalg.norm(rows[:, 0], axis=1)[:, None]
+    y = rows[:, 1] - x * (rows[:, 1] * x).sum(axis=1)[:, None]
+    y /= np.linalg.norm(y, axis=1)[:, None]
+    z = np.cross(x, y) # Always a proper rotation, negative scale stays in the scale
+    return np.stack([x, y, z], axis=1)
+
+
+def scales(matrices):
+    '''
+    Returns (N,3) scale of matrices, decomposeMatrix.outputScale without shear,
+    a negative determinant gives a negative z scale
+    '''
+    matrices = sym.asMatrixArray(matrices)
+    return (matrices[:, :3, :3] * rotationMatrices(matrices)).sum(axis=2)
+
+
+def _axisMatrices(axis, angles):
+    c = np.cos(angles)
+    s = np.sin(angles)
+    i, j = (axis + 1) % 3, (axis + 2) % 3
+    mats = np.zeros((len(angles), 3, 3))
+    mats[:, axis, axis] = 1.0
+    mats[:, i, i] = c
+    mats[:, j, j] = c
+    mats[:, i, j] = s
+    mats[:, j, i] = -s
+    return mats
+
+
+def eulerToMatrices(angles, rotateOrder='xyz'):
+    '''
+    Returns (N,4,4) rotation matrices from euler angles
+
+    angles      = ((N,3)) x, y, z angles in radians
+    rotateOrder = (str) Key of ROTATE_ORDERS
+    '''
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1, 3)
+    rot = np.tile(np.eye(3), (len(angles), 1, 1))
+    for axis in [AXES[a] for a in rotateOrder]:
+        rot = np.matmul(rot, _axisMatrices(axis, angles[:, axis]))
+    return homogeneous(rot)
+
+
+def eulerFromMatrices(matrices, rotateOrder='xyz'):
+    '''
+    Returns (N,3) x, y, z euler angles in radians of matrices.
+    The middle axis is in -pi/2..pi/2, the others in -pi..pi, as Maya
+    decomposes rotations.
+
+    rotateOrder = (str) Key of ROTATE_ORDERS
+    '''
+    rot = rotationMatrices(matrices)
+    i, j, k = [AXES[a] for a in rotateOrder]
+    sign = 1.0 if rotateOrder in ROTATE_ORDERS[:3] else -1.0
+
+    # Row-vector R = Ri * Rj * Rk
+    sinJ = np.clip(-sign * rot[:, i, k], -1.0, 1.0)
+    angleJ = np.arcsin(sinJ)
+    angleI = np.arctan2(sign * rot[:, j, k], rot[:, k, k])
+    angleK = np.arctan2(sign * rot[:, i, j], rot[:, i, i])
+
+    # Gimbal lock, the first axis takes all the rotation
+    locked = np.abs(sinJ) > 1.0 - 1e-12
+    if locked.any():
+        angleI[locked] = np.arctan2(-sign * rot[locked, k, j], rot[locked, j, j])
+        angleK[locked] = 0.0
+
+    angles = np.zeros((len(rot), 3))
+    angles[:, i] = angleI
+    angles[:, j] = angleJ
+    angles[:, k] = angleK
+    return angles
+
+
+def matricesToQuaternions(matrices):
+    '''
+    Returns (N,4) unit quaternions, w >= 0, of the rotation of matrices,
+    decomposeMatrix.outputQuat
+    '''
+    rot = np.transpose(rotationMatrices(matrices), (0, 2, 1)) # Column-vector form
+    trace = rot[:, 0, 0] + rot[:, 1, 1] + rot[:, 2, 2]
+    diag = np.stack([rot[:, 0, 0], rot[:, 1, 1], rot[:, 2, 2], trace], axis=1)
+    largest = diag.argmax(axis=1)
+
+    quats = np.zeros((len(rot), 4))
+    for case in range(4):# Solve from the largest of w, x, y, z for precision
+        m = rot[largest == case]
+        if len(m) == 0:
+            continue
+        if case == 3:
+            w = np.sqrt(1.0 + m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]) * 0.5
+            q = [(m[:, 2, 1] - m[:, 1, 2]) / (4 * w), (m[:, 0, 2] - m[:, 2, 0]) / (4 * w), (m[:, 1, 0] - m[:, 0, 1]) / (4 * w), w]
+        else:
+            i, j, k = case, (case + 1) % 3, (case + 2) % 3
+            v = np.sqrt(np.maximum(1.0 + m[:, i, i] - m[:, j, j] - m[:, k, k], 0.0)) * 0.5
+            q = [None] * 4
+            q[i] = v
+            q[j] = (m[:, j, i] + m[:, i, j]) / (4 * v)
+            q[k] = (m[:, k, i] + m[:, i, k]) / (4 * v)
+            q[3] = (m[:, k, j] - m[:, j, k]) / (4 * v)
+        quats[largest == case] = np.stack(q, axis=1)
+
+    quats *= np.where(quats[:, 3] < 0, -1.0, 1.0)[:, None]
+    return quats / np.linalg.norm(quats, axis=1)[:, None]
+
+
+def quaternionsToMatrices(quats):
+    '''
+    Returns (N,4,4) rotation matrices of (N,4) quaternions, MQuaternion.asMatrix()
+    '''
+    q = np.asarray(quats, dtype=np.float64).reshape(-1, 4)
+    q = q / np.linalg.norm(q, axis=1)[:, None]
+    x, y, z, w = q.T
+    rot = np.stack([
+        np.stack([1 - 2*(y*y + z*z), 2*(x*y + z*w), 2*(x*z - y*w)], axis=1),
+        np.stack([2*(x*y - z*w), 1 - 2*(x*x + z*z), 2*(y*z + x*w)], axis=1),
+        np.stack([2*(x*z + y*w), 2*(y*z - x*w), 1 - 2*(x*x + y*y)], axis=1)], axis=1)
+    return homogeneous(rot)
+
+
+def multiplyQuaternions(a, b):
+    '''
+    Returns (N,4) a * b, rotation by a then b, as MQuaternion
+    '''
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 4)
+    # Hamilton product b a, the column-vector form of a then b
+    bx, by, bz, bw = b.T
+    ax, ay, az, aw = a.T
+    return np.stack([bw*ax + bx*aw + by*az - bz*ay,
+                     bw*ay - bx*az + by*aw + bz*ax,
+                     bw*az + bx*ay - by*ax + bz*aw,
+                     bw*aw - bx*ax - by*ay - bz*az], axis=1)
+
+
+def inverseQuaternions(quats):
+    '''
+    Returns (N,4) inverse of unit quaternions
+    '''
+    inverse = np.array(quats, dtype=np.float64).reshape(-1, 4)
+    inverse[:, :3] *= -1.0
+    return inverse
+
+
+def quaternionsToEuler(quats, rotateOrder='xyz'):
+    '''
+    Returns (N,3) x, y, z euler angles in radians, quatToEuler.outputRotate
+    '''
+    return eulerFromMatrices(quaternionsToMatrices(quats), rotateOrder)
+
+
+def swingTwist(quats, axis):
+    '''
+    Returns (swing, twist) (N,4) quaternions, quats = twist * swing.
+    Twist is about the axis, applied first, swing is the shortest rotation
+    taking the axis to its final direction. A swing of 180 degrees has no
+    twist, the twist is identity.
+
+    axis = (str) 'x', 'y' or 'z'
+    '''
+    q = np.asarray(quats, dtype=np.float64).reshape(-1, 4)
+    axisId = AXES[axis]
+    twist = np.zeros_like(q)
+    twist[:, axisId] = q[:, axisId]
+    twist[:, 3] = q[:, 3]
+    length = np.linalg.norm(twist, axis=1)
+    degenerate = length < 1e-12
+    twist[degenerate] = [0.0, 0.0, 0.0, 1.0]
+    length[degenerate] = 1.0
+    twist /= length[:, None]
+
+    swing = multiplyQuaternions(inverseQuaternions(twist), q)
+    return swing, twist
+
+
+def twistAngles(quats, axis):
+    '''
+    Returns (N,) swing-twist twist angles in radians, -pi..pi
+
+    axis = (str) 'x', 'y' or 'z'
+    '''
+    q = np.asarray(quats, dtype=np.float64).reshape(-1, 4)
+    q = q * np.where(q[:, 3] < 0, -1.0, 1.0)[:, None]
+    return 2.0 * np.arctan2(q[:, AXES[axis]], q[:, 3])
+
+
+def offsetMatrices(tipMatrices, rootMatrices, scaleSupport=False):
+    '''
+    Returns (N,4,4) tip.worldMatrix * root.worldInverseMatrix, the multMatrix of
+    the extractTwist network. With scaleSupport the root scale is multiplied
+    back in, as composeMatrix of the root's decomposed scale.
+    '''
+    tip = sym.asMatrixArray(tipMatrices)
+    root = sym.asMatrixArray(rootMatrices)
+    offset = np.matmul(tip, np.linalg.inv(root))
+    if scaleSupport:
+        offset = np.matmul(offset, homogeneous(np.eye(3) * scales(root)[:, None, :]))
+    return offset
+
+
+def extractTwist(tipMatrices, rootMatrices, axis, scaleSupport=False, mode='euler'):
+    '''
+    Returns (N,) twist in radians of tip relative to root.
+
+    tipMatrices  = ((N,4,4)) Tip world matrices
+    rootMatrices = ((N,4,4) or (4,4)) Root world matrices
+    axis         = (str) 'x', 'y' or 'z'
+    scaleSupport = (bol) As the extractTwist argument
+    mode         = (str) 'euler', outputRotate<axis> of the extractTwist network,
+                   'swing', swing-twist twist, see twistAngles()
+    '''
+    offset = offsetMatrices(tipMatrices, rootMatrices, scaleSupport)
+    if mode == 'swing':
+        return twistAngles(matricesToQuaternions(offset), axis)
+    if mode != 'euler':
+        raise ValueError('Twist mode must be euler or swing, not %r' % mode)
+    return eulerFromMatrices(offset, TWIST_ROTATE_ORDERS[axis])[:, AXES[axis]]
@@ -0,0 +1,255 @@
+'''
+DESCRIPTION:
+    Mirror math for volume system guides.
+    Pure NumPy, no Maya dependency, so it can be shared by the UI and by
+    offline tools that work on guide files.
+
+    Matrices follow Maya's row-vector convention (point * matrix), stored
+    either as flat 16 float lists (cmds.xform) or as (4, 4) arrays.
+USAGE:
+    import volume_sys_velan.scripts.symmetry as sym
+
+    # Mirror a batch of world matrices across the world YZ plane
+    mirrored = sym.mirrorMatrices(matrices, axis='yz')
+
+    # Mirror across the YZ plane of an arbitrary plane matrix
+    mirrored = sym.mirrorMatrices(matrices, axis='yz', plane=planeMatrix)
+
+    # Pair L / R guides and find the ones that drifted
+    index = sym.SymmetryIndex(guideRecords)
+    print(index.report())
+'''
+
+import numpy as np
+
+import volume_sys_velan.scripts.sideNaming as sideNaming
+
+
+# Reflection matrices, keyed by the plane that is mirrored across
+MIRROR_AXES = {
+    'yz': [-1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1],
+    'zx': [1, 0, 0, 0, 0, -1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1],
+    'xy': [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, -1, 0, 0, 0, 0, 1],
+}
+
+
+def asMatrixArray(matrices):
+    '''
+    Returns matrices as a (N, 4, 4) float64 array.
+
+    matrices = ([16], [[16]], (4,4) or (N,4,4)) Matrix or matrices
+    '''
+    return np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+
+
+def mirrorMatrix(axis='yz', plane=None):
+    '''
+    Returns the (4, 4) reflection matrix for a mirror plane.
+
+    axis  = (str) Plane to mirror across, key of MIRROR_AXES
+    plane = ([16] or (4,4)) Optional plane matrix. When given, the mirror
+            is done across the axis plane of this matrix instead of the
+            world origin.
+    '''
+    if axis not in MIRROR_AXES:
+        raise ValueError('Mirror axis must be one of %s' % sorted(MIRROR_AXES))
+
+    reflection = np.array(MIRROR_AXES[axis], dtype=np.float64).reshape(4, 4)
+    if plane is None:
+        return reflection
+
+    plane = np.asarray(plane, dtype=np.float64).reshape(4, 4)
+    return np.linalg.inv(plane) @ reflection @ plane
+
+
+def mirrorMatrices(matrices, axis='yz', plane=None):
+    '''
+    Mirrors a batch of world matrices in one operation.
+
+    matrices = ((N,4,4) or [[16]]) World space matrices
+    axis     = (str) Plane to mirror across, key of MIRROR_AXES
+    plane    = ([16] or (4,4)) Optional plane matrix, see mirrorMatrix()
+
+    Returns (N,4,4) array of mirrored matrices
+    '''
+    return asMatrixArray(matrices) @ mirrorMatrix(axis, plane)
+
+
+# Guide attributes carried over to the mirrored guide, per guide type
+MIRROR_SETTINGS = {
+    'slider': ['guideParent', 'guideTracker', 'XYZ', 'trackerRev', 'trackerMinRot',
+               'trackerMaxRot', 'sliderJoint', 'sliderDorito'],
+    'stretch': ['startParent', 'endParent', 'snsMultiplier', 'enableSns', 'twist',
+                'stretchJoint', 'stretchDorito', 'strDefPos'],
+}
+
+# Guide attributes holding object names, converted to the opposite side
+MIRROR_NAME_ATTRS = ['guideParent', 'guideTracker', 'startParent', 'endParent']
+
+
+def mirrorGuideSettings(guideType, settings, convertName):
+    '''
+    Returns the settings of the opposite side guide.
+
+    guideType   = (str) 'slider' or 'stretch'
+    settings    = ({}) attr : value of the source guide
+    convertName = (func) Converts an object name to the opposite side
+
+    Object names are converted, and tracker rotations are negated when the
+    source guide has trackerRev enabled.
+    '''
+    mirrored = {}
+    for attr in MIRROR_SETTINGS[guideType]:
+        value = settings.get(attr)
+        if attr in MIRROR_NAME_ATTRS and value:
+            value = convertName(value)
+        mirrored[attr] = value
+
+    if guideType == 'slider' and settings.get('trackerRev'):
+        for attr in ['trackerMinRot', 'trackerMaxRot']:
+            if mirrored[attr] is not None:
+                mirrored[attr] = mirrored[attr] / -1
+
+    return mirrored
+
+
+# Allowed difference between a mirrored setting and the opposite side guide.
+# Attributes not listed must match exactly.
+SETTING_TOLERANCES = {
+    'trackerMinRot' : 0.01, # degrees
+    'trackerMaxRot' : 0.01, # degrees
+    'snsMultiplier' : 1e-4,
+    'strDefPos'     : 1e-4,
+}
+
+
+class SymmetryIndex(object):
+    '''
+    Pairs guides with their opposite side guide by mirrored name, and
+    finds the pairs where the target side has drifted from the source.
+    Matrices and settings of all pairs are compared in one vectorized pass.
+
+    records      = ({}) guide key : record. A record is a dict with
+                   'guideType', 'guideName', 'settings' ({attr : value})
+                   and 'matrices' ((2,4,4) start and end world matrices)
+    sourceSide   = (str) Side token of the side that is mirrored from
+    axis         = (str) Plane to mirror across, key of MIRROR_AXES
+    plane        = ([16]) Optional plane matrix to mirror across
+    posTolerance = (float) Allowed start / end position difference
+    rotTolerance = (float) Allowed difference of the matrix axes
+    tolerances   = ({}) Per setting tolerances, defaults to SETTING_TOLERANCES
+
+    After construction:
+    pairs     = [(source key, target key)]
+    inSync    = [(source key, target key)]
+    outOfSync = [(source key, target key, [drifted attrs])], 'matrix'
+                is listed when the start or end matrix drifted
+    unmatched = [key] Guides with a side but no opposite side guide
+    middle    = [key] Guides without a side
+    '''
+    def __init__(self, records, sourceSide='L', axis='yz', plane=None,
+                 posTolerance=1e-3, rotTolerance=1e-3, tolerances=None):
+        self.records      = records
+        self.sourceSide   = sourceSide
+        self.axis         = axis
+        self.plane        = plane
+        self.posTolerance = posTolerance
+        self.rotTolerance = rotTolerance
+        self.tolerances   = dict(SETTING_TOLERANCES)
+        if tolerances:
+            self.tolerances.update(tolerances)
+
+        self.pairs     = []
+        self.inSync    = []
+        self.outOfSync = []
+        self.unmatched = []
+        self.middle    = []
+
+        self.buildPairs()
+        self.compare()
+
+    def isSource(self, key):
+        return self.records[key]['guideName'].split('_')[0] == self.sourceSide
+
+    def buildPairs(self):
+        '''
+        Pairs guides in one pass through a name lookup
+        '''
+        keys = list(self.records)
+        names = [self.records[key]['guideName'] for key in keys]
+        mirrNames = sideNaming.convertNames(names, side_format=1)
+        byName = dict(((self.records[key]['guideType'], name), key) for key, name in zip(keys, names))
+
+        for key, name, mirrName in zip(keys, names, mirrNames):
+            if mirrName == name:
+                self.middle.append(key)
+                continue
+            mirrKey = byName.get((self.records[key]['guideType'], mirrName))
+            if mirrKey is None:
+                self.unmatched.append(key)
+            elif self.isSource(key) or (not self.isSource(mirrKey) and name < mirrName):
+                self.pairs.append((key, mirrKey))
+
+    def compare(self):
+        '''
+        Compares mirrored source matrices and settings with the targets
+        '''
+        if self.pairs == []:
+            return
+
+        drifted = dict((pair, []) for pair in self.pairs)
+
+        # Matrices
+        src = np.stack([asMatrixArray(self.records[a]['matrices']) for a, b in self.pairs])
+        tgt = np.stack([asMatrixArray(self.records[b]['matrices']) for a, b in self.pairs])
+        expected = mirrorMatrices(src.reshape(-1, 4, 4), self.axis, self.plane).reshape(src.shape)
+        posDrift = np.linalg.norm(expected[:, :, 3, :3] - tgt[:, :, 3, :3], axis=2).max(axis=1) > self.posTolerance
+        rotDrift = np.abs(expected[:, :, :3, :3] - tgt[:, :, :3, :3]).max(axis=(1, 2, 3)) > self.rotTolerance
+        for i in np.flatnonzero(posDrift | rotDrift):
+            drifted[self.pairs[i]].append('matrix')
+
+        # Settings, one column per attribute and guide type
+        for guideType, attrs in MIRROR_SETTINGS.items():
+            pairs = [pair for pair in self.pairs if self.records[pair[0]]['guideType'] == guideType]
+            if pairs == []:
+                continue
+            expected = [mirrorGuideSettings(guideType, self.records[a]['settings'], sideNaming.getConverter(0).convert)
+                        for a, b in pairs]
+            for attr in attrs:
+                expVal = [exp[attr] for exp in expected]
+                curVal = [self.records[b]['settings'].get(attr) for a, b in pairs]
+                numeric = all(isinstance(v, (int, float)) for v in expVal + curVal)
+                if numeric:
+                    bad = np.abs(np.array(expVal, dtype=np.float64) - np.array(curVal, dtype=np.float64)) > self.tolerances.get(attr, 0)
+                else:
+                    # Unset source values are never pushed to the target
+                    bad = np.array([e is not None and e != c for e, c in zip(expVal, curVal)])
+                for i in np.flatnonzero(bad):
+                    drifted[pairs[i]].append(attr)
+
+        for pair in self.pairs:
+            if drifted[pair]:
+                self.outOfSync.append((pair[0], pair[1], drifted[pair]))
+            else:
+                self.inSync.append(pair)
+
+    def driftedSources(self, includeUnmatched=True):
+        '''
+        Returns source keys that need mirroring
+        '''
+        sources = [a for a, b, attrs in self.outOfSync]
+        if includeUnmatched:
+            sources += [key for key in self.unmatched if self.isSource(key)]
+        return sources
+
+    def report(self):
+        '''
+        Returns readable summary of the index
+        '''
+        lines = ['Symmetry: %s pairs, %s in sync, %s out of sync, %s unmatched, %s middle' % (
+                 len(self.pairs), len(self.inSync), len(self.outOfSync), len(self.unmatched), len(self.middle))]
+        for a, b, attrs in self.outOfSync:
+            lines.append('  OUT OF SYNC  %s -> %s : %s' % (a, b, ', '.join(attrs)))
+        for key in self.unmatched:
+            lines.append('  UNMATCHED    %s' % key)
+        return '\n'.join(lines)
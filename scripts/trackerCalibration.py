@@ -0,0 +1,212 @@
+'''
+DESCRIPTION:
+    Slider tracker range calibration from sampled animation or ROM.
+    Tracker local matrices sampled over a frame range are turned into the
+    twist the slider system sees, see volumeSolver.trackerTwist(), and
+    trackerMinRot / trackerMaxRot are set from percentiles of it, so a few
+    extreme frames do not stretch the range.
+    Pure NumPy, no Maya dependency, VolumeSystemUI.calibrateSliderGuides()
+    samples the scene.
+
+    The twist axis is detected by analyzeTwistAxis(), PCA of the tracker's
+    rotation vectors relative to its build pose, in the tracker's own axes.
+    A tracker that mostly twists about one local axis has one dominant
+    principal direction close to that axis. The confidence score is the
+    share of the rotation on that axis, 1 for a pure twist, about 1/3 for
+    rotation spread evenly over all axes.
+
+    minRot is the rest side of the motion, 0 unless the whole motion is to
+    one side of the build pose, maxRot is the far percentile in the direction
+    the tracker moves most. The network remaps minRot..maxRot to 0..1, so
+    a tracker that twists negatively gets a negative maxRot.
+USAGE:
+    import volume_sys_velan.scripts.trackerCalibration as trackerCalibration
+
+    result = trackerCalibration.calibrateTracker(trackerMatrices, restMatrix)
+    result['axis'], result['confidence'], result['minRot'], result['maxRot']
+
+    analysis = trackerCalibration.analyzeTwistAxis(trackerMatrices, restMatrix)
+
+    results = {'L_Elbow_slider' : result, 'R_Elbow_slider' : ...}
+    trackerCalibration.suggestReversal(results, [('L_Elbow_slider', 'R_Elbow_slider')])
+    print(trackerCalibration.report(results))
+'''
+
+import numpy as np
+
+import volume_sys_velan.scripts.swingTwist as swingTwist
+import volume_sys_velan.scripts.volumeSolver as volumeSolver
+
+
+LOW_PERCENTILE = 5.0
+HIGH_PERCENTILE = 95.0
+
+# Ranges smaller than this, in degrees, are reported as a static tracker
+MIN_RANGE = 1.0
+
+# Detected axes below this confidence are not applied, the guide's axis is kept
+MIN_CONFIDENCE = 0.6
+
+
+def relativeQuaternions(trackerMatrices, restMatrix):
+    '''
+    Returns (N,4) quaternions of tracker poses relative to the build pose,
+    in the tracker's own axes
+    '''
+    relative = np.matmul(swingTwist.rotationMatrices(trackerMatrices), np.linalg.inv(swingTwist.rotationMatrices(restMatrix)))
+    return swingTwist.matricesToQuaternions(swingTwist.homogeneous(relative))
+
+
+def rotationVectors(quats):
+    '''
+    Returns (N,3) rotation vectors, axis * angle in radians, of (N,4) quaternions
+    '''
+    sinHalf = np.linalg.norm(quats[:, :3], axis=1)
+    angles = 2.0 * np.arctan2(sinHalf, quats[:, 3])
+    scale = np.where(sinHalf > 1e-12, angles / np.maximum(sinHalf, 1e-12), 2.0)
+    return quats[:, :3] * scale[:, None]
+
+
+def analyzeTwistAxis(trackerMatrices, restMatrix):
+    '''
+    Returns dominant twist axis analysis of one tracker:
+    {'axis', 'confidence', 'explained', 'alignment', 'principal', 'twistShare' : {axis : share}, 'rms'}
+
+    explained  = Share of the rotation on the first principal direction
+    alignment  = abs cosine between the principal direction and the axis
+    confidence = explained * alignment ** 2, 0 for a static tracker
+    twistShare = Mean squared swing-twist twist about each axis over the mean
+                 squared rotation angle, per axis check of the PCA
+    rms        = Root mean square rotation angle in degrees
+
+    trackerMatrices = ((N,4,4)) Tracker local matrices, one per sampled frame
+    restMatrix      = ((4,4)) Tracker local matrix of the build pose
+    '''
+    quats = relativeQuaternions(trackerMatrices, restMatrix)
+    vectors = rotationVectors(quats)
+    energy = (vectors ** 2).sum(axis=1).mean()
+    rms = float(np.degrees(np.sqrt(energy)))
+    if rms < MIN_RANGE:
+        return {'axis':None, 'confidence':0.0, 'explained':0.0, 'alignment':0.0,
+                'principal':np.zeros(3), 'twistShare':dict.fromkeys('xyz', 0.0), 'rms':rms}
+
+    # Second moment about the build pose, not the mean, the range starts at rest
+    values, directions = np.linalg.eigh(np.matmul(vectors.T, vectors) / len(vectors))
+    principal = directions[:, -1]
+    axisId = int(np.abs(principal).argmax())
+    explained = float(values[-1] / values.sum())
+    alignment = float(abs(principal[axisId]))
+
+    twistShare = dict((axis, float((swingTwist.twistAngles(quats, axis) ** 2).mean() / energy)) for axis in 'xyz')
+
+    return {'axis'       : 'xyz'[axisId],
+            'confidence' : round(explained * alignment ** 2, 3),
+            'explained'  : round(explained, 3),
+            'alignment'  : round(alignment, 3),
+            'principal'  : principal * np.sign(principal[axisId]),
+            'twistShare' : twistShare,
+            'rms'        : rms}
+
+
+def twistPercentiles(twist, low=LOW_PERCENTILE, high=HIGH_PERCENTILE):
+    '''
+    Returns (low, high) percentiles of twist samples in degrees
+    '''
+    low, high = np.percentile(np.asarray(twist, dtype=np.float64), [low, high])
+    return float(low), float(high)
+
+
+def rangeFromPercentiles(low, high):
+    '''
+    Returns (minRot, maxRot, direction), see module description.
+    direction is 1 when the tracker moves most in positive twist, else -1.
+    '''
+    if abs(high) >= abs(low):
+        return max(low, 0.0), high, 1
+    return min(high, 0.0), low, -1
+
+
+def calibrateTracker(trackerMatrices, restMatrix, axis=None, low=LOW_PERCENTILE, high=HIGH_PERCENTILE,
+                     minConfidence=MIN_CONFIDENCE, fallbackAxis=None):
+    '''
+    Returns calibration of one tracker:
+    {'axis', 'XYZ', 'minRot', 'maxRot', 'direction', 'percentiles' : {axis : (low, high)}, 'static',
+     'confidence', 'detected', 'analysis'}
+
+    'detected' is True when the axis comes from analyzeTwistAxis(), 'confidence'
+    is 1.0 for a given axis.
+
+    trackerMatrices = ((N,4,4)) Tracker local matrices, one per sampled frame
+    restMatrix      = ((4,4)) Tracker local matrix of the build pose
+    axis            = (str) Twist axis, 'x', 'y' or 'z', detected if None
+    low, high       = (float) Percentiles used for the range
+    minConfidence   = (float) Detected axes below it are replaced by fallbackAxis
+    fallbackAxis    = (str) Axis used for low confidence detections, the guide's axis,
+                      the axis with the widest range if None
+    '''
+    percentiles = {}
+    for twistAxis in (axis or 'xyz'):
+        twist = volumeSolver.trackerTwist(trackerMatrices, restMatrix, twistAxis)
+        percentiles[twistAxis] = twistPercentiles(twist, low, high)
+
+    analysis = None
+    confidence = 1.0
+    detected = axis is None
+    if detected:
+        analysis = analyzeTwistAxis(trackerMatrices, restMatrix)
+        confidence = analysis['confidence']
+        axis = analysis['axis']
+        if axis is None or confidence < minConfidence:
+            detected = False
+            axis = fallbackAxis or max('xyz', key=lambda a: percentiles[a][1] - percentiles[a][0])
+
+    minRot, maxRot, direction = rangeFromPercentiles(*percentiles[axis])
+    return {'axis'        : axis,
+            'XYZ'         : 'xyz'.index(axis),
+            'minRot'      : round(minRot, 3),
+            'maxRot'      : round(maxRot, 3),
+            'direction'   : direction,
+            'percentiles' : percentiles,
+            'static'      : percentiles[axis][1] - percentiles[axis][0] < MIN_RANGE,
+            'confidence'  : confidence,
+            'detected'    : detected,
+            'analysis'    : analysis}
+
+
+def suggestReversal(results, pairs):
+    '''
+    Adds 'trackerRev' to results of mirrored guide pairs, True when the two
+    trackers move in opposite twist directions, so mirroring negates the range.
+    Results without a calibrated partner are left without a suggestion.
+
+    results = ({guide key : calibrateTracker() result})
+    pairs   = ([(guide key, opposite guide key)])
+    '''
+    for key, mirrKey in pairs:
+        if key not in results or mirrKey not in results:
+            continue
+        if results[key]['static'] or results[mirrKey]['static']:
+            continue
+        reverse = results[key]['direction'] != results[mirrKey]['direction']
+        results[key]['trackerRev'] = reverse
+        results[mirrKey]['trackerRev'] = reverse
+    return results
+
+
+def report(results):
+    '''
+    Returns readable summary of calibrations
+    '''
+    lines = ['Tracker calibration: %s guide(s)' % len(results)]
+    for key, result in sorted(results.items()):
+        ranges = ', '.join('%s %.1f..%.1f' % (a, lo, hi) for a, (lo, hi) in sorted(result['percentiles'].items()))
+        flags = []
+        if result['static']:
+            flags.append('STATIC')
+        elif result['analysis'] and not result['detected']:
+            flags.append('LOW CONFIDENCE (%s detected)' % (result['analysis']['axis'] or '-').upper())
+        if 'trackerRev' in result:
+            flags.append('trackerRev=%s' % result['trackerRev'])
+        lines.append('  %-32s axis %s  conf %.2f  min %8.2f  max %8.2f  (%s) %s' % (
+                     key, result['axis'].upper(), result['confidence'], result['minRot'], result['maxRot'], ranges, ' '.join(flags)))
+    return '\n'.join(lines)
@@ -0,0 +1,564 @@
+'''
+DESCRIPTION:
+    Evaluation cost benchmark of built volume systems.
+    Builds a synthetic skeleton with animated trackers and stretch ends,
+    N slider and M stretch guides on it, and builds them with the Volume
+    System builders, then measures:
+        build      build time, nodes per slider / stretch, by node type
+        playback   fps over the frame range, per evaluation manager mode,
+                   DG ('off') and 'parallel'
+        profile    evaluation time per system root, Orig_*_SldRoot /
+                   Orig_*_StrRoot, from Maya's profiler events
+    Results are plain dicts, written as JSON, compareResults() lists
+    regressions between two runs, to compare network variants.
+
+    Runs in a Maya session or mayapy. The builders are used from the open
+    Volume System UI, or from a headless VolumeSystemUI instance, they only
+    use Maya commands.
+
+    runCallBenchmark() runs without Maya, on the fakeMaya scene, and counts
+    the Maya commands and API calls per guide of createGuides, refreshUI,
+    buildFromGuide, mirrorGuideMultiple and restoreGuides. The counts are
+    reproducible on any machine, compareCallResults() reports any increase.
+    Without widgets refreshUI is measured as buildGuideDict(), the scene
+    reads it does. PySide2 and lib_python_velan are still needed to import
+    volumeSystem.
+USAGE:
+    import volume_sys_velan.scripts.volumeBenchmark as volumeBenchmark
+
+    results = volumeBenchmark.runBenchmark(sliders=100, stretches=50, frames=120, output='/tmp/volume_bench.json')
+    print(volumeBenchmark.report(results))
+
+    # Regressions of a network variant
+    issues = volumeBenchmark.compareResults(volumeBenchmark.loadResults(basePath), results)
+
+    # mayapy
+    mayapy -m volume_sys_velan.scripts.volumeBenchmark --sliders 100 --stretches 50 -o volume_bench.json
+    mayapy -m volume_sys_velan.scripts.volumeBenchmark --compare base.json volume_bench.json
+
+    # Commands per guide, python without Maya
+    python -m volume_sys_velan.scripts.volumeBenchmark --calls --sliders 20 --stretches 20 -o volume_calls.json
+    python -m volume_sys_velan.scripts.volumeBenchmark --compare base_calls.json volume_calls.json
+'''
+
+import argparse
+import datetime
+import json
+import sys
+import time
+
+try:
+    import maya.cmds as cmds
+except ImportError:# compareResults() and --compare run without Maya
+    cmds = None
+
+
+RESULTS_VERSION = 1
+
+EVALUATION_MODES = ['off', 'parallel']
+
+# runCallBenchmark() stages, in run order
+CALL_STAGES = ['createGuides', 'refreshUI', 'buildFromGuide', 'mirrorGuideMultiple', 'restoreGuides']
+
+# compareResults() relative tolerance on times and fps
+TOLERANCE = 0.1
+
+
+def getBuilder(ui=None):
+    '''
+    Returns the VolumeSystemUI used to create guides and build systems,
+    the open UI, or an instance without widgets
+    '''
+    from volume_sys_velan.scripts.volumeSystem import VolumeSystemUI
+
+    if ui is None:
+        ui = VolumeSystemUI.registry.getInstance(VolumeSystemUI)
+    if ui is None:
+        ui = VolumeSystemUI.__new__(VolumeSystemUI) # Builders only use Maya commands
+        ui.sliderParDict  = None
+        ui.stretchParDict = None
+        ui.gdeBackupDict  = {}
+    return ui
+
+
+def getHeadlessBuilder():
+    '''
+    Returns a VolumeSystemUI instance without widgets, guide list updates
+    only rebuild its guide dict
+    '''
+    from volume_sys_velan.scripts.volumeSystem import VolumeSystemUI
+
+    ui = VolumeSystemUI.__new__(VolumeSystemUI)
+    ui.sliderParDict      = None
+    ui.stretchParDict     = None
+    ui.gdeBackupDict      = {}
+    ui.guideFrameWidgets  = {}
+    ui.refreshUI          = ui.buildGuideDict
+    ui.addGuidesToUI      = lambda guides: ui.buildGuideDict()
+    ui.refreshGuideFrames = lambda guides: None
+    return ui
+
+
+def createSkeleton(sliders, stretches, start=1, end=100, spacing=2.0):
+    '''
+    Returns ([(parent, tracker)], [(startJoint, endJoint)]) of a synthetic skeleton,
+    one joint pair per system. Trackers twist 0..60..0 degrees about Y over the
+    frame range, stretch ends slide along Z, so every system evaluates each frame.
+    '''
+    root = cmds.createNode('transform', n='bench_skeleton')
+    if not cmds.objExists('global_C0_ctl'):
+        globalCtl = cmds.createNode('transform', n='global_C0_ctl')
+        cmds.addAttr(globalCtl, ln='globalScale', at='float', dv=1.0, k=True)
+    mid = (start + end) * 0.5
+
+    sliderJoints = []
+    for i in range(sliders):
+        parent = cmds.createNode('joint', n='bench_sld%03d_parent' % i, p=root)
+        cmds.setAttr(parent+'.translate', i * spacing, 0.0, 0.0)
+        tracker = cmds.createNode('joint', n='bench_sld%03d_tracker' % i, p=parent)
+        cmds.setAttr(tracker+'.translateY', 1.0)
+        for frame, value in [(start, 0.0), (mid, 60.0), (end, 0.0)]:
+            cmds.setKeyframe(tracker, at='rotateY', t=frame, v=value)
+        sliderJoints.append((parent, tracker))
+
+    stretchJoints = []
+    for i in range(stretches):
+        startJoint = cmds.createNode('joint', n='bench_str%03d_start' % i, p=root)
+        cmds.setAttr(startJoint+'.translate', i * spacing, 0.0, 5.0)
+        endJoint = cmds.createNode('joint', n='bench_str%03d_end' % i, p=startJoint)
+        for frame, value in [(start, 2.0), (mid, 3.0), (end, 1.5)]:
+            cmds.setKeyframe(endJoint, at='translateZ', t=frame, v=value)
+        stretchJoints.append((startJoint, endJoint))
+
+    cmds.currentTime(start)
+    return sliderJoints, stretchJoints
+
+
+def createGuides(ui, sliderJoints, stretchJoints, side='M'):
+    '''
+    Returns guide roots of slider and stretch guides set up on a synthetic skeleton
+
+    side = (str) Guide name side, 'L' guides can be mirrored
+    '''
+    guides = []
+    for i, (parent, tracker) in enumerate(sliderJoints):
+        settings = {'guideParent':parent, 'guideTracker':tracker, 'trackerMinRot':0.0, 'trackerMaxRot':60.0, 'XYZ':1}
+        root, start, end = ui.createSliderGuide('%s_benchSld%03d' % (side, i), 1.0, settings)
+        cmds.xform(root, ws=True, t=cmds.xform(tracker, q=True, ws=True, t=True))
+        guides.append(root)
+
+    for i, (startJoint, endJoint) in enumerate(stretchJoints):
+        settings = {'startParent':startJoint, 'endParent':endJoint, 'enableSns':True}
+        root, start, end = ui.createStretchGuide('%s_benchStr%03d' % (side, i), 1.0, settings)
+        cmds.xform(start, ws=True, t=cmds.xform(startJoint, q=True, ws=True, t=True))
+        cmds.xform(end, ws=True, t=cmds.xform(endJoint, q=True, ws=True, t=True))
+        guides.append(root)
+
+    # As guides created from the UI, mirrorGuideMultiple() parents under it
+    if not cmds.objExists('volumeGuides'):
+        cmds.createNode('transform', n='volumeGuides')
+    cmds.parent([guide.replace('Hbfr_', 'Orig_') for guide in guides], 'volumeGuides')
+    return guides
+
+
+def getSystemNodes(ui, sysDef):
+    '''
+    Returns nodes of a built system, its network and the DAG nodes of its root
+    '''
+    sysRoot = ui.getSystemRoot(sysDef)
+    network, inputs = ui.walkSystemNetwork(sysDef, ui.getBakeConnections(sysDef))
+    dag = [sysRoot] + (cmds.listRelatives(sysRoot, ad=True) or [])
+    return sorted(set(cmds.ls(list(network) + dag)))
+
+
+def countNodes(ui, defs):
+    '''
+    Returns {'slider', 'stretch', 'byType'} node counts, mean nodes per system
+    and total nodes of all systems by node type
+    '''
+    counts = {'slider':[], 'stretch':[]}
+    byType = {}
+    for sysDef in defs:
+        nodes = getSystemNodes(ui, sysDef)
+        counts['slider' if sysDef.endswith('_SldMain') else 'stretch'].append(len(nodes))
+        for node in nodes:
+            nodeType = cmds.nodeType(node)
+            byType[nodeType] = byType.get(nodeType, 0) + 1
+
+    mean = lambda values: float(sum(values)) / len(values) if values else 0.0
+    return {'slider'  : mean(counts['slider']),
+            'stretch' : mean(counts['stretch']),
+            'byType'  : byType}
+
+
+def measurePlayback(defs, start, end, mode='off'):
+    '''
+    Returns {'seconds', 'fps'} of playing the frame range in an evaluation
+    manager mode. Interactive sessions play the range with cmds.play(),
+    batch sessions step current time and read the Def world matrices.
+    '''
+    previousMode = cmds.evaluationManager(q=True, mode=True)[0]
+    cmds.evaluationManager(mode=mode)
+    frames = int(end - start) + 1
+    try:
+        cmds.currentTime(start)
+        if cmds.about(batch=True):
+            timer = time.perf_counter()
+            for frame in range(int(start), int(end) + 1):
+                cmds.currentTime(frame, update=True)
+                for sysDef in defs:
+                    cmds.getAttr(sysDef+'.worldMatrix[0]')
+            seconds = time.perf_counter() - timer
+        else:
+            options = {'loop':cmds.playbackOptions(q=True, loop=True),
+                       'playbackSpeed':cmds.playbackOptions(q=True, playbackSpeed=True),
+                       'maxPlaybackSpeed':cmds.playbackOptions(q=True, maxPlaybackSpeed=True)}
+            cmds.playbackOptions(loop='once', playbackSpeed=0, maxPlaybackSpeed=0) # Free playback
+            try:
+                timer = time.perf_counter()
+                cmds.play(wait=True)
+                seconds = time.perf_counter() - timer
+            finally:
+                cmds.playbackOptions(**options)
+    finally:
+        cmds.evaluationManager(mode=previousMode)
+    return {'seconds':seconds, 'fps':frames / seconds if seconds > 0.0 else 0.0}
+
+
+def profileSystems(ui, defs, start, end, bufferSize=200):
+    '''
+    Returns {'totalMs', 'systems' : {system root : ms}} of Maya profiler events
+    recorded over playback, attributed to system roots by the node in the event
+    name or description. Nested events are counted once, in their outermost event.
+
+    bufferSize = (int) Profiler buffer size in MB
+    '''
+    nodeSystems = {}
+    for sysDef in defs:
+        sysRoot = ui.getSystemRoot(sysDef)
+        for node in getSystemNodes(ui, sysDef) + [sysDef]:
+            nodeSystems[node] = sysRoot
+
+    cmds.profiler(reset=True)
+    cmds.profiler(bufferSize=bufferSize)
+    cmds.profiler(sampling=True)
+    try:
+        measurePlayback(defs, start, end, cmds.evaluationManager(q=True, mode=True)[0])
+    finally:
+        cmds.profiler(sampling=False)
+
+    events = []
+    for i in range(cmds.profiler(q=True, eventCount=True)):
+        text = ' '.join([cmds.profiler(q=True, eventIndex=i, eventName=True) or '',
+                         cmds.profiler(q=True, eventIndex=i, eventDescription=True) or ''])
+        sysRoot = None
+        for token in text.replace('.', ' ').replace(':', ' ').replace('|', ' ').split():
+            if token in nodeSystems:
+                sysRoot = nodeSystems[token]
+                break
+        events.append((cmds.profiler(q=True, eventIndex=i, eventThreadId=True),
+                       cmds.profiler(q=True, eventIndex=i, eventStartTime=True),
+                       cmds.profiler(q=True, eventIndex=i, eventDuration=True), sysRoot))
+
+    # Events nest per thread, only the outermost event is counted, in the total
+    # and per system, so child events are not added twice
+    systems = dict((ui.getSystemRoot(sysDef), 0.0) for sysDef in defs)
+    totalMs = 0.0
+    stacks = {} # thread : [(end, system root)]
+    for thread, eventStart, duration, sysRoot in sorted(events, key=lambda event: (event[0], event[1], -event[2])):
+        stack = stacks.setdefault(thread, [])
+        while stack and stack[-1][0] <= eventStart:
+            stack.pop()
+        if stack == []:
+            totalMs += duration / 1000.0
+        if sysRoot is not None and sysRoot not in [root for end, root in stack]:
+            systems[sysRoot] += duration / 1000.0
+        stack.append((eventStart + duration, sysRoot))
+    return {'totalMs':totalMs, 'systems':systems}
+
+
+def runBenchmark(sliders=50, stretches=50, frames=100, modes=EVALUATION_MODES, profile=True, output=None, ui=None, newScene=True):
+    '''
+    Returns benchmark results, see module description
+
+    sliders, stretches = (int) Number of systems
+    frames             = (int) Playback frames
+    modes              = ([str]) Evaluation manager modes measured
+    profile            = (bol) Record per system evaluation time
+    output             = (str) JSON file path
+    ui                 = (VolumeSystemUI) Builder, see getBuilder()
+    newScene           = (bol) Run in a new empty scene
+    '''
+    if newScene:
+        cmds.file(new=True, force=True)
+    ui = getBuilder(ui)
+    start, end = 1, frames
+    cmds.playbackOptions(min=start, max=end)
+
+    sliderJoints, stretchJoints = createSkeleton(sliders, stretches, start, end)
+    guides = createGuides(ui, sliderJoints, stretchJoints)
+
+    nodeCount = len(cmds.ls())
+    timer = time.perf_counter()
+    ui.buildFromGuide(guideList=guides)
+    buildSeconds = time.perf_counter() - timer
+
+    defs = cmds.ls('Def_M_bench*_SldMain', 'Def_M_bench*_StrMain')
+    results = {'version'  : RESULTS_VERSION,
+               'maya'     : cmds.about(version=True),
+               'date'     : datetime.datetime.now().isoformat(),
+               'config'   : {'sliders':sliders, 'stretches':stretches, 'frames':frames},
+               'build'    : {'seconds'     : buildSeconds,
+                             'msPerSystem' : buildSeconds * 1000.0 / max(len(defs), 1),
+                             'sceneNodes'  : len(cmds.ls()) - nodeCount,
+                             'nodes'       : countNodes(ui, defs)},
+               'playback' : dict((mode, measurePlayback(defs, start, end, mode)) for mode in modes)}
+    if profile:
+        results['profile'] = profileSystems(ui, defs, start, end)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return results
+
+
+def measureCalls(scene, guideCount, function, *args, **kwargs):
+    '''
+    Returns {'calls', 'callsPerGuide', 'ms', 'commands' : {name : calls}} of
+    the fakeMaya calls made by function
+    '''
+    scene.stats.reset()
+    timer = time.perf_counter()
+    function(*args, **kwargs)
+    seconds = time.perf_counter() - timer
+    snapshot = scene.stats.snapshot()
+    return {'calls'         : snapshot['calls'],
+            'callsPerGuide' : float(snapshot['calls']) / max(guideCount, 1),
+            'ms'            : seconds * 1000.0,
+            'commands'      : dict((name, command['calls']) for name, command in snapshot['commands'].items())}
+
+
+def bindMayaModules(modules, replacements):
+    '''
+    Rebinds maya modules, and names imported from them, in the loaded Volume
+    System modules. Returns the previous bindings, see restoreBindings().
+
+    modules      = ({module name : module}) Modules bound now, None if not imported
+    replacements = ({module name : module}) Modules to bind instead
+    '''
+    objects = {}
+    for name, module in modules.items():
+        if module is None:
+            continue
+        replacement = replacements[name]
+        objects[id(module)] = replacement
+        for attr, value in vars(module).items():# Classes and functions, constants can be shared objects
+            if not attr.startswith('_') and (isinstance(value, type) or callable(value)) and hasattr(replacement, attr):
+                objects.setdefault(id(value), getattr(replacement, attr))
+
+    bindings = []
+    for name, module in list(sys.modules.items()):
+        if not name.startswith('volume_sys_velan.') or module is None or name == __name__:
+            continue
+        for attr, value in list(vars(module).items()):
+            if not attr.startswith('__') and id(value) in objects:
+                bindings.append((module, attr, value))
+                setattr(module, attr, objects[id(value)])
+    return bindings
+
+
+def restoreBindings(bindings):
+    for module, attr, value in bindings:
+        setattr(module, attr, value)
+
+
+def runCallBenchmark(sliders=20, stretches=20, output=None):
+    '''
+    Returns call count results of the Volume System on the fakeMaya scene,
+    see module description. The real maya modules, and the maya globals of
+    Volume System modules imported before the run, are restored after it.
+    Modules first imported during the run are bound to the fake modules,
+    they are unloaded.
+
+    sliders, stretches = (int) Number of guides, the same number is mirrored
+    output             = (str) JSON file path
+    '''
+    global cmds
+    import volume_sys_velan.scripts.fakeMaya as fakeMaya
+
+    loaded = set(sys.modules)
+    mayaModules = dict((name, sys.modules.get(name)) for name in ['maya', 'maya.cmds', 'maya.OpenMaya', 'maya.api.OpenMaya', 'maya.api.OpenMayaAnim'])
+    mayaCmds = cmds
+    scene = fakeMaya.install()
+    fakeModules = dict((name, sys.modules[name]) for name in mayaModules)
+    bindings = bindMayaModules(mayaModules, fakeModules)
+    cmds = scene.cmds
+    try:
+        ui = getHeadlessBuilder()
+        sliderJoints, stretchJoints = createSkeleton(sliders, stretches)
+        guideCount = sliders + stretches
+
+        guides = []
+        stages = {}
+        stages['createGuides'] = measureCalls(scene, guideCount, lambda: guides.extend(createGuides(ui, sliderJoints, stretchJoints, side='L')))
+        stages['refreshUI'] = measureCalls(scene, guideCount, ui.refreshUI)
+        stages['buildFromGuide'] = measureCalls(scene, guideCount, ui.buildFromGuide, guideList=guides)
+        stages['mirrorGuideMultiple'] = measureCalls(scene, guideCount, ui.mirrorGuideMultiple, guides=guides)
+
+        gdeBackupDict = ui.backupGuidesOM(guides)
+        cmds.delete(cmds.listRelatives(guides, p=True), hierarchy=True)# Orig roots, as deleteMultiple()
+        stages['restoreGuides'] = measureCalls(scene, guideCount, ui.restoreGuides, gdeBackupDict=gdeBackupDict)
+    finally:
+        fakeMaya.uninstall()
+        cmds = mayaCmds
+        restoreBindings(bindings)
+        fakes = set(id(module) for module in fakeModules.values())
+        for name in set(sys.modules) - loaded:
+            module = sys.modules[name]
+            if name.startswith('volume_sys_velan.') and name != fakeMaya.__name__ and any(id(value) in fakes for value in vars(module).values()):
+                sys.modules.pop(name)
+
+    results = {'version' : RESULTS_VERSION,
+               'maya'    : 'fakeMaya',
+               'date'    : datetime.datetime.now().isoformat(),
+               'config'  : {'sliders':sliders, 'stretches':stretches},
+               'calls'   : stages}
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return results
+
+
+def compareCallResults(base, other):
+    '''
+    Returns list of stages and commands of other results making more calls
+    per guide than base results, counts are exact so any increase is listed
+    '''
+    issues = []
+    if base['config'] != other['config']:
+        issues.append('config differs, %s vs %s' % (base['config'], other['config']))
+
+    for stage in CALL_STAGES:
+        if stage not in base['calls'] or stage not in other['calls']:
+            continue
+        baseStage, otherStage = base['calls'][stage], other['calls'][stage]
+        if otherStage['callsPerGuide'] > baseStage['callsPerGuide']:
+            commands = ['%s %s (was %s)' % (name, calls, baseStage['commands'].get(name, 0))
+                        for name, calls in sorted(otherStage['commands'].items()) if calls > baseStage['commands'].get(name, 0)]
+            issues.append('%s %.1f calls per guide, was %.1f: %s' % (
+                          stage, otherStage['callsPerGuide'], baseStage['callsPerGuide'], ', '.join(commands)))
+    return issues
+
+
+def reportCalls(results, top=5):
+    '''
+    Returns readable summary of call count results, with the most called commands per stage
+    '''
+    config = results['config']
+    lines = ['Volume call counts, %s sliders, %s stretches' % (config['sliders'], config['stretches'])]
+    for stage in CALL_STAGES:
+        if stage not in results['calls']:
+            continue
+        calls = results['calls'][stage]
+        commands = sorted(calls['commands'].items(), key=lambda item: -item[1])[:top]
+        lines.append('  %-20s %7s calls  %7.1f per guide  %8.1f ms  %s' % (
+                     stage, calls['calls'], calls['callsPerGuide'], calls['ms'], ', '.join('%s %s' % command for command in commands)))
+    return '\n'.join(lines)
+
+
+def loadResults(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compareResults(base, other, tolerance=TOLERANCE):
+    '''
+    Returns list of regressions of other compared to base results, slower
+    build, more nodes per system, lower fps, more evaluation time per system.
+    Call count results are compared with compareCallResults().
+    '''
+    if 'calls' in base:
+        return compareCallResults(base, other)
+
+    issues = []
+    if base['config'] != other['config']:
+        issues.append('config differs, %s vs %s' % (base['config'], other['config']))
+
+    baseMs, otherMs = base['build']['msPerSystem'], other['build']['msPerSystem']
+    if otherMs > baseMs * (1.0 + tolerance):
+        issues.append('build %.2f ms per system, was %.2f' % (otherMs, baseMs))
+
+    for guideType in ['slider', 'stretch']:
+        baseNodes, otherNodes = base['build']['nodes'][guideType], other['build']['nodes'][guideType]
+        if otherNodes > baseNodes:
+            issues.append('%s %.1f nodes per system, was %.1f' % (guideType, otherNodes, baseNodes))
+
+    for mode, playback in base['playback'].items():
+        if mode in other['playback'] and other['playback'][mode]['fps'] < playback['fps'] * (1.0 - tolerance):
+            issues.append('%s playback %.1f fps, was %.1f' % (mode, other['playback'][mode]['fps'], playback['fps']))
+
+    if 'profile' in base and 'profile' in other:
+        baseSystems, otherSystems = base['profile']['systems'], other['profile']['systems']
+        baseMean = sum(baseSystems.values()) / max(len(baseSystems), 1)
+        otherMean = sum(otherSystems.values()) / max(len(otherSystems), 1)
+        if otherMean > baseMean * (1.0 + tolerance):
+            issues.append('evaluation %.3f ms per system, was %.3f' % (otherMean, baseMean))
+    return issues
+
+
+def report(results, top=10):
+    '''
+    Returns readable summary of benchmark results, with the slowest systems
+    '''
+    config = results['config']
+    build = results['build']
+    lines = ['Volume benchmark, Maya %s, %s sliders, %s stretches, %s frames' % (
+             results['maya'], config['sliders'], config['stretches'], config['frames']),
+             '  build      %.2f s, %.2f ms per system, %s nodes' % (build['seconds'], build['msPerSystem'], build['sceneNodes']),
+             '  nodes      %.1f per slider, %.1f per stretch' % (build['nodes']['slider'], build['nodes']['stretch'])]
+    for mode, playback in sorted(results['playback'].items()):
+        lines.append('  playback   %-8s %.1f fps' % (mode, playback['fps']))
+    if 'profile' in results:
+        systems = results['profile']['systems']
+        lines.append('  profile    %.1f ms recorded, %.1f ms in systems' % (results['profile']['totalMs'], sum(systems.values())))
+        for sysRoot, ms in sorted(systems.items(), key=lambda item: -item[1])[:top]:
+            lines.append('    %-40s %.3f ms' % (sysRoot, ms))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='volumeBenchmark', description='Volume System evaluation benchmark, run with mayapy')
+    parser.add_argument('--sliders', type=int, default=50)
+    parser.add_argument('--stretches', type=int, default=50)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--modes', nargs='+', default=EVALUATION_MODES)
+    parser.add_argument('--no-profile', action='store_true')
+    parser.add_argument('-o', '--output', help='JSON results file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'OTHER'), help='Compare two results files, no benchmark is run')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--calls', action='store_true', help='Count calls per guide on the fakeMaya scene, runs without Maya')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        issues = compareResults(loadResults(args.compare[0]), loadResults(args.compare[1]), args.tolerance)
+        for issue in issues:
+            print('  REGRESSION %s' % issue)
+        print('%s regression(s)' % len(issues))
+        return 1 if issues else 0
+
+    if args.calls:
+        print(reportCalls(runCallBenchmark(args.sliders, args.stretches, args.output)))
+        return 0
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        results = runBenchmark(args.sliders, args.stretches, args.frames, args.modes, not args.no_profile, args.output)
+        print(report(results))
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+'''
+DESCRIPTION:
+    Levelled, buffered log and per stage timing of Volume System builds.
+    Messages below the log level are dropped before formatting. Inside a
+    buffered() block messages are kept and written in one go when the block
+    ends, a large build writes to the Script Editor once instead of per
+    system. Outside a buffered() block they are written at once.
+
+    stage() times a block when timing is on, calls and seconds add up per
+    stage name, summary() is the table of them. When timing is off stage()
+    returns a shared no-op context, so stages cost next to nothing.
+    A scopes function, see volumeProfiling.scope(), also opens a region of
+    its own around each stage.
+    Pure Python, no Maya dependency.
+USAGE:
+    import volume_sys_velan.scripts.volumeLogging as volumeLogging
+
+    log = volumeLogging.BuildLog('Volume System', level=volumeLogging.INFO)
+    log.timing = True
+
+    with log.buffered():
+        with log.stage('create'):
+            log.debug('%s slider', sldName)
+        log.info(log.summary())
+
+    # Builds from the Volume System, DEBUG shows one line per system
+    import volume_sys_velan.scripts.volumeSystem as volumeSystem
+    volumeSystem.buildLog.setLevel(volumeLogging.DEBUG)
+    volumeSystem.buildLog.timing = True
+'''
+
+import sys
+import time
+
+
+DEBUG   = 10
+INFO    = 20
+WARNING = 30
+ERROR   = 40
+SILENT  = 100
+
+LEVEL_NAMES = {DEBUG:'DEBUG', INFO:'INFO', WARNING:'WARNING', ERROR:'ERROR'}
+
+
+class _NullStage(object):
+    '''
+    Stage context used when timing is off
+    '''
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage(object):
+    def __init__(self, log, name, scope=None):
+        self.log = log
+        self.name = name
+        self.scope = scope
+
+    def __enter__(self):
+        if self.scope is not None:
+            self.scope.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.log.addTime(self.name, time.perf_counter() - self.start)
+        if self.scope is not None:
+            self.scope.__exit__(*args)
+        return False
+
+
+class BuildLog(object):
+    '''
+    Levelled, buffered log with per stage timing, see module description
+
+    name   = (str) Prefix of warnings and errors
+    level  = (int) Messages below it are dropped
+    timing = (bol) Time stage() blocks
+    stream = (file) Output, sys.stdout when None
+    scopes = (function) scopes(name, description) returns a context opened
+             around each stage, volumeProfiling.scope()
+    '''
+    def __init__(self, name, level=INFO, timing=False, stream=None, scopes=None):
+        self.name = name
+        self.level = level
+        self.timing = timing
+        self.stream = stream
+        self.scopes = scopes
+        self.buffer = []
+        self.depth = 0 # Nested buffered() blocks
+        self.stages = {} # name : [calls, seconds]
+        self.order = []
+
+    def setLevel(self, level):
+        self.level = level
+
+    def isEnabled(self, level):
+        return level >= self.level
+
+    def log(self, level, message, *args):
+        if level < self.level:
+            return
+        if args:
+            message = message % args
+        if level >= WARNING:
+            message = '%s %s: %s' % (self.name, LEVEL_NAMES[level], message)
+        self.buffer.append(message)
+        if self.depth == 0:
+            self.flush()
+
+    def debug(self, message, *args):
+        self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        self.log(ERROR, message, *args)
+
+    def flush(self):
+        '''
+        Writes buffered messages in one write
+        '''
+        if self.buffer == []:
+            return
+        stream = self.stream or sys.stdout
+        stream.write('\n'.join(self.buffer) + '\n')
+        self.buffer = []
+
+    def buffered(self):
+        '''
+        Returns context keeping messages until the outermost block ends
+        '''
+        return _Buffered(self)
+
+    # Timing
+    def stage(self, name, description=None):
+        '''
+        Returns context timing a block under name, a no-op when timing is off
+        and there are no scopes
+
+        description = (str) Passed to scopes, a guide or system name
+        '''
+        scope = self.scopes(name, description) if self.scopes is not None else None
+        if not self.timing:
+            return _NULL_STAGE if scope is None else scope
+        return _Stage(self, name, scope)
+
+    def addTime(self, name, seconds):
+        if name not in self.stages:
+            self.stages[name] = [0, 0.0]
+            self.order.append(name)
+        self.stages[name][0] += 1
+        self.stages[name][1] += seconds
+
+    def resetTimes(self):
+        self.stages = {}
+        self.order = []
+
+    def times(self):
+        '''
+        Returns {stage : {'calls', 'seconds'}}
+        '''
+        return dict((name, {'calls':calls, 'seconds':seconds}) for name, (calls, seconds) in self.stages.items())
+
+    def summary(self, total=None):
+        '''
+        Returns table of stage times, in first run order
+
+        total = (str) Stage the shares are relative to, the sum of stages if None
+        '''
+        if self.stages == {}:
+            return ''
+        totalSeconds = self.stages[total][1] if total in self.stages else sum(seconds for calls, seconds in self.stages.values())
+        lines = ['  %-16s %7s %10s %9s %7s' % ('stage', 'calls', 'total ms', 'mean ms', 'share')]
+        for name in self.order:
+            calls, seconds = self.stages[name]
+            lines.append('  %-16s %7s %10.1f %9.2f %6.1f%%' % (
+                         name, calls, seconds * 1000.0, seconds * 1000.0 / calls, 100.0 * seconds / totalSeconds if totalSeconds else 0.0))
+        return '\n'.join(lines)
+
+
+class _Buffered(object):
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        self.log.depth += 1
+        return self.log
+
+    def __exit__(self, *args):
+        self.log.depth -= 1
+        if self.log.depth == 0:
+            self.log.flush()
+        return False
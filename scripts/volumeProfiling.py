@@ -0,0 +1,132 @@
+'''
+DESCRIPTION:
+    Maya Profiler tagging of Volume System operations. Operations and their
+    stages are recorded as MProfilingScope regions of the "VolumeSystem"
+    profiler category, next to DG evaluation and Qt paint events.
+
+    Tagging is off by default. scope() then returns a shared no-op context
+    and profiled() methods only check a flag, so there is no measurable
+    cost. Needs MProfilingScope, Maya 2019 and later, without it tagging
+    stays off. VOLUME_SYS_PROFILING=1 in the environment turns it on at
+    import, for mayapy runs.
+USAGE:
+    import volume_sys_velan.scripts.volumeProfiling as volumeProfiling
+
+    volumeProfiling.setEnabled(True)
+    # Windows > General Editors > Profiler, Start Record, then build / mirror / restore
+
+    with volumeProfiling.scope('create', guideName):
+        ...
+
+    class VolumeSystemUI(DockableWidget):
+        @volumeProfiling.profiled()
+        def buildFromGuide(self, ...):
+'''
+
+import functools
+import os
+
+try:
+    import maya.api.OpenMaya as om2
+except ImportError:# Imported by modules that also run without Maya
+    om2 = None
+
+
+CATEGORY = 'VolumeSystem'
+CATEGORY_DESCRIPTION = 'Volume System guide and build operations'
+
+# MProfiler.ProfilingColor names, operations and their stages
+OPERATION_COLOR = 'kColorE_L1'
+STAGE_COLOR     = 'kColorE_L3'
+
+_state = {'enabled':False, 'category':None}
+
+
+class _NullScope(object):
+    '''
+    Scope used when tagging is off
+    '''
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+def isAvailable():
+    return om2 is not None and hasattr(om2, 'MProfilingScope')
+
+
+def getCategory():
+    '''
+    Returns the VolumeSystem profiler category index, added once per session
+    '''
+    if _state['category'] is None:
+        try:
+            index = om2.MProfiler.getCategoryIndex(CATEGORY)
+        except (RuntimeError, ValueError):
+            index = -1
+        if index < 0:
+            index = om2.MProfiler.addCategory(CATEGORY, CATEGORY_DESCRIPTION)
+        _state['category'] = index
+    return _state['category']
+
+
+def setEnabled(enabled=True):
+    '''
+    Returns tagging state, only on when MProfilingScope is available
+    '''
+    enabled = bool(enabled) and isAvailable()
+    if enabled:
+        getCategory()
+    _state['enabled'] = enabled
+    return enabled
+
+
+def isEnabled():
+    return _state['enabled']
+
+
+def _color(name):
+    return getattr(om2.MProfiler, name, 0)
+
+
+def scope(name, description=None, color=STAGE_COLOR):
+    '''
+    Returns MProfilingScope context of a region, a no-op when tagging is off
+
+    name        = (str) Event name shown in the Profiler
+    description = (str) Event description, a guide or system name
+    '''
+    if not _state['enabled']:
+        return _NULL_SCOPE
+    if description is None:
+        return om2.MProfilingScope(_state['category'], _color(color), name)
+    return om2.MProfilingScope(_state['category'], _color(color), name, description)
+
+
+def profiled(name=None, color=OPERATION_COLOR):
+    '''
+    Returns decorator recording each call of a function as a region
+
+    name  = (str) Event name, the function name if None
+    color = (str) MProfiler.ProfilingColor name, STAGE_COLOR for sub-stages
+    '''
+    def decorate(function):
+        eventName = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _state['enabled']:
+                return function(*args, **kwargs)
+            with om2.MProfilingScope(_state['category'], _color(color), eventName):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+if os.environ.get('VOLUME_SYS_PROFILING') == '1':
+    setEnabled(True)
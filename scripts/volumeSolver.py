@@ -0,0 +1,332 @@
+'''
+DESCRIPTION:
+    Reference solver for built volume systems.
+    Reproduces the math of the DG networks of VolumeSystemUI for arrays of
+    poses, ie. every frame of a ROM, without evaluating Maya. Used for
+    previews, auto-tuning and regression checks against the network.
+    Pure NumPy, no Maya dependency.
+
+    Stages computed by float attributes in the network (remapValue,
+    multiplyDivide, plusMinusAverage) are computed in float32, like the
+    network, so results match it to float precision.
+
+    Slider system, see VolumeSystemUI.createSliderSystem():
+        twist     tracker rotation on the up axis, relative to its build pose,
+                  parentConstraint on one rotate channel then extractTwist
+        weight    _RotRemap, linear remap of twist from trackerMinRot..trackerMaxRot to 0..1, clamped
+        translate start + (end - start) * weight, _MatrixSub / _MatrixMod / _MatrixCombine
+        rotate    _sldDeftwist pairBlend of the start and end rotates, weight 0
+
+    Stretch SNS, see VolumeSystemUI.createStretchSystem() and solveStretch():
+        Def_*_StrMain scale from the start to end distance, remap / condition /
+        clamp / power / global scale nodes with ranges baked from the rest
+        distance. sweepStretch() and checkStretchSweep() are the regression
+        harness, plotStretch() draws the curves (matplotlib).
+
+    Matrices follow Maya's row-vector convention, see symmetry.
+USAGE:
+    import volume_sys_velan.scripts.volumeSolver as volumeSolver
+
+    # Tracker rotation in degrees, one per frame
+    result = volumeSolver.solveSlider(angles, startMatrix, endMatrix, minRot=0.0, maxRot=30.0)
+    result['translate'] # (N,3) Def_*_SldMain translate
+
+    # Tracker local matrices, one per frame
+    angles = volumeSolver.trackerTwist(trackerMatrices, restMatrix, axis='y')
+
+    # Stretch scale per distance
+    result = volumeSolver.solveStretch(distances, restDistance=4.0, snsMultiplier=1.5)
+    result['scale'] # (N,3) Def_*_StrMain scale
+
+    # Sweep, check and plot from a shell
+    python -m volume_sys_velan.scripts.volumeSolver --rest 4 --sns 0.5 1 2 --plot sns.png
+'''
+
+import numpy as np
+
+import volume_sys_velan.scripts.symmetry as sym
+import volume_sys_velan.scripts.swingTwist as swingTwist
+
+
+def trackerTwist(trackerMatrices, restMatrix, axis):
+    '''
+    Returns (N,) twist in degrees, the inputValue of _RotRemap, for tracker poses.
+
+    The twist setup is parent constrained to the tracker's parent and rotate
+    constrained, on the up axis only, to the tracker, both with offsets from
+    the build pose, so only the tracker's local rotation relative to its
+    build pose matters.
+
+    trackerMatrices = ((N,4,4)) Tracker local matrices, tracker.matrix
+    restMatrix      = ((4,4)) Tracker local matrix when the system was built
+    axis            = (str) Up axis, 'x', 'y' or 'z'
+    '''
+    relative = np.matmul(swingTwist.rotationMatrices(trackerMatrices), np.linalg.inv(swingTwist.rotationMatrices(restMatrix)))
+
+    # VolumeSystemUI.parentConstraint() decomposes trkRot_*_A.rotate in xyz order, one channel is connected
+    axisId = swingTwist.AXES[axis]
+    channel = np.zeros((len(relative), 3))
+    channel[:, axisId] = swingTwist.eulerFromMatrices(swingTwist.homogeneous(relative), 'xyz')[:, axisId]
+    twistMatrices = swingTwist.eulerToMatrices(channel, 'xyz')
+
+    return np.degrees(swingTwist.extractTwist(twistMatrices, np.eye(4), axis))
+
+
+def _f32(values):
+    '''
+    Returns values rounded to float32, the output of a float attribute
+    '''
+    return np.asarray(values, dtype=np.float64).astype(np.float32)
+
+
+def remapValue(values, inputMin, inputMax, outputMin=0.0, outputMax=1.0):
+    '''
+    Returns remapValue.outValue, float32, for the default linear 0..1 value curve.
+    Inputs are float attributes, the remap is computed in double and rounded
+    once. The curve clamps, so results stay in outputMin..outputMax. With
+    inputMin equal to inputMax the result steps from outputMin to outputMax
+    at inputMin.
+    '''
+    values = _f32(values).astype(np.float64)
+    inputMin, inputMax, outputMin, outputMax = [float(_f32(v)) for v in [inputMin, inputMax, outputMin, outputMax]]
+    inputRange = inputMax - inputMin
+    if inputRange == 0:
+        position = (values >= inputMin).astype(np.float64)
+    else:
+        position = np.clip((values - inputMin) / inputRange, 0.0, 1.0)
+    return _f32(outputMin + position * (outputMax - outputMin))
+
+
+def solveSlider(angles, startMatrix, endMatrix, minRot, maxRot, blend=0.0):
+    '''
+    Returns {'weight' (N,), 'translate' (N,3), 'rotate' (N,3)} of Def_*_SldMain
+    for tracker twist angles, see module description.
+
+    angles      = ((N,)) Tracker twist in degrees, see trackerTwist()
+    startMatrix = ((4,4) or (N,4,4)) _sliderStartPos world matrix
+    endMatrix   = ((4,4) or (N,4,4)) _sliderEndPos world matrix
+    minRot      = (float) trackerMinRot, _RotRemap.inputMin
+    maxRot      = (float) trackerMaxRot, _RotRemap.inputMax
+    blend       = (float) _sldDeftwist.weight, rotate blend towards the end rotate
+    '''
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+    start = sym.asMatrixArray(startMatrix)
+    end = sym.asMatrixArray(endMatrix)
+
+    weight = remapValue(angles, minRot, maxRot)
+
+    # decomposeMatrix.outputTranslate (double) feeds float3 plusMinusAverage / multiplyDivide
+    startPos = _f32(start[:, 3, :3])
+    endPos = _f32(end[:, 3, :3])
+    translate = _f32(startPos + _f32((endPos - startPos) * weight[:, None]))
+
+    # pairBlend, euler interpolation of the locator rotates
+    startRot = np.degrees(swingTwist.eulerFromMatrices(start, 'xyz'))
+    endRot = np.degrees(swingTwist.eulerFromMatrices(end, 'xyz'))
+    rotate = startRot + (endRot - startRot) * blend
+    rotate = np.broadcast_to(rotate, (len(angles), 3))
+
+    return {'weight'    : weight,
+            'translate' : translate.astype(np.float64),
+            'rotate'    : np.array(rotate)}
+
+
+# Stretch SNS network constants, see VolumeSystemUI.createStretchSystem()
+SNS_DECIMAL_CLAMP = 100     # _decimalPlaceMult, distances are kept to 1/100
+SNS_MAX_SCALE     = 10000.0 # _snsClamp maxR / maxG
+SNS_SQUASH_XY     = 2.25    # _snsSquashXY outputMin, XY scale at zero distance
+SNS_STRETCH_Z     = 2.25    # _snsStretchZ outputMax, Z scale at twice the rest distance
+SHORT_RANGE       = (-32768, 32767)
+
+
+def shortAttr(values):
+    '''
+    Returns (values as a short attr, overflowed). Float to short connections
+    round to the nearest integer, values outside the short range wrap around.
+    '''
+    rounded = np.floor(np.asarray(values, dtype=np.float64) + 0.5).astype(np.int64)
+    overflow = (rounded < SHORT_RANGE[0]) | (rounded > SHORT_RANGE[1])
+    return rounded.astype(np.int16), overflow
+
+
+def snsDistance(distances, globalScale=1.0):
+    '''
+    Returns (quantized distance, overflowed), _decimalPlaceDivide.outputX, float32.
+    Distance over global scale, kept to 1/100 through the short attr
+    _decimalPlaceMult.snsDistFloatToInt, which overflows past 327.67 units.
+
+    distances   = ((N,)) _distBetween.distance, start to end locator
+    globalScale = (float or (N,)) snsSysGlobalScale
+    '''
+    scaled = _f32(_f32(distances) / _f32(globalScale).astype(np.float64))
+    shorts, overflow = shortAttr(_f32(scaled * float(SNS_DECIMAL_CLAMP)))
+    return _f32(shorts / float(SNS_DECIMAL_CLAMP)), overflow
+
+
+def solveStretch(distances, restDistance, snsMultiplier=1.0, globalScale=1.0):
+    '''
+    Returns Def_*_StrMain scale response of the SNS network for start to end
+    distances, see VolumeSystemUI.createStretchSystem():
+
+        d          quantized distance / global scale, see snsDistance()
+        d0         d at build, _snsStretchXY.inputMin, global scale was 1
+        stretch    d >= d0, XY remap d0..2*rest 1 -> 0, Z remap d0..2*rest 1 -> 2.25
+        squash     d < d0,  XY remap 0..d0 2.25 -> 1, Z remap 0..d0 0 -> 1
+        scale      clamp(0, 10000) ** snsMultiplier * global scale
+
+    distances     = ((N,)) Start to end locator distances
+    restDistance  = (float) Distance when the system was built, _distTimesTwo.input1X
+    snsMultiplier = (float) snsMultiplier, power of the scale
+    globalScale   = (float or (N,)) snsSysGlobalScale
+
+    Returns {'distance' (N,), 'squash' (N,) bol, 'xy' (N,), 'z' (N,),
+             'scale' (N,3), 'overflow' (N,) bol}, xy / z are before the power
+    '''
+    distances = np.asarray(distances, dtype=np.float64).reshape(-1)
+    globalScale = np.broadcast_to(np.asarray(globalScale, dtype=np.float64), distances.shape)
+
+    d, overflow = snsDistance(distances, globalScale)
+    d0 = snsDistance([restDistance])[0][0]
+    twiceRest = _f32(_f32(restDistance) * np.float32(2.0))
+
+    stretchXY = remapValue(d, d0, twiceRest, 1.0, 0.0)
+    stretchZ = remapValue(d, d0, twiceRest, 1.0, SNS_STRETCH_Z)
+    squashXY = remapValue(d, 0.0, d0, SNS_SQUASH_XY, 1.0)
+    squashZ = remapValue(d, 0.0, d0, 0.0, 1.0)
+
+    # _snsCond, less than
+    squash = d < d0
+    xy = np.where(squash, squashXY, stretchXY)
+    z = np.where(squash, squashZ, stretchZ)
+
+    clampXY = np.clip(xy, np.float32(0.0), np.float32(SNS_MAX_SCALE))
+    clampZ = np.clip(z, np.float32(0.0), np.float32(SNS_MAX_SCALE))
+    power = float(_f32(snsMultiplier))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        powXY = _f32(np.power(clampXY.astype(np.float64), power))
+        powZ = _f32(np.power(clampZ.astype(np.float64), power))
+    scaleXY = _f32(powXY * _f32(globalScale).astype(np.float64))
+    scaleZ = _f32(powZ * _f32(globalScale).astype(np.float64))
+
+    return {'distance' : d,
+            'squash'   : squash,
+            'xy'       : xy,
+            'z'        : z,
+            'scale'    : np.stack([scaleXY, scaleXY, scaleZ], axis=1).astype(np.float64),
+            'overflow' : overflow}
+
+
+def sweepStretch(restDistance, snsMultiplier=1.0, globalScale=1.0, ratios=None):
+    '''
+    Returns solveStretch() result of a distance sweep, with 'ratio' and
+    'distances' added.
+
+    ratios = ((M,)) Distances as multiples of restDistance, 0..2.5 if None
+    '''
+    ratios = np.linspace(0.0, 2.5, 251) if ratios is None else np.asarray(ratios, dtype=np.float64)
+    distances = ratios * restDistance * globalScale
+    result = solveStretch(distances, restDistance, snsMultiplier, globalScale)
+    result['ratio'] = ratios
+    result['distances'] = distances
+    return result
+
+
+def checkStretchSweep(sweep, restDistance, globalScale=1.0):
+    '''
+    Returns list of issues found in a sweepStretch() result, empty when the
+    response behaves: unit scale at rest, XY never grows while stretching or
+    shrinks while squashing, Z the other way round, and no short overflow.
+    '''
+    issues = []
+    scale = sweep['scale'] / globalScale
+    ratios = sweep['ratio']
+
+    rest = np.abs(ratios - 1.0).argmin()
+    if np.isclose(ratios[rest], 1.0) and not np.allclose(scale[rest], 1.0, atol=1e-3):
+        issues.append('scale at rest distance is %s, expected 1' % scale[rest].round(4).tolist())
+
+    order = np.argsort(sweep['distances'])
+    stepXY = np.diff(scale[order, 0])
+    stepZ = np.diff(scale[order, 2])
+    if (stepXY > 1e-6).any():
+        issues.append('XY scale grows with distance at ratio %.3f' % ratios[order][1:][stepXY > 1e-6][0])
+    if (stepZ < -1e-6).any():
+        issues.append('Z scale shrinks with distance at ratio %.3f' % ratios[order][1:][stepZ < -1e-6][0])
+
+    if sweep['overflow'].any():
+        issues.append('distance overflows the short attr past %.2f units, from ratio %.3f' % (
+                      SHORT_RANGE[1] / float(SNS_DECIMAL_CLAMP), ratios[sweep['overflow']][0]))
+    if not np.isfinite(sweep['scale']).all():
+        issues.append('scale is not finite at ratio %.3f' % ratios[~np.isfinite(sweep['scale']).all(axis=1)][0])
+    return issues
+
+
+def plotStretch(sweeps, path=None):
+    '''
+    Plots XY and Z scale against distance ratio for sweepStretch() results,
+    needs matplotlib. Saved to path, shown if None.
+
+    sweeps = ({label : sweep}) ie. one sweep per snsMultiplier
+    '''
+    try:
+        import matplotlib
+        if path:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError('plotStretch needs matplotlib')
+
+    fig, axes = plt.subplots(1, 2, figsize=(10, 4), sharex=True)
+    for label, sweep in sweeps.items():
+        axes[0].plot(sweep['ratio'], sweep['scale'][:, 0], label=label)
+        axes[1].plot(sweep['ratio'], sweep['scale'][:, 2], label=label)
+    for ax, title in zip(axes, ['Scale XY', 'Scale Z']):
+        ax.set_title(title)
+        ax.set_xlabel('distance / rest distance')
+        ax.axvline(1.0, color='grey', lw=0.5)
+        ax.grid(True, lw=0.3)
+    axes[0].legend()
+    fig.tight_layout()
+
+    if path:
+        fig.savefig(path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='volumeSolver', description='Stretch SNS response sweep')
+    parser.add_argument('--rest', type=float, default=1.0, help='Rest distance')
+    parser.add_argument('--sns', type=float, nargs='+', default=[1.0], help='snsMultiplier value(s)')
+    parser.add_argument('--global-scale', type=float, default=1.0)
+    parser.add_argument('--plot', help='Save a plot to this image file')
+    args = parser.parse_args(argv)
+
+    sweeps = {}
+    failed = False
+    for snsMultiplier in args.sns:
+        sweep = sweepStretch(args.rest, snsMultiplier, args.global_scale)
+        sweeps['snsMultiplier %g' % snsMultiplier] = sweep
+        issues = checkStretchSweep(sweep, args.rest, args.global_scale)
+        failed = failed or bool(issues)
+        print('snsMultiplier %g: %s' % (snsMultiplier, 'ok' if issues == [] else '%s issue(s)' % len(issues)))
+        for issue in issues:
+            print('  ' + issue)
+        for ratio in [0.0, 0.5, 1.0, 1.5, 2.0]:
+            row = np.abs(sweep['ratio'] - ratio).argmin()
+            print('  ratio %.2f  xy %.4f  z %.4f' % (ratio, sweep['scale'][row, 0], sweep['scale'][row, 2]))
+
+    if args.plot:
+        try:
+            plotStretch(sweeps, args.plot)
+        except ImportError as error:
+            print('No plot: %s' % error)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
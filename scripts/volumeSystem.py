@@ -47,6 +47,8 @@ from functools import partial
 import json
 import re, os, time
 
+import numpy as np
+
 import maya.cmds as cmds
 import maya.OpenMaya as om
 import maya.api.OpenMaya as om2
@@ -63,6 +65,20 @@ from lib_python_velan.mayaQT.scripts.collapsibleWidget import CollapsibleListWid
 from lib_python_velan.mayaQT.scripts import styles as styles
 
 import lib_python_velan.mayaRigUtils.scripts.skincluster as skn
+import volume_sys_velan.scripts.symmetry as sym
+import volume_sys_velan.scripts.sideNaming as sideNaming
+import volume_sys_velan.scripts.guideShapes as guideShapes
+import volume_sys_velan.scripts.guideSchema as guideSchema
+import volume_sys_velan.scripts.guideGenerator as guideGenerator
+import volume_sys_velan.scripts.jointIndex as jointIndex
+import volume_sys_velan.scripts.guideFile as guideFile
+import volume_sys_velan.scripts.guideDiff as guideDiff
+import volume_sys_velan.scripts.guideLibrary as guideLibrary
+import volume_sys_velan.scripts.volumeSolver as volumeSolver
+import volume_sys_velan.scripts.swingTwist as swingTwist
+import volume_sys_velan.scripts.trackerCalibration as trackerCalibration
+import volume_sys_velan.scripts.volumeLogging as volumeLogging
+import volume_sys_velan.scripts.volumeProfiling as volumeProfiling
 # import lib_python_velan.mayaRigUtils.scripts.surfaces as srf
 # import lib_python_velan.mayaRigUtils.scripts.curves as crv
 # import lib_python_velan.mayaRigUtils.scripts.rigUtils as rigu
@@ -71,6 +87,11 @@ import lib_python_velan.mayaRigUtils.scripts.skincluster as skn
 if not cmds.pluginInfo('quatNodes', q=True, loaded=True):
     cmds.loadPlugin('quatNodes')
 
+# Build messages and stage timing, only errors in batch, see volumeLogging.
+# Stages are also profiler regions when volumeProfiling tagging is on.
+buildLog = volumeLogging.BuildLog('Volume System', level=volumeLogging.ERROR if cmds.about(batch=True) else volumeLogging.INFO,
+                                  scopes=volumeProfiling.scope)
+
 class VolumeSystemUI(DockableWidget):
     # Unique name
     ctrl_obj_name = 'VolumeSystemUIWidget'
@@ -81,6 +102,9 @@ class VolumeSystemUI(DockableWidget):
     # Tile for your workspace control
     window_title = 'Volume System UI'
 
+    # Guide curve data, (shape, scale) : (points, knots, degree)
+    guideCurveCache = {}
+
     def __init__(self, parent=None, **kwargs):
         if self.registry.getInstance(VolumeSystemUI) is not None:
             print('\nREGISTRY INFO:')
@@ -103,6 +127,7 @@ class VolumeSystemUI(DockableWidget):
 
         self.guideCollapsibleListWidget = {}
         self.guideCollapsibleListWidgetMenu = {}
+        self.guideFrameWidgets = {}
 
         self.sliderParDict    = None
         self.stretchParDict   = None
@@ -123,6 +148,7 @@ class VolumeSystemUI(DockableWidget):
 
 
     # UI
+    @volumeProfiling.profiled(color=volumeProfiling.STAGE_COLOR)
     def buildGuideDict(self):
         '''
         '''
@@ -200,10 +226,14 @@ class VolumeSystemUI(DockableWidget):
         self.guideCollapsibleListWidgetMenu.setTearOffEnabled(True)
 
         self.createGuideCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Create Guide', lambda:self.guideCollapsibleListWidgetMenuCallBack(dialogMode='create'))
+        self.generateSliderGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Generate Slider Guide(s) from Joints', lambda:self.generateGuides(guideType='slider'))
+        self.generateStretchGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Generate Stretch Guide(s) from Joints', lambda:self.generateGuides(guideType='stretch'))
+        self.generateRuleGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Generate Guides from Rule Table', lambda:self.generateGuidesFromRules())
         
         self.guideCollapsibleListWidgetMenu.addSeparator()
 
         self.buildFromGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Build from Guide(s)', lambda:self.buildFromGuide())
+        self.buildTimedFromGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Build from Guide(s) with Timing', lambda:self.buildFromGuideTimed())
         
         self.guideCollapsibleListWidgetMenu.addSeparator()
 
@@ -217,10 +247,17 @@ class VolumeSystemUI(DockableWidget):
 
         self.toggleGuideVisCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Toggle Guide Vis', lambda:self.showGuides())
         self.toggleSystemeVisCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Toggle System Vis', lambda:self.showSystems())
+        self.bakeSystemsCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Bake System(s) to Curves', lambda:self.bakeSystems())
+        self.unbakeSystemsCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Unbake System(s)', lambda:self.unbakeSystems())
+        self.freezeSystemsCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Freeze Static System(s)', lambda:self.freezeStaticSystems())
+        self.thawSystemsCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Thaw System(s)', lambda:self.thawSystems())
 
         self.guideCollapsibleListWidgetMenu.addSeparator()
 
         self.mirrorGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Mirror Guide(s)', lambda:self.mirrorGuideMultiple())
+        self.syncMirrorGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Sync Mirror Guide(s)', lambda:self.mirrorGuideMultiple(sync=True))
+        self.reportMirrorDriftCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Report Mirror Drift', lambda:self.buildSymmetryIndex())
+        self.mirrorDriftedGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Mirror Drifted Guide(s)', lambda:self.mirrorDriftedGuides())
 
         self.guideCollapsibleListWidgetMenu.addSeparator()
 
@@ -236,10 +273,19 @@ class VolumeSystemUI(DockableWidget):
 
         # self.fixTrackersCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Fix Tracker(s)', lambda:self.fixConstrainSldTracker())
 
+        self.suggestGuideJointsCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Suggest Parents / Trackers', lambda:self.suggestGuideJoints())
+        self.assignGuideJointsCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Auto-Assign Parents / Trackers', lambda:self.suggestGuideJoints(apply=True))
+        self.calibrateTrackersCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Calibrate Tracker Ranges', lambda:self.calibrateSliderGuides())
+        self.analyzeTrackersCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Analyze Tracker Twist Axes', lambda:self.calibrateSliderGuides(apply=False))
+
         self.guideCollapsibleListWidgetMenu.addSeparator()
 
         self.saveSelectedGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Save Guides', lambda:self.backupGuideDecide())
         self.loadGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Load Guides', lambda:self.restoreGuides())
+        self.loadLibraryGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Load Guides from Library', lambda:self.loadLibraryGuides())
+        self.mergeGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Merge Guides', lambda:self.mergeGuides())
+        self.mergeRemoveGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Merge Guides (Remove Extras)', lambda:self.mergeGuides(removeExtras=True))
+        self.loadGuideShapesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Load Guide Shapes', lambda:self.loadGuideShapeLibrary())
 
         self.guideCollapsibleListWidgetMenu.addSeparator()
 
@@ -248,9 +294,20 @@ class VolumeSystemUI(DockableWidget):
         self.guideCollapsibleListWidgetMenu.addSeparator()
 
         self.deleteSelectedGuidesCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Refresh UI', lambda:self.refreshUI())
+        self.toggleProfilingCollapsibleListWidgetMenuItem = self.guideCollapsibleListWidgetMenu.addAction('Toggle Profiler Tagging', lambda:self.toggleProfiling())
 
         self.guideCollapsibleListWidget.customContextMenuRequested.connect(partial(self.guideCollapsibleListWidgetContextMenuCallBack))
 
+    def toggleProfiling(self):
+        '''
+        Turns VolumeSystem profiler regions on or off, see volumeProfiling
+        '''
+        if not volumeProfiling.isAvailable():
+            cmds.warning('MProfilingScope is not available in this Maya version')
+            return
+        enabled = volumeProfiling.setEnabled(not volumeProfiling.isEnabled())
+        buildLog.info('VolumeSystem profiler tagging %s', 'on' if enabled else 'off')
+
     def buildGuideFilters(self, guides):
         '''
         '''
@@ -288,10 +345,13 @@ class VolumeSystemUI(DockableWidget):
 
         return self.filterTypesFrame
 
-    def filterGuideList(self, guides, filterResults):
+    @volumeProfiling.profiled(color=volumeProfiling.STAGE_COLOR)
+    def filterGuideList(self, guides, filterResults, titles=None):
         '''
         DESCRIPTION:
             Filter display result by given list
+
+            titles = ([]) Only filter these items, all items if None
         '''
         # start = time.perf_counter()
 
@@ -303,6 +363,8 @@ class VolumeSystemUI(DockableWidget):
             curItem = self.guideCollapsibleListWidget.item(i)
             curItemWidget = self.guideCollapsibleListWidget.itemWidget(curItem)
             curItemTitle = self.guideCollapsibleListWidget.itemWidget(curItem).title()
+            if titles is not None and curItemTitle not in titles:
+                continue
             curItemGuideType = cmds.getAttr(curItemTitle + '.guideType')
             setHidden = True
             if curItemTitle in filterResults and self.guideTypeFilterCheckBox[curItemGuideType].isChecked():
@@ -333,6 +395,7 @@ class VolumeSystemUI(DockableWidget):
 
         return self.guideCollapsibleListWidget
 
+    @volumeProfiling.profiled(color=volumeProfiling.STAGE_COLOR)
     def populateGuideCollapsableListWidget(self, guides):
         '''
         '''
@@ -407,41 +470,19 @@ class VolumeSystemUI(DockableWidget):
             frame.layout().addLayout(sliderSettingsHBoxLayout)
 
             xyz = cmds.getAttr('%s.XYZ' % (guide))
-            rotAxisQLabel = QLabel('Axis')
-            rotAxisQLabel.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            sliderSettingsHBoxLayout.addWidget(rotAxisQLabel)
-            rotAxisComboBox = QComboBox()
-            rotAxisComboBox.addItem('X')
-            rotAxisComboBox.addItem('Y')
-            rotAxisComboBox.addItem('Z')
-            rotAxisComboBox.setCurrentIndex(xyz)
+            sliderSettingsHBoxLayout.addWidget(self.buildSchemaLabel('slider', 'XYZ'))
+            rotAxisComboBox = self.buildSchemaWidget('slider', 'XYZ', xyz)
             sliderSettingsHBoxLayout.addWidget(rotAxisComboBox)
             trackerPushButton.clicked.connect(lambda:self.constrainSldTracker(guide, trackerLineEdit, rotAxisComboBox))
 
             trackerMinRot = cmds.getAttr('%s.trackerMinRot' % (guide))
-            startValQLabel = QLabel('Start')
-            startValQLabel.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            sliderSettingsHBoxLayout.addWidget(startValQLabel)
-            startValDoubleSpinBox = QDoubleSpinBox()
-            startValDoubleSpinBox.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            startValDoubleSpinBox.setDecimals(2)
-            startValDoubleSpinBox.setSingleStep(1)
-            startValDoubleSpinBox.setMinimum(-360.0)
-            startValDoubleSpinBox.setMaximum(360.0)
-            startValDoubleSpinBox.setValue(trackerMinRot)
+            sliderSettingsHBoxLayout.addWidget(self.buildSchemaLabel('slider', 'trackerMinRot'))
+            startValDoubleSpinBox = self.buildSchemaWidget('slider', 'trackerMinRot', trackerMinRot)
             sliderSettingsHBoxLayout.addWidget(startValDoubleSpinBox)
 
             trackerMaxRot = cmds.getAttr('%s.trackerMaxRot' % (guide))
-            endValQLabel = QLabel('End')
-            endValQLabel.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            sliderSettingsHBoxLayout.addWidget(endValQLabel)
-            endValDoubleSpinBox = QDoubleSpinBox()
-            endValDoubleSpinBox.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            endValDoubleSpinBox.setDecimals(2)
-            endValDoubleSpinBox.setSingleStep(1)
-            endValDoubleSpinBox.setMinimum(-360.0)
-            endValDoubleSpinBox.setMaximum(360.0)
-            endValDoubleSpinBox.setValue(trackerMaxRot)
+            sliderSettingsHBoxLayout.addWidget(self.buildSchemaLabel('slider', 'trackerMaxRot'))
+            endValDoubleSpinBox = self.buildSchemaWidget('slider', 'trackerMaxRot', trackerMaxRot)
             sliderSettingsHBoxLayout.addWidget(endValDoubleSpinBox)
 
             sliderSettingsHBoxLayout.addItem(QSpacerItem(10, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
@@ -467,13 +508,11 @@ class VolumeSystemUI(DockableWidget):
             sliderSettingsHBoxLayout.addItem(QSpacerItem(10, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
             reverseCheckBoxState = cmds.getAttr('%s.trackerRev' % (guide))
-            reverseCheckBox = QCheckBox('+ / -')
-            reverseCheckBox.setChecked(reverseCheckBoxState)
+            reverseCheckBox = self.buildSchemaWidget('slider', 'trackerRev', reverseCheckBoxState)
             sliderSettingsHBoxLayout.addWidget(reverseCheckBox)
 
             jntCheckBoxState = cmds.getAttr('%s.sliderJoint' % (guide))
-            jntCheckBox = QCheckBox('jnt')
-            jntCheckBox.setChecked(jntCheckBoxState)
+            jntCheckBox = self.buildSchemaWidget('slider', 'sliderJoint', jntCheckBoxState)
             sliderSettingsHBoxLayout.addWidget(jntCheckBox)
 
             # doritoCheckBoxState = cmds.getAttr('%s.sliderDorito' % (guide))
@@ -488,6 +527,14 @@ class VolumeSystemUI(DockableWidget):
             jntCheckBox.clicked[bool].connect(lambda:self.commitGdeSld(guide, rotAxisComboBox, startValDoubleSpinBox, endValDoubleSpinBox, reverseCheckBox, jntCheckBox, ))
             # doritoCheckBox.clicked[bool].connect(lambda:self.commitGdeSld(guide, rotAxisComboBox, startValDoubleSpinBox, endValDoubleSpinBox, reverseCheckBox, jntCheckBox, doritoCheckBox))
 
+            self.guideFrameWidgets[guide] = {'guideParent'   : parentLineEdit,
+                                             'guideTracker'  : trackerLineEdit,
+                                             'XYZ'           : rotAxisComboBox,
+                                             'trackerMinRot' : startValDoubleSpinBox,
+                                             'trackerMaxRot' : endValDoubleSpinBox,
+                                             'trackerRev'    : reverseCheckBox,
+                                             'sliderJoint'   : jntCheckBox}
+
         if guideType == 'stretch':
             stretchHBoxLayout = QHBoxLayout()
             frame.layout().addLayout(stretchHBoxLayout)
@@ -534,8 +581,7 @@ class VolumeSystemUI(DockableWidget):
             frame.layout().addLayout(stretchSettingsHBoxLayout)
 
             twistState = cmds.getAttr('%s.twist' % (guide))
-            twistCheckBox = QCheckBox('Twist')
-            twistCheckBox.setChecked(twistState)
+            twistCheckBox = self.buildSchemaWidget('stretch', 'twist', twistState)
             stretchSettingsHBoxLayout.addWidget(twistCheckBox)
 
             stretchSettingsHBoxLayout.addItem(QSpacerItem(10, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
@@ -544,15 +590,8 @@ class VolumeSystemUI(DockableWidget):
             stretchSettingsHBoxLayout.addLayout(strDefPosHBoxLayout)
 
             strDefPos = cmds.getAttr('%s.strDefPos' % (guide))
-            strDefPosQLabel = QLabel('Str Def Pos')
-            strDefPosQLabel.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            strDefPosHBoxLayout.addWidget(strDefPosQLabel)
-            strDefPosDoubleSpinBox = QDoubleSpinBox()
-            strDefPosDoubleSpinBox.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            strDefPosDoubleSpinBox.setDecimals(1)
-            strDefPosDoubleSpinBox.setSingleStep(0.1)
-            strDefPosDoubleSpinBox.setMaximum(1.0)
-            strDefPosDoubleSpinBox.setValue(strDefPos)
+            strDefPosHBoxLayout.addWidget(self.buildSchemaLabel('stretch', 'strDefPos'))
+            strDefPosDoubleSpinBox = self.buildSchemaWidget('stretch', 'strDefPos', strDefPos)
             strDefPosHBoxLayout.addWidget(strDefPosDoubleSpinBox)
 
             stretchSettingsHBoxLayout.addItem(QSpacerItem(10, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
@@ -561,24 +600,15 @@ class VolumeSystemUI(DockableWidget):
             stretchSettingsHBoxLayout.addLayout(enableSnsHBoxLayout)
 
             enableSnsState = cmds.getAttr('%s.enableSns' % (guide))
-            enableSnsCheckBox = QCheckBox('Enable SNS')
-            enableSnsCheckBox.setChecked(enableSnsState)
+            enableSnsCheckBox = self.buildSchemaWidget('stretch', 'enableSns', enableSnsState)
             enableSnsHBoxLayout.addWidget(enableSnsCheckBox)
 
             multiplierHBoxLayout = QHBoxLayout()
             enableSnsHBoxLayout.addLayout(multiplierHBoxLayout)
 
             snsMultiplier = cmds.getAttr('%s.snsMultiplier' % (guide))
-            multiplierQLabel = QLabel('SNS Mult')
-            multiplierQLabel.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            multiplierHBoxLayout.addWidget(multiplierQLabel)
-            multiplierDoubleSpinBox = QDoubleSpinBox()
-            multiplierDoubleSpinBox.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            multiplierDoubleSpinBox.setDecimals(2)
-            multiplierDoubleSpinBox.setSingleStep(1)
-            multiplierDoubleSpinBox.setMinimum(0.01)
-            multiplierDoubleSpinBox.setMaximum(50.00)
-            multiplierDoubleSpinBox.setValue(snsMultiplier)
+            multiplierHBoxLayout.addWidget(self.buildSchemaLabel('stretch', 'snsMultiplier'))
+            multiplierDoubleSpinBox = self.buildSchemaWidget('stretch', 'snsMultiplier', snsMultiplier)
             multiplierHBoxLayout.addWidget(multiplierDoubleSpinBox)
 
             stretchSettingsHBoxLayout.addItem(QSpacerItem(10, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
@@ -587,8 +617,7 @@ class VolumeSystemUI(DockableWidget):
             stretchSettingsHBoxLayout.addLayout(miscHBoxLayout)
 
             jntCheckBoxState = cmds.getAttr('%s.stretchJoint' % (guide))
-            jntCheckBox = QCheckBox('jnt')
-            jntCheckBox.setChecked(jntCheckBoxState)
+            jntCheckBox = self.buildSchemaWidget('stretch', 'stretchJoint', jntCheckBoxState)
             miscHBoxLayout.addWidget(jntCheckBox)
 
             # doritoCheckBoxState = cmds.getAttr('%s.stretchDorito' % (guide))
@@ -603,6 +632,14 @@ class VolumeSystemUI(DockableWidget):
             jntCheckBox.clicked[bool].connect(lambda:self.commitGdeStr(guide, twistCheckBox, strDefPosDoubleSpinBox, enableSnsCheckBox, multiplierDoubleSpinBox, jntCheckBox, ))
             # doritoCheckBox.clicked[bool].connect(lambda:self.commitGdeStr(guide, twistCheckBox, strDefPosDoubleSpinBox, enableSnsCheckBox, multiplierDoubleSpinBox, jntCheckBox, doritoCheckBox))
 
+            self.guideFrameWidgets[guide] = {'startParent'   : startParentLineEdit,
+                                             'endParent'     : endParentLineEdit,
+                                             'twist'         : twistCheckBox,
+                                             'strDefPos'     : strDefPosDoubleSpinBox,
+                                             'enableSns'     : enableSnsCheckBox,
+                                             'snsMultiplier' : multiplierDoubleSpinBox,
+                                             'stretchJoint'  : jntCheckBox}
+
         return frame
 
     def callback_selectedData(self):
@@ -658,6 +695,7 @@ class VolumeSystemUI(DockableWidget):
         '''
         self.guideCollapsibleListWidgetMenu.exec_(self.guideCollapsibleListWidget.mapToGlobal(point))
 
+    @volumeProfiling.profiled()
     def refreshUI(self):
         '''
         DESCRIPTION:
@@ -670,12 +708,55 @@ class VolumeSystemUI(DockableWidget):
             except:
                 pass
 
+        self.guideFrameWidgets = {}
         self.buildGuideDict()
         guides = self.guides['all']
         self.populateGuideCollapsableListWidget(guides)
         self.guideSearchFiltersFrame.updateInputList(guides)
         self.filterGuideList(guides, self.guideSearchFiltersFrame.filterResults)
 
+    def addGuidesToUI(self, guides):
+        '''
+        DESCRIPTION:
+            Adds new guides to the UI without rebuilding existing items,
+            so their expanded state and selection are kept.
+        '''
+        newGuides = []
+        for guide in guides:
+            guideType = cmds.getAttr(guide + '.guideType')
+            if guide not in self.guides['all'] and guideType in self.guides:
+                self.guides['all'].append(guide)
+                self.guides[guideType].append(guide)
+                newGuides.append(guide)
+
+        if newGuides != []:
+            self.populateGuideCollapsableListWidget(newGuides)
+            self.guideSearchFiltersFrame.updateInputList(self.guides['all'])
+            self.filterGuideList(self.guides['all'], self.guideSearchFiltersFrame.filterResults, titles=newGuides)
+
+    def refreshGuideFrames(self, guides):
+        '''
+        DESCRIPTION:
+            Updates the settings widgets of existing guide items from the
+            scene, without rebuilding the list.
+        '''
+        for guide in guides:
+            widgets = self.guideFrameWidgets.get(guide)
+            if not widgets:
+                continue
+            for attr, widget in widgets.items():
+                value = cmds.getAttr(guide + '.' + attr)
+                widget.blockSignals(True) # Do not commit values back to the guide
+                if isinstance(widget, QLineEdit):
+                    widget.setText(value or '')
+                elif isinstance(widget, QComboBox):
+                    widget.setCurrentIndex(value)
+                elif isinstance(widget, QCheckBox):
+                    widget.setChecked(value)
+                else:
+                    widget.setValue(value)
+                widget.blockSignals(False)
+
     def initCallbacks(self):
         '''
         '''
@@ -690,7 +771,10 @@ class VolumeSystemUI(DockableWidget):
 
 
     # Create Guides / Systems
-    def createSliderGuide(self, guideName, globScl):
+    def createSliderGuide(self, guideName, globScl, settings=None):
+        '''
+        settings = ({}) Guide root attr : value, schema defaults are used for unset attrs
+        '''
         # SldGuideOrig
         sldGdeOrig = cmds.createNode('transform', n='Orig_'+guideName+'_SldGuideRoot')
         for axis in ['tx','ty','tz','rx','ry','rz','sx','sy','sz']:
@@ -698,62 +782,21 @@ class VolumeSystemUI(DockableWidget):
 
         # SldGuideRoot
         sldGdeRoot = cmds.createNode('transform', n='Hbfr_'+guideName+'_SldGuideRoot', p=sldGdeOrig)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.addAttr(ci=True, dt='string', sn='guideParent')
-        cmds.addAttr(ci=True, dt='string', sn='guideTracker')
-        cmds.addAttr(ci=True, at='float',  sn='globalScale')
-        cmds.addAttr(ci=True, at='float',  sn='trackerMinRot', min=-360, max=360)
-        cmds.addAttr(ci=True, at='float',  sn='trackerMaxRot', min=-360, max=360)
-        cmds.addAttr(ci=True, at='float',  sn='currentValRef')
-        cmds.addAttr(ci=True, at='long',   sn='XYZ', min=0, max=2)
-        cmds.addAttr(ci=True, at='bool',   sn='trackerRev', min=0, max=1)
-        cmds.addAttr(ci=True, at='bool',   sn='sliderJoint', min=0, max=1)
-        cmds.addAttr(ci=True, at='bool',   sn='sliderDorito', min=0, max=1)
-        cmds.setAttr('.XYZ', 1)
-        cmds.setAttr('.trackerMaxRot', -30.0)
-        cmds.setAttr('.guideType', 'slider', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
-        cmds.setAttr('.globalScale', globScl)
-        cmds.setAttr('.trackerRev', False)
-        cmds.setAttr('.sliderJoint', True)
-        cmds.setAttr('.sliderDorito', False)
+        values = dict(settings or {}, guideType='slider', guideName=guideName, globalScale=globScl)
+        self.applyGuideSchema([sldGdeRoot], 'slider', values, new=True)
 
         # SldGuideStart
-        sldGdeStart = cmds.curve(p=[(0.65043, 0, 0), (0.600919, 0, -0.248908), (0.248908, 0, -0.600919), (0, 0, -0.65043), (-0.248908, 0, -0.600919), (-0.459923, 0, -0.459923), (-0.600919, 0, -0.248908), (-0.65043, 0, 0), (-0.600919, 0, 0.248908), (-0.459923, 0, 0.459923), (-0.248908, 0, 0.600919), (0, 0, 0.65043), (0.248908, 0, 0.600919), (0.459923, 0, 0.459923), (0.600919, 0, 0.248908), (0.65043, 0, 0), (0.600919, 0.248908, 0), (0.459923, 0.459923, 0), (0.248908, 0.600919, 0), (0, 0.65043, 0), (-0.248908, 0.600919, 0), (-0.459923, 0.459923, 0), (-0.600919, 0.248908, 0), (-0.65043, 0, 0), (-0.600919, -0.248908, 0), (-0.459923, -0.459923, 0), (-0.248908, -0.600919, 0), (0, -0.65043, 0), (0, -0.600919, -0.248908), (0, -0.459923, -0.459923), (0, -0.248908, -0.600919), (0, 0, -0.65043), (0, 0.248908, -0.600919), (0, 0.459923, -0.459923), (0, 0.600919, -0.248908), (0, 0.65043, 0), (0, 0.600919, 0.248908), (0, 0.459923, 0.459923), (0, 0.248908, 0.600919), (0, 0, 0.65043), (0, -0.248908, 0.600919), (0, -0.459923, 0.459923), (0, -0.600919, 0.248908), (0, -0.65043, 0), (0.248908, -0.600919, 0), (0.459923, -0.459923, 0), (0.600919, -0.248908, 0), (0.65043, 0, 0), (0.600919, 0.248908, 0), (0.459923, 0.459923, 0), (0.248908, 0.600919, 0), (0, 0.65043, 0)], k=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51], d=1)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.setAttr('.guideType', 'slider', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
-        for axis in ['X','Y','Z']:
-            cmds.setAttr(sldGdeStart+'.scale'+axis, globScl)
-        cmds.makeIdentity(sldGdeStart, apply=1, s=1)# Freeze scale
-        cmds.parent(sldGdeStart, sldGdeRoot)
-        cmds.color(sldGdeStart, rgb=(0.273, 1.0, 0.0))
+        color = (0.273, 1.0, 0.0)
+        sldGdeStart = self.createGuideCurve('sliderStart', 'Ctl_'+guideName+'_SldGuideStart', sldGdeRoot, globScl, 'slider', guideName, color)
 
         # SldGuideEnd
-        sldGdeEnd = cmds.curve(p=[(-2, 0, 0), (0, 0, 0), (0, 0, 2), (0, 0, 0), (2, 0, 0), (0, 0, 0), (0, 0, -2), (0, 0, 0), (0, 2, 0), (0, 0, 0), (0, -2, 0), (0, 0, 0), (0.650566, 0, 0), (0.601045, 0, -0.248961), (0.46002, 0, -0.46002), (0.248961, 0, -0.601045), (0, 0, -0.650566), (-0.248961, 0, -0.601045), (-0.46002, 0, -0.46002), (-0.601045, 0, -0.248961), (-0.650566, 0, 0), (-0.601045, 0, 0.248961), (-0.46002, 0, 0.46002), (-0.248961, 0, 0.601045), (0, 0, 0.650566), (0.248961, 0, 0.601045), (0.46002, 0, 0.46002), (0.601045, 0, 0.248961), (0.650566, 0, 0), (0.601045, 0.248961, 0), (0.46002, 0.46002, 0), (0.248961, 0.601045, 0), (0, 0.650566, 0), (-0.248961, 0.601045, 0), (-0.46002, 0.46002, 0), (-0.601045, 0.248961, 0), (-0.650566, 0, 0), (-0.601045, -0.248961, 0), (-0.46002, -0.46002, 0), (-0.248961, -0.601045, 0), (0, -0.650566, 0), (0, -0.601045, -0.248961), (0, -0.46002, -0.46002), (0, -0.248961, -0.601045), (0, 0, -0.650566), (0, 0.248961, -0.601045), (0, 0.46002, -0.46002), (0, 0.601045, -0.248961), (0, 0.650566, 0), (0, 0.601045, 0.248961), (0, 0.46002, 0.46002), (0, 0.248961, 0.601045), (0, 0, 0.650566), (0, -0.248961, 0.601045), (0, -0.46002, 0.46002), (0, -0.601045, 0.248961), (0, -0.650566, 0), (0.248961, -0.601045, 0), (0.46002, -0.46002, 0), (0.601045, -0.248961, 0), (0.650566, 0, 0), (0.601045, 0.248961, 0), (0.46002, 0.46002, 0), (0.248961, 0.601045, 0), (0, 0.650566, 0)], k=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63, 64], d=1)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.setAttr('.guideType', 'slider', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
-        for axis in ['X','Y','Z']:
-            cmds.setAttr(sldGdeEnd+'.scale'+axis, (globScl*0.5))
-        cmds.makeIdentity(sldGdeEnd, apply=1, s=1)# Freeze scale
-        cmds.move((4*globScl), sldGdeEnd, z=True)
-        cmds.parent(sldGdeEnd, sldGdeStart)
-        cmds.color(sldGdeEnd, rgb=(0.273, 1.0, 0.0))
+        sldGdeEnd = self.createGuideCurve('sliderEnd', 'Ctl_'+guideName+'_SldGuideEnd', sldGdeStart, globScl*0.5, 'slider', guideName, color)
+        cmds.setAttr(sldGdeEnd+'.translateZ', 4*globScl)
 
         # SldGuidePath
-        sldGdePth = cmds.curve(p=[(0, 0, 1), (0, 0, 0)], k=[0, 1], d=1)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.setAttr('.guideType', 'slider', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
+        sldGdePth = self.createGuideCurve('guidePath', 'Rig_'+guideName+'_SldGuidePath', sldGdeOrig, 1.0, 'slider', guideName, color)
         for axis in ['tx','ty','tz','rx','ry','rz','sx','sy','sz']:
             cmds.setAttr(sldGdePth+'.'+axis, l=True)
-        cmds.color(sldGdePth, rgb=(0.273, 1.0, 0.0))
-        cmds.parent(sldGdePth, sldGdeOrig)
         sldGdeEndDecomp = cmds.createNode('decomposeMatrix', n=sldGdeEnd+'_decompMat')
         sldGdeStartDecomp = cmds.createNode('decomposeMatrix', n=sldGdeStart+'_decompMat')
         cmds.connectAttr(sldGdeEnd+'.worldMatrix[0]', sldGdeEndDecomp+'.inputMatrix')
@@ -774,16 +817,14 @@ class VolumeSystemUI(DockableWidget):
         cmds.setAttr(angConv+'.conversionFactor', 57.2957795131)
         cmds.connectAttr(angConv+'.output', sldGdeRoot+'.currentValRef')
 
-        # Rename nodes
-        cmds.rename(sldGdePth, 'Rig_'+guideName+'_SldGuidePath')# Shape node not named correctly when specifying name at creation
-        gdeStart = cmds.rename(sldGdeStart, 'Ctl_'+guideName+'_SldGuideStart')
-        gdeEnd = cmds.rename(sldGdeEnd, 'Ctl_'+guideName+'_SldGuideEnd')
-
         cmds.parent(angRoot, sldGdeOrig)
 
-        return sldGdeRoot, gdeStart, gdeEnd
+        return sldGdeRoot, sldGdeStart, sldGdeEnd
 
-    def createStretchGuide(self, guideName, globScl):
+    def createStretchGuide(self, guideName, globScl, settings=None):
+        '''
+        settings = ({}) Guide root attr : value, schema defaults are used for unset attrs
+        '''
         ### StrGuideOrig
         strGdeOrig = cmds.createNode('transform', n='Orig_'+guideName+'_StrGuideRoot')
         for axis in ['tx','ty','tz','rx','ry','rz','sx','sy','sz']:
@@ -794,73 +835,436 @@ class VolumeSystemUI(DockableWidget):
         strGdeRoot = cmds.createNode('transform', n='Hbfr_'+guideName+'_StrGuideRoot')
         cmds.color(strGdeRoot, rgb=(0.0, 1.0, 1.0))
         cmds.parent(strGdeRoot, strGdeOrig)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.addAttr(ci=True, dt='string', sn='startParent')
-        cmds.addAttr(ci=True, dt='string', sn='endParent')
-        cmds.addAttr(ci=True, at='float',  sn='globalScale')
-        cmds.addAttr(ci=True, at='bool',   sn='enableSns', min=0, max=1)
-        cmds.addAttr(ci=True, at='double', sn='snsMultiplier')
-        cmds.addAttr(ci=True, at='bool',   sn='twist', min=0, max=1)
-        cmds.addAttr(ci=True, at='bool',   sn='stretchJoint', min=0, max=1)
-        cmds.addAttr(ci=True, at='bool',   sn='stretchDorito', min=0, max=1)
-        cmds.addAttr(ci=True, at='float',  sn='strDefPos', min=0, max=1)
-        cmds.setAttr('.guideType', 'stretch', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
-        cmds.setAttr('.globalScale', globScl)
-        cmds.setAttr('.snsMultiplier', 1.0, k=True)
-        cmds.setAttr('.twist', False)
-        cmds.setAttr('.stretchJoint', True)
-        cmds.setAttr('.stretchDorito', False)
-        cmds.setAttr('.strDefPos', 0.5)
+        values = dict(settings or {}, guideType='stretch', guideName=guideName, globalScale=globScl)
+        self.applyGuideSchema([strGdeRoot], 'stretch', values, new=True)
 
         ### StrGuideStart
-        strGdeStart = cmds.curve(p=[(0, 0, 0.81), (0.309973, 0, 0.748343), (0.572757, 0, 0.572757), (0.748343, 0, 0.309973), (0.81, 0, 0), (0.748343, 0, -0.309973), (0.572757, 0, -0.572757), (0.309973, 0, -0.748343), (0, 0, -0.81), (-0.309973, 0, -0.748343), (-0.572757, 0, -0.572757), (-0.748343, 0, -0.309973), (-0.81, 0, 0), (-0.748343, 0, 0.309973), (-0.572757, 0, 0.572757), (-0.309973, 0, 0.748343), (0, 0, 0.81), (0, 0.309973, 0.748343), (0, 0.572757, 0.572757), (0, 0.748343, 0.309973), (0, 0.81, 0), (0.309973, 0.748343, 0), (0.572757, 0.572757, 0), (0.748343, 0.309973, 0), (0.81, 0, 0), (0.748343, -0.309973, 0), (0.572757, -0.572757, 0), (0.309973, -0.748343, 0), (0, -0.81, 0), (-0.309973, -0.748343, 0), (-0.572757, -0.572757, 0), (-0.748343, -0.309973, 0), (-0.81, 0, 0), (-0.748343, 0.309973, 0), (-0.572757, 0.572757, 0), (-0.309973, 0.748343, 0), (0, 0.81, 0), (0, 0.748343, -0.309973), (0, 0.572757, -0.572757), (0, 0.309973, -0.748343), (0, 0, -0.81), (0, -0.309973, -0.748343), (0, -0.572757, -0.572757), (0, -0.748343, -0.309973), (0, -0.81, 0), (0, -0.748343, 0.309973), (0, -0.572757, 0.572757), (0, -0.309973, 0.748343), (0, 0, 0.81)], k=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48], d=1)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.setAttr('.guideType', 'stretch', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
-        for axis in ['X','Y','Z']:
-            cmds.setAttr(strGdeStart+'.scale'+axis, globScl)
-        cmds.makeIdentity(strGdeStart, apply=1, s=1)# Freeze scale
-        cmds.parent(strGdeStart, strGdeRoot)
-        cmds.color(strGdeStart, rgb=(0.0, 1.0, 1.0))
+        color = (0.0, 1.0, 1.0)
+        strGdeStart = self.createGuideCurve('stretchStart', 'Ctl_'+guideName+'_StrGuideStart', strGdeRoot, globScl, 'stretch', guideName, color)
 
         ### StrGuideEnd
-        strGdeEnd = cmds.curve(p=[(0, 0, 0.696254), (0.266445, 0, 0.643255), (0.492326, 0, 0.492326), (0.643255, 0, 0.266445), (0.696254, 0, 0), (0.643255, 0, -0.266445), (0.492326, 0, -0.492326), (0.266445, 0, -0.643255), (0, 0, -0.696254), (-0.266445, 0, -0.643255), (-0.492326, 0, -0.492326), (-0.643255, 0, -0.266445), (-0.696254, 0, 0), (-0.643255, 0, 0.266445), (-0.492326, 0, 0.492326), (-0.266445, 0, 0.643255), (0, 0, 0.696254), (0, 0.266445, 0.643255), (0, 0.492326, 0.492326), (0, 0.643255, 0.266445), (0, 0.696254, 0), (0.266445, 0.643255, 0), (0.492326, 0.492326, 0), (0.643255, 0.266445, 0), (0.696254, 0, 0), (0.643255, -0.266445, 0), (0.492326, -0.492326, 0), (0.266445, -0.643255, 0), (0, -0.696254, 0), (-0.266445, -0.643255, 0), (-0.492326, -0.492326, 0), (-0.643255, -0.266445, 0), (-0.696254, 0, 0), (-0.643255, 0.266445, 0), (-0.492326, 0.492326, 0), (-0.266445, 0.643255, 0), (0, 0.696254, 0), (0, 0.643255, -0.266445), (0, 0.492326, -0.492326), (0, 0.266445, -0.643255), (0, 0, -0.696254), (0, -0.266445, -0.643255), (0, -0.492326, -0.492326), (0, -0.643255, -0.266445), (0, -0.696254, 0), (0, -0.643255, 0.266445), (0, -0.492326, 0.492326), (0, -0.266445, 0.643255), (0, 0, 0.696254), (0, 0, 2), (0, 0, -2), (0, 0, 0), (0, 2, 0), (0, -2, 0), (0, 0, 0), (-2, 0, 0), (2, 0, 0)], k=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56], d=1)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.setAttr('.guideType', 'stretch', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
-        for axis in ['X','Y','Z']:
-            cmds.setAttr(strGdeEnd+'.scale'+axis, (globScl*0.5))
-        cmds.makeIdentity(strGdeEnd, apply=1, s=1)# Freeze scale
-        cmds.parent(strGdeEnd, strGdeRoot)
-        cmds.color(strGdeEnd, rgb=(0.0, 1.0, 1.0))
+        strGdeEnd = self.createGuideCurve('stretchEnd', 'Ctl_'+guideName+'_StrGuideEnd', strGdeRoot, globScl*0.5, 'stretch', guideName, color)
 
         ### Move Neg
-        cmds.move((4*globScl), strGdeEnd, z=True)
+        cmds.setAttr(strGdeEnd+'.translateZ', 4*globScl)
 
         ### StrGuidePath
-        strGdePth = cmds.curve(p=[(0, 0, 1), (0, 0, 0)], k=[0, 1], d=1)
-        cmds.addAttr(ci=True, dt='string', sn='guideType')
-        cmds.addAttr(ci=True, dt='string', sn='guideName')
-        cmds.setAttr('.guideType', 'stretch', type='string', l=True)
-        cmds.setAttr('.guideName', guideName, type='string', l=True)
+        strGdePth = self.createGuideCurve('guidePath', 'Rig_'+guideName+'_StrGuidePath', strGdeRoot, 1.0, 'stretch', guideName, color)
         for axis in ['tx','ty','tz','rx','ry','rz','sx','sy','sz']:
             cmds.setAttr(strGdePth+'.'+axis, l=True)
-        cmds.color(strGdePth, rgb=(0.0, 1.0, 1.0))
-        cmds.parent(strGdePth, strGdeRoot)
         cmds.connectAttr(strGdeStart+'.translate', strGdePth+'.controlPoints[0]')
         cmds.connectAttr(strGdeEnd+'.translate', strGdePth+'.controlPoints[1]')
 
-        ## Rename nodes
-        cmds.rename(strGdePth, 'Rig_'+guideName+'_StrGuidePath')
-        gdeEnd = cmds.rename(strGdeEnd, 'Ctl_'+guideName+'_StrGuideEnd')
-        gdeStart = cmds.rename(strGdeStart, 'Ctl_'+guideName+'_StrGuideStart')
+        return strGdeRoot, strGdeStart, strGdeEnd
+
+    def getGuideCurveData(self, shape, scale=1.0):
+        '''
+        Returns cached points, knots and degree of a guide shape, as cmds.curve flags.
+        Points are scaled here, so created curves need no scale freeze.
+
+        shape = (str) guideShapes shape name
+        scale = (float) Uniform scale of the shape
+        '''
+        key = (shape, round(scale, 6))
+        data = self.guideCurveCache.get(key)
+        if data is None:
+            points, knots, degree = guideShapes.getShape(shape, scale)
+            data = ([tuple(point) for point in points.tolist()], list(knots), degree)
+            self.guideCurveCache[key] = data
+        return data
+
+    def createGuideCurve(self, shape, name, parent, scale, guideType, guideName, color):
+        '''
+        Creates guide control curve from cached shape data, returns control name
+
+        shape     = (str) guideShapes shape name
+        name      = (str) Control name, shape node is named name+'Shape'
+        parent    = (str) Parent transform
+        scale     = (float) Uniform scale of the shape
+        guideType = (str) 'slider' or 'stretch'
+        guideName = (str) Name of the guide
+        color     = ((r,g,b)) Wireframe color
+        '''
+        points, knots, degree = self.getGuideCurveData(shape, scale)
+        ctl = cmds.curve(p=points, k=knots, d=degree, n=name)# Shape is named name+'Shape'
+        ctl = cmds.parent(ctl, parent, r=True)[0]
+
+        self.applyGuideSchema([ctl], 'control', {'guideType':guideType, 'guideName':guideName}, new=True)
+        cmds.color(ctl, rgb=color)
+
+        return ctl
+
+    def schemaAttributeFlags(self, attr, default=None):
+        '''
+        Returns cmds.addAttr flags of a guideSchema.GuideAttr
+
+        default = Numeric value the attribute is created with, dv flag
+        '''
+        if attr.type == 'string':
+            flags = {'ln':attr.name, 'dt':'string'}
+        else:
+            flags = {'ln':attr.name, 'at':attr.type}
+            if attr.min is not None:
+                flags['min'] = attr.min
+            if attr.max is not None:
+                flags['max'] = attr.max
+            if default is not None:
+                flags['dv'] = default
+        flags['k'] = attr.keyable
+        return flags
+
+    def applyGuideSchema(self, nodes, schema, values=None, new=False):
+        '''
+        Adds missing schema attributes to guide nodes and sets their values.
+        Writes go through cmds so guide creation is undoable, which costs more
+        calls than one OpenMaya modifier batch. To keep them few, numeric values
+        of added attributes are passed as the addAttr default, only strings are
+        set, and locking is done in the same setAttr call. Schema defaults are
+        only set on attributes that were added, so applying the schema to an
+        existing guide keeps its settings.
+
+        nodes  = ([str]) Guide nodes
+        schema = (str) 'slider', 'stretch' or 'control'
+        values = ({} or [{}]) attr : value, for all nodes or one dict per node. None values are skipped.
+        new    = (bol) Nodes were just created and have no schema attributes, skips the listAttr query
+        '''
+        attrs = guideSchema.getSchema(schema)
+        defaults = guideSchema.defaults(schema)
+        if values is None or isinstance(values, dict):
+            values = [values or {}] * len(nodes)
+
+        for node, nodeValues in zip(nodes, values):
+            existing = set() if new else set(cmds.listAttr(node, ud=True) or [])
+            for attr in attrs:
+                added = attr.name not in existing
+                if attr.name == 'schemaVersion':# Always current once the schema is applied
+                    value = guideSchema.SCHEMA_VERSION
+                elif attr.name in nodeValues:
+                    value = attr.cast(nodeValues[attr.name])
+                elif added:
+                    value = defaults.get(attr.name)
+                else:
+                    value = None
+
+                plug = node+'.'+attr.name
+                if added:
+                    numeric = attr.type != 'string'
+                    cmds.addAttr(node, **self.schemaAttributeFlags(attr, value if numeric else None))
+                    if numeric or value is None:
+                        if attr.lock:
+                            cmds.setAttr(plug, l=True)
+                        continue
+                elif value is None:
+                    continue
+                elif attr.lock:
+                    cmds.setAttr(plug, l=False)
+
+                flags = {'type':'string'} if attr.type == 'string' else {}
+                if attr.lock:
+                    flags['l'] = True
+                cmds.setAttr(plug, value, **flags)
+
+    def buildSchemaWidget(self, schema, attrName, value):
+        '''
+        Returns guide frame widget for a schema attribute, set to value.
+        Widget type, label and range come from the attributes ui hints.
+
+        schema   = (str) 'slider' or 'stretch'
+        attrName = (str) Attribute name
+        value    = Current attribute value
+        '''
+        ui = guideSchema.getAttr(schema, attrName).ui
+        if ui['widget'] == 'check':
+            widget = QCheckBox(ui['label'])
+            widget.setChecked(value)
+        elif ui['widget'] == 'combo':
+            widget = QComboBox()
+            for item in ui['items']:
+                widget.addItem(item)
+            widget.setCurrentIndex(value)
+        else:
+            widget = QDoubleSpinBox()
+            widget.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
+            widget.setDecimals(ui['decimals'])
+            widget.setSingleStep(ui['step'])
+            widget.setMinimum(ui['min'])
+            widget.setMaximum(ui['max'])
+            widget.setValue(value)
+        return widget
+
+    def buildSchemaLabel(self, schema, attrName):
+        '''
+        Returns centered QLabel with the schema label of an attribute
+        '''
+        label = QLabel(guideSchema.getAttr(schema, attrName).ui['label'])
+        label.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
+        return label
+
+    def loadGuideShapeLibrary(self, path=None):
+        '''
+        Loads guide shapes from a json shape library, see guideShapes.loadShapeLibrary()
+
+        path = (str) json file path, file dialog if None
+        '''
+        if path is None:
+            loadPath = cmds.fileDialog2(fm=1, okc="Load", fileFilter='*.json')
+            if not loadPath:
+                return []
+            path = loadPath[0]
+
+        names = guideShapes.loadShapeLibrary(path)
+        self.guideCurveCache.clear()
+        buildLog.info('Loaded guide shapes: %s', ', '.join(names))
+        return names
+
+    def generateGuides(self, joints=None, rules=None, guideType='slider', globScl=1.0):
+        '''
+        Creates guides for a list of joints, see guideGenerator.
+        Parents and trackers are filled in from the joint hierarchy,
+        which is read in one pass, and all guides are placed with one
+        transform write.
+
+        joints    = ([str]) Joints, selected joints if None. All joints in the scene if None and rules are given
+        rules     = ([GuideRule]) Rule table, one guide of guideType per joint if None
+        guideType = (str) 'slider' or 'stretch', used when no rules are given
+        globScl   = (float) Size of the guides
+
+        Returns (created guide roots, skipped [(joint, guideName, reason)])
+        '''
+        if joints is None:
+            joints = cmds.ls(sl=True, type='joint') if rules is None else cmds.ls(type='joint')
+        if not joints:
+            raise IndexError('Select joints to generate guides for')
+        if rules is None:
+            rules = [guideGenerator.GuideRule('.*', guideType)]
+
+        parents, children = self.getJointHierarchyOM(joints)
+        nodes = list(set(joints) | set(n for n in list(parents.values()) + list(children.values()) if n))
+        matrices = dict(zip(nodes, self.getTransformsOM(nodes)))
+
+        existing = [(g, cmds.getAttr(r+'.guideName')) for g, pattern in [('slider', 'Hbfr_*_SldGuideRoot'), ('stretch', 'Hbfr_*_StrGuideRoot')]
+                    for r in cmds.ls(pattern, type='transform')]
+        specs, skipped = guideGenerator.planGuides(joints, parents, children, matrices, rules, existing)
+
+        if not cmds.objExists('volumeGuides'):
+            cmds.createNode('transform', n='volumeGuides')
+
+        roots = []
+        origs = []
+        targets = []
+        targetMatrices = []
+        for spec in specs:
+            if spec['guideType'] == 'slider':
+                newGde = self.createSliderGuide(spec['guideName'], globScl, spec['settings'])
+                targets.append(newGde[0])
+                targetMatrices.append(spec['matrices']['root'])
+            else:
+                newGde = self.createStretchGuide(spec['guideName'], globScl, spec['settings'])
+                targets += [newGde[1], newGde[2]]
+                targetMatrices += [spec['matrices']['start'], spec['matrices']['end']]
+            roots.append(newGde[0])
+            origs.append(newGde[0].replace('Hbfr_', 'Orig_'))
+
+        if roots:
+            cmds.parent(origs, 'volumeGuides')
+            self.setTransformsFromMatrices(np.array(targetMatrices), targets)
+
+            # Trackers are constrained once the guides are placed
+            for root, spec in zip(roots, specs):
+                if spec['guideType'] == 'slider':
+                    self.constrainSldTracker(guide=root, sldTrk=spec['settings']['guideTracker'])
+
+        with buildLog.buffered():
+            buildLog.info('Generated %s guide(s) from %s joint(s)', len(roots), len(joints))
+            for joint, guideName, reason in skipped:
+                buildLog.warning('SKIPPED  %s (%s): %s', guideName, joint, reason)
+
+        cmds.select(None)
+        self.refreshUI()
+
+        return roots, skipped
+
+    def generateGuidesFromRules(self, path=None, joints=None, globScl=1.0):
+        '''
+        Creates guides from a json rule table, see guideGenerator.loadRules()
+
+        path   = (str) json file path, file dialog if None
+        joints = ([str]) Joints, all joints in the scene if None
+        '''
+        if path is None:
+            loadPath = cmds.fileDialog2(fm=1, okc="Load", fileFilter='*.json')
+            if not loadPath:
+                return [], []
+            path = loadPath[0]
+
+        return self.generateGuides(joints=joints, rules=guideGenerator.loadRules(path), globScl=globScl)
+
+    def suggestGuideJoints(self, guides=None, apply=False, skipAmbiguous=True, ratio=0.8):
+        '''
+        Suggests guideParent / guideTracker and startParent / endParent from the
+        nearest joints to the guides start and end, see jointIndex.
+        The skeleton is read once, and all guides are queried in one batch.
+
+        guides        = ([]) Guide roots, selected guides or all guides if None
+        apply         = (bol) Set the suggestions on the guides, only report them if False
+        skipAmbiguous = (bol) Do not apply ambiguous suggestions
+        ratio         = (float) Ambiguity ratio, see jointIndex.JointIndex
+
+        Returns (suggestions, ambiguous)
+        '''
+        if guides is None:
+            guides = self.getGuideRoot(select=False) or None
+        records = self.getGuideRecords(guides)
+
+        joints = cmds.ls(type='joint')
+        if not joints:
+            raise IndexError('No joints in the scene')
+        parents, children = self.getJointHierarchyOM(joints)
+        index = jointIndex.JointIndex(joints, parents, self.getTransformsOM(joints), ratio=ratio)
+
+        points = dict((guide, {'guideType' : record['guideType'],
+                               'start'     : record['matrices'][0][3, :3],
+                               'end'       : record['matrices'][1][3, :3]}) for guide, record in records.items())
+        suggestions, ambiguous = index.suggest(points)
+        buildLog.info(index.report(suggestions, ambiguous))
 
-        return strGdeRoot, gdeStart, gdeEnd
+        if apply:
+            skip = set((guide, attr) for guide, attr, candidates in ambiguous) if skipAmbiguous else set()
+            for guide, attrs in suggestions.items():
+                if (guide, 'guideTracker') in skip:# Parent follows the tracker
+                    skip.add((guide, 'guideParent'))
+                settings = dict((attr, joint) for attr, joint in attrs.items() if (guide, attr) not in skip)
 
+                tracker = settings.pop('guideTracker', None)
+                self.applyGuideSettings(guide, settings)
+                if tracker and tracker != cmds.getAttr(guide+'.guideTracker'):
+                    self.constrainSldTracker(guide=guide, sldTrk=tracker)
+
+            self.refreshGuideFrames(list(suggestions))
+
+        return suggestions, ambiguous
+
+    def calibrateSliderGuides(self, guides=None, start=None, end=None, step=1.0, axis=None, apply=True,
+                              low=trackerCalibration.LOW_PERCENTILE, high=trackerCalibration.HIGH_PERCENTILE,
+                              minConfidence=trackerCalibration.MIN_CONFIDENCE):
+        '''
+        Sets trackerMinRot / trackerMaxRot of slider guides from their tracker's
+        twist over a frame range, detects XYZ and suggests trackerRev, see trackerCalibration.
+        All trackers are sampled in one pass over DG contexts, current time is not changed.
+
+        guides        = ([]) Slider guide roots, selected guides or all guides if None
+        start, end    = (float) Frame range, playback range if None
+        step          = (float) Frame step
+        axis          = (str) Twist axis for all guides, detected per guide if None
+        apply         = (bol) Set the results on the guides, only report them if False
+        low, high     = (float) Percentiles used for the range
+        minConfidence = (float) Detected axes below it are not applied, the guide keeps its XYZ
+
+        Returns {guide key : calibration}
+        '''
+        if guides is None:
+            guides = self.getGuideRoot(select=False) or cmds.ls('Hbfr_*_SldGuideRoot', type='transform')
+        guides = [guide for guide in guides if cmds.getAttr(guide+'.guideType') == 'slider']
+
+        trackers = {}
+        for guide in guides:
+            tracker = cmds.getAttr(guide+'.guideTracker')
+            if tracker and cmds.objExists(tracker):
+                trackers[guide] = tracker
+            else:
+                cmds.warning('%s has no tracker, skipped' % guide)
+        if trackers == {}:
+            return {}
+
+        if start is None:
+            start = cmds.playbackOptions(q=True, min=True)
+        if end is None:
+            end = cmds.playbackOptions(q=True, max=True)
+        frames = np.arange(start, end + step * 0.5, step)
+
+        nodes = sorted(set(trackers.values()))
+        samples = self.sampleMatricesOM(nodes, frames) # (F, N, 4, 4)
+
+        results = {}
+        guideKeys = {}
+        for guide, tracker in trackers.items():
+            guideName = cmds.getAttr(guide+'.guideName')
+            restMatrix = self.getTrackerRestMatrix('angBet_'+guideName+'_gdeRoot', tracker)
+            key = guideName+'_slider'
+            guideAxis = 'xyz'[cmds.getAttr(guide+'.XYZ')]
+            results[key] = trackerCalibration.calibrateTracker(samples[:, nodes.index(tracker)], restMatrix, axis, low, high,
+                                                               minConfidence, fallbackAxis=guideAxis)
+            guideKeys[key] = guide
+
+        pairs = [(key, self.convertRLName(key, side_format=1)) for key in results]
+        trackerCalibration.suggestReversal(results, pairs)
+        with buildLog.buffered():
+            buildLog.info('Sampled %s frame(s), %s..%s', len(frames), start, end)
+            buildLog.info(trackerCalibration.report(results))
+
+        if apply:
+            cmds.undoInfo(openChunk=True, chunkName='calibrateSliderGuides')
+            try:
+                for key, result in results.items():
+                    if result['static']:
+                        continue
+                    guide = guideKeys[key]
+                    settings = {'trackerMinRot':result['minRot'], 'trackerMaxRot':result['maxRot']}
+                    if 'trackerRev' in result:
+                        settings['trackerRev'] = result['trackerRev']
+                    self.applyGuideSettings(guide, settings)
+                    if result['XYZ'] != cmds.getAttr(guide+'.XYZ'):
+                        cmds.setAttr(guide+'.XYZ', result['XYZ'])
+                        self.setGuideTrackerAxis(guide, result['axis'])
+            finally:
+                cmds.undoInfo(closeChunk=True)
+            self.refreshGuideFrames(list(guideKeys.values()))
+
+        return results
+
+    def sampleMatricesOM(self, nodes, frames, attr='matrix'):
+        '''
+        Returns (F, N, 4, 4) matrices of a matrix attr of nodes at frames,
+        evaluated in DG contexts, so current time does not change.
+
+        nodes  = ([str]) Nodes
+        frames = ([float]) Frames, in the current time unit
+        attr   = (str) Matrix attr, local 'matrix' or 'worldMatrix'
+        '''
+        selList = om2.MSelectionList()
+        for node in nodes:
+            selList.add(node)
+        plugs = []
+        for i in range(len(nodes)):
+            plug = om2.MFnDependencyNode(selList.getDependNode(i)).findPlug(attr, False)
+            plugs.append(plug.elementByLogicalIndex(0) if plug.isArray else plug)
+
+        unit = om2.MTime.uiUnit()
+        matrices = np.empty((len(frames), len(nodes), 4, 4))
+        for f, frame in enumerate(frames):
+            context = om2.MDGContext(om2.MTime(float(frame), unit))
+            if hasattr(om2, 'MDGContextGuard'):# Maya 2022+, context arguments are deprecated
+                with om2.MDGContextGuard(context):
+                    values = [plug.asMObject() for plug in plugs]
+            else:
+                values = [plug.asMObject(context) for plug in plugs]
+            for n, value in enumerate(values):
+                matrices[f, n] = np.reshape(list(om2.MFnMatrixData(value).matrix()), (4, 4))
+        return matrices
+
+    def getTrackerRestMatrix(self, angRoot, tracker=None):
+        '''
+        Returns the tracker local matrix a twist setup measures from, the offset of
+        the angBet_* parent constraint. The current tracker matrix if there is none.
+        '''
+        if cmds.objExists(angRoot):
+            decomp = cmds.listConnections(angRoot+'.translateX', s=True, d=False, type='decomposeMatrix')
+            if decomp:
+                multMat = cmds.listConnections(decomp[0]+'.inputMatrix', s=True, d=False)[0]
+                return cmds.getAttr(multMat+'.matrixIn[0]')
+        return cmds.getAttr(tracker+'.matrix')
+
+    @volumeProfiling.profiled()
     def buildFromGuide(self, globScl=1.0, visCrv=None, guideList=None):
         '''
         Builds either selected guides or list of guides
@@ -868,6 +1272,9 @@ class VolumeSystemUI(DockableWidget):
         globScl    = (float) Size of def's and ctrls
         visCrv     = (bol) Create curve for viewport
         guideList  = ([]) Supplied list of guides to build (mGear post script)
+
+        Messages are written once the build is done, see buildLog. With
+        buildLog.timing on, a table of stage times is added.
         '''
         '''
         sliderGuidesDict = None
@@ -890,20 +1297,45 @@ class VolumeSystemUI(DockableWidget):
                         if not hbfr[0] in guideList:
                             guideList.append(hbfr[0])
 
+        with buildLog.buffered():
+            buildLog.resetTimes()
+            with buildLog.stage('build'):
+                self.buildGuideList(guideList, globScl, visCrv)
+
+            buildLog.info('Built %s slider(s), %s stretch(es)', len(self.sliderParDict or {}), len(self.stretchParDict or {}))
+            if buildLog.timing:
+                buildLog.info(buildLog.summary(total='build'))
+
+    def buildFromGuideTimed(self, **kwargs):
+        '''
+        buildFromGuide() with the stage times table, timing is restored after
+        '''
+        timing = buildLog.timing
+        buildLog.timing = True
+        try:
+            self.buildFromGuide(**kwargs)
+        finally:
+            buildLog.timing = timing
+
+    def buildGuideList(self, guideList, globScl, visCrv):
+        '''
+        Builds guides of buildFromGuide(), timed per stage
+        '''
         if guideList != []:
             sliderGuidesDict = {}
             stretchGuidesDict = {}
 
-            for hbfr in guideList:
-                guideName = cmds.getAttr(hbfr+'.guideName')
-                guideType = cmds.getAttr(hbfr+'.guideType')
+            with buildLog.stage('validate'):
+                for hbfr in guideList:
+                    guideName = cmds.getAttr(hbfr+'.guideName')
+                    guideType = cmds.getAttr(hbfr+'.guideType')
 
-                if guideType == 'slider':
-                    if self.sliderBuildCheck(hbfr) == True:
-                        sliderGuidesDict.update({hbfr : guideName})
-                if guideType == 'stretch':
-                    if self.stretchBuildCheck(hbfr) == True:
-                        stretchGuidesDict.update({hbfr : guideName})
+                    if guideType == 'slider':
+                        if self.sliderBuildCheck(hbfr) == True:
+                            sliderGuidesDict.update({hbfr : guideName})
+                    if guideType == 'stretch':
+                        if self.stretchBuildCheck(hbfr) == True:
+                            stretchGuidesDict.update({hbfr : guideName})
 
             if cmds.objExists('volumeSystems') == False:
                 cmds.createNode('transform', n='volumeSystems')
@@ -921,39 +1353,36 @@ class VolumeSystemUI(DockableWidget):
                 self.buildStretch(hbfr, guideName, globScl, visCrv)
 
         # Post parenting of systems
-        # for k,v in self.sliderParDict.iteritems():
-        for k,v in self.sliderParDict.items():
-            # sldName  = ['slider', sldPar]
-            if v[0] == 'slider':
-                if cmds.objExists(k+'_sliderStartPos') and cmds.objExists(v[1]):
-                    self.parentConstraint(v[1], k+'_sliderStartPos', mo=True)
-                    self.parentConstraint(v[1], k+'_sliderEndPos', mo=True)
-        # for k,v in self.stretchParDict.iteritems():
-        for k,v in self.stretchParDict.items():
-            # strName = ['stretch', startPar, endPar]
-            if v[0] == 'stretch':
-                if cmds.objExists(k+'_stretchStartPos') and cmds.objExists(v[1]):
-                    self.parentConstraint(v[1], k+'_stretchStartPos', mo=True)
-                if cmds.objExists(k+'_stretchStartPos') and cmds.objExists(v[2]):
-                    self.parentConstraint(v[2], k+'_stretchEndPos', mo=True)
-
-        self.globalScaleConn()
+        with buildLog.stage('constrain'):
+            # for k,v in self.sliderParDict.iteritems():
+            for k,v in self.sliderParDict.items():
+                # sldName  = ['slider', sldPar]
+                if v[0] == 'slider':
+                    if cmds.objExists(k+'_sliderStartPos') and cmds.objExists(v[1]):
+                        self.parentConstraint(v[1], k+'_sliderStartPos', mo=True)
+                        self.parentConstraint(v[1], k+'_sliderEndPos', mo=True)
+            # for k,v in self.stretchParDict.iteritems():
+            for k,v in self.stretchParDict.items():
+                # strName = ['stretch', startPar, endPar]
+                if v[0] == 'stretch':
+                    if cmds.objExists(k+'_stretchStartPos') and cmds.objExists(v[1]):
+                        self.parentConstraint(v[1], k+'_stretchStartPos', mo=True)
+                    if cmds.objExists(k+'_stretchStartPos') and cmds.objExists(v[2]):
+                        self.parentConstraint(v[2], k+'_stretchEndPos', mo=True)
+
+        with buildLog.stage('global scale'):
+            self.globalScaleConn()
         self.hideGuides()
-        print('***** Done *****')
 
     def sliderBuildCheck(self, hbfr):
         '''
         Check that slider guide has parent and tracker before building
         '''
         if cmds.getAttr(hbfr+'.guideParent') == None or cmds.getAttr(hbfr+'.guideTracker') == None:
-            print('_'*80)
-            print(hbfr, 'Slider not setup properly, check guide settings. Skipping guide')
-            print('_'*80)
+            buildLog.warning('%s Slider not setup properly, check guide settings. Skipping guide', hbfr)
             return False
         if not cmds.objExists(cmds.getAttr(hbfr+'.guideParent')) or not cmds.objExists(cmds.getAttr(hbfr+'.guideTracker')):
-            print('_'*80)
-            print(hbfr, 'Slider parent or tracker object does not exists. Skipping guide')
-            print('_'*80)
+            buildLog.warning('%s Slider parent or tracker object does not exists. Skipping guide', hbfr)
             return False
         else:
             return True
@@ -963,14 +1392,10 @@ class VolumeSystemUI(DockableWidget):
         Check that stretch has start parent and end parent before building
         '''
         if cmds.getAttr(hbfr+'.startParent') == None or cmds.getAttr(hbfr+'.endParent') == None:
-            print('_'*80)
-            print(hbfr, 'Stretch not setup properly, check guide settings. Skipping guide')
-            print('_'*80)
+            buildLog.warning('%s Stretch not setup properly, check guide settings. Skipping guide', hbfr)
             return False
         if not cmds.objExists(cmds.getAttr(hbfr+'.startParent')) or not cmds.objExists(cmds.getAttr(hbfr+'.endParent')):
-            print('_'*80)
-            print(hbfr, 'Stretch start parent, or end parent object does not exists. Skipping guide')
-            print('_'*80)
+            buildLog.warning('%s Stretch start parent, or end parent object does not exists. Skipping guide', hbfr)
             return False
         else:
             return True
@@ -1005,16 +1430,18 @@ class VolumeSystemUI(DockableWidget):
             sldPar = self.getDefFromGuide(stretch=sldPar)
 
         # Create Slider System
-        print(sldName, 'slider', '*'*(80-len(sldName)))
-        self.createSliderSystem(sldName, startPos, endPos, sldPar, sldTrk, startAngle,
-                                 endAngle, upAxis, globScl, visCrv, newDef, sldJnt)
+        buildLog.debug('%s slider', sldName)
+        with buildLog.stage('create', sldName):
+            self.createSliderSystem(sldName, startPos, endPos, sldPar, sldTrk, startAngle,
+                                     endAngle, upAxis, globScl, visCrv, newDef, sldJnt)
 
         # Post parenting dict
         self.sliderParDict[sldName] = ['slider', sldPar]
 
         # Reset bindpose for skinCluster
         if jntSkn != []:
-            self.set_bind_pose(mesh=None, setAngle=0, sknCls=jntSkn)
+            with buildLog.stage('bind pose'):
+                self.set_bind_pose(mesh=None, setAngle=0, sknCls=jntSkn)
 
     def buildStretch(self, guide, strName, globScl=None, visCrv=0):
         # is def a joint? Is it in a skincluster?
@@ -1049,15 +1476,17 @@ class VolumeSystemUI(DockableWidget):
             endPar   = self.getDefFromGuide(stretch=endPar)
 
         ## Create Stretch System
-        print(strName, 'stretch', '*'*(79-len(strName)))
-        self.createStretchSystem(twist, strName, startPos, endPos, startPar, endPar, sns, snsAmt,
-                                  globScl, visCrv, newDef, strJnt, strPos)
+        buildLog.debug('%s stretch', strName)
+        with buildLog.stage('create', strName):
+            self.createStretchSystem(twist, strName, startPos, endPos, startPar, endPar, sns, snsAmt,
+                                      globScl, visCrv, newDef, strJnt, strPos)
         # Post parenting dict
         self.stretchParDict[strName] = ['stretch', startPar, endPar]
 
         # Reset bindpose for skinCluster
         if jntSkn != []:
-            self.set_bind_pose(mesh=None, setAngle=0, sknCls=jntSkn)
+            with buildLog.stage('bind pose'):
+                self.set_bind_pose(mesh=None, setAngle=0, sknCls=jntSkn)
 
     def createSliderSystem(self, sldName, startPos, endPos, sldPar, sldTrk, startAngle, endAngle, upAxis, globScl, visCrv, newDef, sldJnt):
         '''
@@ -1187,6 +1616,65 @@ class VolumeSystemUI(DockableWidget):
         cmds.parent(angRoot, sldRoot)
         cmds.parent(sldRoot, 'volumeSystems')
 
+    def getSliderSolverInputs(self, sldName):
+        '''
+        Returns {'tracker', 'axis', 'restMatrix', 'minRot', 'maxRot'} of a built
+        slider system, the inputs of volumeSolver.trackerTwist() / solveSlider(),
+        traced from the twist setup
+        '''
+        axis = 'xyz'[cmds.getAttr('twist_%s_extract_twistExtractor_q2e.inputRotateOrder' % sldName)]
+
+        # trkRot_*_A rotate <- decomposeMatrix <- multMatrix, matrixIn[1] is the tracker
+        decomp = cmds.listConnections('trkRot_%s_A.rotate%s' % (sldName, axis.upper()), s=True, d=False)[0]
+        multMat = cmds.listConnections(decomp+'.inputMatrix', s=True, d=False)[0]
+        tracker = cmds.listConnections(multMat+'.matrixIn[1]', s=True, d=False)[0]
+
+        # angBet_*_Root follows the tracker parent, its offset is the tracker build pose
+        restMatrix = self.getTrackerRestMatrix('angBet_%s_Root' % sldName, tracker)
+
+        return {'tracker'    : tracker,
+                'axis'       : axis,
+                'restMatrix' : restMatrix,
+                'minRot'     : cmds.getAttr(sldName+'_RotRemap.inputMin'),
+                'maxRot'     : cmds.getAttr(sldName+'_RotRemap.inputMax')}
+
+    def verifySliderSolver(self, sldName, angles=None):
+        '''
+        Compares volumeSolver.solveSlider() to the DG network of a built slider,
+        by posing the tracker's up axis rotate. The tracker is restored after.
+
+        angles = ([float]) Tracker rotate values in degrees, trackerMinRot - 20 .. trackerMaxRot + 20 if None
+
+        Returns largest Def translate difference
+        '''
+        inputs = self.getSliderSolverInputs(sldName)
+        rotAttr = inputs['tracker']+'.rotate'+inputs['axis'].upper()
+        if cmds.getAttr(rotAttr, lock=True) or cmds.listConnections(rotAttr, s=True, d=False):
+            raise RuntimeError('%s is locked or connected, cannot pose the tracker' % rotAttr)
+
+        if angles is None:
+            low, high = sorted([inputs['minRot'], inputs['maxRot']])
+            angles = np.linspace(low - 20.0, high + 20.0, 25)
+
+        sldDef = 'Def_'+sldName+'_SldMain'
+        restValue = cmds.getAttr(rotAttr)
+        trackerMats, startMats, endMats, defTranslates = [], [], [], []
+        try:
+            for angle in angles:
+                cmds.setAttr(rotAttr, angle)
+                trackerMats.append(cmds.getAttr(inputs['tracker']+'.matrix'))
+                startMats.append(cmds.getAttr(sldName+'_sliderStartPos.worldMatrix'))
+                endMats.append(cmds.getAttr(sldName+'_sliderEndPos.worldMatrix'))
+                defTranslates.append(cmds.getAttr(sldDef+'.translate')[0])
+        finally:
+            cmds.setAttr(rotAttr, restValue)
+
+        twist = volumeSolver.trackerTwist(trackerMats, inputs['restMatrix'], inputs['axis'])
+        result = volumeSolver.solveSlider(twist, startMats, endMats, inputs['minRot'], inputs['maxRot'])
+        error = float(np.abs(result['translate'] - np.array(defTranslates)).max())
+        buildLog.info('%s slider solver: %s samples, max translate difference %g', sldName, len(angles), error)
+        return error
+
     def createStretchSystem(self, twist, strName, startPos, endPos, startPar, endPar, sns,
         snsAmt, globScl, visCrv, newDef, strJnt, strPos):
         '''
@@ -1397,6 +1885,48 @@ class VolumeSystemUI(DockableWidget):
         cmds.parent(strRoot, 'volumeSystems')
 
 
+    def getStretchSolverInputs(self, strName):
+        '''
+        Returns {'restDistance', 'snsMultiplier', 'globalScale'} of a built
+        stretch system with SNS, the inputs of volumeSolver.solveStretch()
+        '''
+        if not cmds.objExists(strName+'_distTimesTwo'):
+            raise RuntimeError('%s has no SNS network' % strName)
+        return {'restDistance'  : cmds.getAttr(strName+'_distTimesTwo.input1X'),
+                'snsMultiplier' : cmds.getAttr(strName+'_snsClamp.snsSysMultiplier'),
+                'globalScale'   : cmds.getAttr(strName+'_snsSysGlobalScale.snsSysGlobalScale')}
+
+    def verifyStretchSolver(self, strName, ratios=None):
+        '''
+        Compares volumeSolver.solveStretch() to the SNS network of a built stretch.
+        The distance input of the network is disconnected and set per sample,
+        and reconnected after.
+
+        ratios = ([float]) Distances as multiples of the rest distance, 0..2.5 if None
+
+        Returns largest Def scale difference
+        '''
+        inputs = self.getStretchSolverInputs(strName)
+        ratios = np.linspace(0.0, 2.5, 26) if ratios is None else np.asarray(ratios, dtype=np.float64)
+        distances = ratios * inputs['restDistance'] * inputs['globalScale']
+
+        strDef = 'Def_'+strName+'_StrMain'
+        distIn = strName+'_snsSysGlobalScale.input1X'
+        distOut = strName+'_distBetween.distance'
+        cmds.disconnectAttr(distOut, distIn)
+        defScales = []
+        try:
+            for distance in distances:
+                cmds.setAttr(distIn, distance)
+                defScales.append(cmds.getAttr(strDef+'.scale')[0])
+        finally:
+            cmds.connectAttr(distOut, distIn, f=True)
+
+        result = volumeSolver.solveStretch(distances, inputs['restDistance'], inputs['snsMultiplier'], inputs['globalScale'])
+        error = float(np.abs(result['scale'] - np.array(defScales)).max())
+        buildLog.info('%s stretch solver: %s samples, max scale difference %g', strName, len(distances), error)
+        return error
+
     # Slider Settings
     def constrainSldParent(self, guide, parentLineEdit):
         '''
@@ -1473,7 +2003,7 @@ class VolumeSystemUI(DockableWidget):
         '''
         '''
         if guide:
-            print('Committing changes to slider guide')
+            buildLog.debug('Committing changes to slider guide %s', guide)
             # set Axis attr from UI
             cmds.setAttr(guide+'.XYZ', rotAxisComboBox.currentIndex())
             # set Axis Min from UI
@@ -1488,29 +2018,36 @@ class VolumeSystemUI(DockableWidget):
             # cmds.setAttr(guide+'.sliderDorito', doritoCheckBox.isChecked())
 
             # Axis value change
-            guideName = cmds.getAttr(guide+'.guideName')
-            axisDict = { 0:'X', 1:'Y', 2:'Z' }
-            axis = axisDict[rotAxisComboBox.currentIndex()]
-
-            # Constrain gdeA to new axis
-            if cmds.objExists('trkRot_'+guideName+'_gdeA.parentInverseMatrix'):
-                if cmds.listConnections('trkRot_'+guideName+'_gdeA.parentInverseMatrix') != None:
-                    node = cmds.listConnections('trkRot_'+guideName+'_gdeA.parentInverseMatrix')[0]
-                    node = cmds.listConnections('trkRot_'+guideName+'_gdeA.parentInverseMatrix')[0]
-                    if cmds.nodeType(node) == 'multMatrix':
-                        decomp = cmds.listConnections(node+'.matrixSum')[0] # DecomposeMatrix node
-                        rotAxi = cmds.listConnections(decomp, p=True, c=True, t='transform') # Connection from decomp to gdeA
-                        cmds.disconnectAttr(rotAxi[0], rotAxi[1]) # Disconnect output axis, trkRot input axis
-                        cmds.setAttr(rotAxi[1], 0) # Zero out previously contrained axis of gdeA
-                        cmds.connectAttr(decomp+'.outputRotate'+axis, 'trkRot_'+guideName+'_gdeA.rotate'+axis) # New connection
-                    else:
-                        cmds.warning('Failed to fix parent constraint for tracker axis change')
+            self.setGuideTrackerAxis(guide, 'xyz'[rotAxisComboBox.currentIndex()])
+
+    def setGuideTrackerAxis(self, guide, axis):
+        '''
+        Reconnects the guide twist setup to the tracker axis, after XYZ changed
+
+        axis = (str) 'x', 'y' or 'z'
+        '''
+        guideName = cmds.getAttr(guide+'.guideName')
+        axis = axis.upper()
+
+        # Constrain gdeA to new axis
+        if cmds.objExists('trkRot_'+guideName+'_gdeA.parentInverseMatrix'):
+            if cmds.listConnections('trkRot_'+guideName+'_gdeA.parentInverseMatrix') != None:
+                node = cmds.listConnections('trkRot_'+guideName+'_gdeA.parentInverseMatrix')[0]
+                node = cmds.listConnections('trkRot_'+guideName+'_gdeA.parentInverseMatrix')[0]
+                if cmds.nodeType(node) == 'multMatrix':
+                    decomp = cmds.listConnections(node+'.matrixSum')[0] # DecomposeMatrix node
+                    rotAxi = cmds.listConnections(decomp, p=True, c=True, t='transform') # Connection from decomp to gdeA
+                    cmds.disconnectAttr(rotAxi[0], rotAxi[1]) # Disconnect output axis, trkRot input axis
+                    cmds.setAttr(rotAxi[1], 0) # Zero out previously contrained axis of gdeA
+                    cmds.connectAttr(decomp+'.outputRotate'+axis, 'trkRot_'+guideName+'_gdeA.rotate'+axis) # New connection
+                else:
+                    cmds.warning('Failed to fix parent constraint for tracker axis change')
 
-            # Current Value ui connection
-            if not cmds.isConnected('twist_'+guideName+'_gdeExtract_twistExtractor_q2e.outputRotate'+axis,
-                                    'Hbfr_'+guideName+'_SldGuideRoot.currentValRef', iuc=True):
-                cmds.connectAttr('twist_'+guideName+'_gdeExtract_twistExtractor_q2e.outputRotate'+axis,
-                                 'Hbfr_'+guideName+'_SldGuideRoot.currentValRef', f=True)
+        # Current Value ui connection
+        if not cmds.isConnected('twist_'+guideName+'_gdeExtract_twistExtractor_q2e.outputRotate'+axis,
+                                'Hbfr_'+guideName+'_SldGuideRoot.currentValRef', iuc=True):
+            cmds.connectAttr('twist_'+guideName+'_gdeExtract_twistExtractor_q2e.outputRotate'+axis,
+                             'Hbfr_'+guideName+'_SldGuideRoot.currentValRef', f=True)
 
     def fixConstrainSldTracker(self, hbfrLst=None):
         '''
@@ -1560,7 +2097,7 @@ class VolumeSystemUI(DockableWidget):
         '''
         '''
         if guide:
-            print('Committing changes to stretch guide')
+            buildLog.debug('Committing changes to stretch guide %s', guide)
             # set twist options
             cmds.setAttr(guide+'.twist', twistCheckBox.isChecked())
             # set deformer position option
@@ -1621,12 +2158,413 @@ class VolumeSystemUI(DockableWidget):
             cmds.setAttr( x+".visibility", 0)
 
 
+    # Bake Systems
+    def getSystemDefs(self, guides=None):
+        '''
+        Returns Def_*_SldMain / Def_*_StrMain nodes of built systems, of guides,
+        selected guides, or all systems if nothing is selected
+
+        guides = ([]) Guide roots
+        '''
+        if guides is None:
+            guides = self.getGuideRoot(select=False)
+        if not guides:
+            return cmds.ls('Def_*_SldMain', 'Def_*_StrMain')
+
+        defs = []
+        for guide in guides:
+            suff = '_SldMain' if cmds.getAttr(guide+'.guideType') == 'slider' else '_StrMain'
+            sysDef = 'Def_'+cmds.getAttr(guide+'.guideName')+suff
+            if cmds.objExists(sysDef):
+                defs.append(sysDef)
+        return defs
+
+    def getSystemRoot(self, sysDef):
+        '''
+        Returns Orig_*_SldRoot / Orig_*_StrRoot of a Def node
+        '''
+        if sysDef.endswith('_SldMain'):
+            return 'Orig_'+sysDef[len('Def_'):-len('_SldMain')]+'_SldRoot'
+        return 'Orig_'+sysDef[len('Def_'):-len('_StrMain')]+'_StrRoot'
+
+    def getBakeConnections(self, sysDef):
+        '''
+        Returns [(source plug, destination plug)] driving the transform channels of a
+        Def node and of its parents inside the system root, the stretch _stretchDefBfr
+        '''
+        sysRoot = self.getSystemRoot(sysDef)
+        nodes = [sysDef]
+        parent = cmds.listRelatives(sysDef, p=True, fullPath=True)
+        while parent and parent[0].split('|')[-1] != sysRoot:
+            if sysRoot not in parent[0].split('|'):# Def is outside its system root
+                break
+            nodes.append(parent[0])
+            parent = cmds.listRelatives(parent[0], p=True, fullPath=True)
+
+        connections = []
+        for node in nodes:
+            nodeName = cmds.ls(node)[0]
+            for attr in ['translate', 'rotate', 'scale']:
+                sources = cmds.listConnections(nodeName+'.'+attr, s=True, d=False, p=True, skipConversionNodes=False) or []
+                if sources:# Compound connection, the slider translate / rotate
+                    connections.append((sources[0], nodeName+'.'+attr))
+                    continue
+                for plug in [attr+axis for axis in 'XYZ']:
+                    sources = cmds.listConnections(nodeName+'.'+plug, s=True, d=False, p=True, skipConversionNodes=False) or []
+                    connections += [(source, nodeName+'.'+plug) for source in sources]
+        return connections
+
+    def walkSystemNetwork(self, sysDef, connections):
+        '''
+        Returns (network, inputs), walking upstream of a system's Def connections.
+        network = DG nodes inside the system, inputs = rig DAG nodes, anim curves
+        and time nodes where the system starts, its tracker, parents and global scale.
+        '''
+        sysRoot = self.getSystemRoot(sysDef)
+        sysDag = set(cmds.ls(cmds.listRelatives(sysRoot, ad=True, fullPath=True) or [], long=True))
+        sysDag.add(cmds.ls(sysRoot, long=True)[0])
+
+        network = set()
+        inputs = set()
+        queue = [source.split('.')[0] for source, destination in connections]
+        visited = set()
+        while queue:
+            node = queue.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            if cmds.ls(node, dag=True):
+                if cmds.ls(node, long=True)[0] not in sysDag:
+                    inputs.add(node) # Rig joint or control, end of the system
+                    continue
+            elif cmds.ls(node, type=['animCurve', 'time']):
+                inputs.add(node)
+                continue
+            else:
+                network.add(node)
+            queue += cmds.listConnections(node, s=True, d=False, skipConversionNodes=False) or []
+        return network, sorted(inputs)
+
+    def getSystemNetwork(self, sysDef, connections):
+        '''
+        Returns DG nodes that only feed the baked channels of a system, found
+        upstream of the baked connections, inside the system root. Rig nodes
+        and nodes shared with anything else are left out.
+        '''
+        sysRoot = self.getSystemRoot(sysDef)
+        sysDag = set(cmds.ls(cmds.listRelatives(sysRoot, ad=True, fullPath=True) or [], long=True))
+        sysDag.add(cmds.ls(sysRoot, long=True)[0])
+        network, inputs = self.walkSystemNetwork(sysDef, connections)
+
+        # Keep nodes that also drive something outside the system
+        inside = set(cmds.ls(list(network), long=True) + list(sysDag) + cmds.ls(sysDef, long=True))
+        shared = set()
+        for node in network:
+            for destination in cmds.listConnections(node, s=False, d=True, skipConversionNodes=False) or []:
+                if cmds.ls(destination, long=True)[0] not in inside:
+                    shared.add(node)
+                    break
+        return sorted(network - shared)
+
+    def samplePlugsOM(self, plugs, frames):
+        '''
+        Returns (F, P) values of numeric plugs at frames, in internal units,
+        evaluated in DG contexts, so current time does not change.
+
+        plugs  = ([str]) 'node.attr' plugs
+        frames = ([float]) Frames, in the current time unit
+        '''
+        selList = om2.MSelectionList()
+        for plug in plugs:
+            selList.add(plug)
+        mPlugs = [selList.getPlug(i) for i in range(len(plugs))]
+
+        unit = om2.MTime.uiUnit()
+        values = np.empty((len(frames), len(plugs)))
+        for f, frame in enumerate(frames):
+            context = om2.MDGContext(om2.MTime(float(frame), unit))
+            if hasattr(om2, 'MDGContextGuard'):# Maya 2022+, context arguments are deprecated
+                with om2.MDGContextGuard(context):
+                    values[f] = [plug.asDouble() for plug in mPlugs]
+            else:
+                values[f] = [plug.asDouble(context) for plug in mPlugs]
+        return values
+
+    def bakeSystems(self, defs=None, start=None, end=None, step=1.0, freeze=True):
+        '''
+        Bakes the Def transforms of built systems to animation curves, for playback
+        without the slider / stretch networks. All systems are sampled in one pass
+        over DG contexts, curves are keyed in bulk with MFnAnimCurve.addKeys().
+        The driving connections and frozen nodes are stored on the Def node,
+        unbakeSystems() re-attaches the networks. Not undoable, none of the bake writes
+        go through cmds, so the undo queue is flushed after the bake. Use unbakeSystems().
+
+        defs       = ([]) Def nodes, see getSystemDefs() if None
+        start, end = (float) Frame range, playback range if None
+        step       = (float) Frame step
+        freeze     = (bol) Freeze the disconnected networks, so they are not evaluated
+
+        Returns {Def node : number of baked channels}
+        '''
+        if defs is None:
+            defs = self.getSystemDefs()
+        defs = [sysDef for sysDef in defs if not cmds.attributeQuery('volumeBake', node=sysDef, ex=True)
+                                          and not cmds.attributeQuery('volumeFreeze', node=sysDef, ex=True)]
+        if defs == []:
+            buildLog.info('No unbaked, unfrozen volume systems')
+            return {}
+
+        if start is None:
+            start = cmds.playbackOptions(q=True, min=True)
+        if end is None:
+            end = cmds.playbackOptions(q=True, max=True)
+        frames = np.arange(start, end + step * 0.5, step)
+
+        # Compound connections are keyed per child channel
+        bakes = {}
+        plugs = []
+        for sysDef in defs:
+            connections = self.getBakeConnections(sysDef)
+            channels = []
+            for source, destination in connections:
+                node, attr = destination.split('.')
+                channels += [node+'.'+attr+axis for axis in 'XYZ'] if attr in ['translate', 'rotate', 'scale'] else [destination]
+            bakes[sysDef] = (connections, channels)
+            plugs += channels
+
+        values = self.samplePlugsOM(plugs, frames)
+
+        unit = om2.MTime.uiUnit()
+        times = om2.MTimeArray([om2.MTime(float(frame), unit) for frame in frames])
+        selList = om2.MSelectionList()
+        for plug in plugs:
+            selList.add(plug)
+
+        report = {}
+        column = 0
+        for sysDef in defs:
+            connections, channels = bakes[sysDef]
+            network = self.getSystemNetwork(sysDef, connections) if freeze else []
+
+            dgMod = om2.MDGModifier()
+            for source, destination in connections:
+                dgMod.disconnect(self.getPlugOM(source), self.getPlugOM(destination))
+            dgMod.doIt()
+
+            curves = []
+            for channel in channels:
+                animFn = OpenMayaAnim.MFnAnimCurve()
+                animFn.create(selList.getPlug(column))
+                animFn.addKeys(times, om2.MDoubleArray(values[:, column].tolist()),
+                               OpenMayaAnim.MFnAnimCurve.kTangentLinear, OpenMayaAnim.MFnAnimCurve.kTangentLinear)
+                curves.append(animFn.name())
+                column += 1
+
+            # Frozen flags and the bake record go on the same modifier, so no part of the bake is undoable
+            for node in network:
+                dgMod.newPlugValueBool(self.getPlugOM(node+'.frozen'), True)
+
+            record = {'connections':connections, 'curves':curves, 'frozen':network}
+            defSel = om2.MSelectionList()
+            defSel.add(sysDef)
+            defObj = defSel.getDependNode(0)
+            dgMod.addAttribute(defObj, om2.MFnTypedAttribute().create('volumeBake', 'volumeBake', om2.MFnData.kString))
+            dgMod.doIt()
+            dgMod.newPlugValueString(om2.MFnDependencyNode(defObj).findPlug('volumeBake', False), json.dumps(record))
+            dgMod.doIt()
+            report[sysDef] = len(channels)
+
+        # The bake is not on the undo queue, undoing the cmds calls before it would
+        # pull nodes from under the baked systems and their volumeBake records
+        cmds.flushUndo()
+        buildLog.info('Baked %s system(s), %s channel(s), %s frame(s) %s..%s', len(report), len(plugs), len(frames), start, end)
+        buildLog.warning('Bake is not undoable, the undo queue was flushed. Use Unbake Systems to revert it')
+        return report
+
+    def unbakeSystems(self, defs=None):
+        '''
+        Deletes the bake curves of systems baked by bakeSystems(), reconnects their
+        networks and thaws frozen nodes
+
+        defs = ([]) Def nodes, see getSystemDefs() if None
+        '''
+        if defs is None:
+            defs = self.getSystemDefs()
+        defs = [sysDef for sysDef in defs if cmds.attributeQuery('volumeBake', node=sysDef, ex=True)]
+
+        cmds.undoInfo(openChunk=True, chunkName='unbakeSystems')
+        try:
+            for sysDef in defs:
+                record = json.loads(cmds.getAttr(sysDef+'.volumeBake'))
+                curves = cmds.ls(record['curves'])
+                if curves:
+                    cmds.delete(curves)
+                for node in cmds.ls(record['frozen']):
+                    cmds.setAttr(node+'.frozen', False)
+                for source, destination in record['connections']:
+                    if cmds.objExists(source) and cmds.objExists(destination):
+                        cmds.connectAttr(source, destination, f=True)
+                    else:
+                        cmds.warning('Cannot reconnect %s -> %s' % (source, destination))
+                cmds.deleteAttr(sysDef+'.volumeBake')
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+        buildLog.info('Unbaked %s system(s)', len(defs))
+        return defs
+
+    def getPlugOM(self, plug):
+        selList = om2.MSelectionList()
+        selList.add(plug)
+        return selList.getPlug(0)
+
+    # Freeze Static Systems
+    def isCurveStatic(self, curve, start, end, tolerance=1e-6):
+        '''
+        Returns True when a time anim curve keeps one value over a frame range
+        '''
+        values = cmds.keyframe(curve, q=True, valueChange=True, time=(start, end)) or []
+        values += cmds.keyframe(curve, q=True, eval=True, time=(start, start)) or []
+        values += cmds.keyframe(curve, q=True, eval=True, time=(end, end)) or []
+        return values == [] or max(values) - min(values) <= tolerance
+
+    def findMotionSource(self, nodes, start, end, staticNodes=None):
+        '''
+        Returns the first node found upstream of nodes that animates over a frame
+        range, a varying time anim curve or a node driven by time, None if static.
+        DAG nodes are followed through their parents, world space depends on them.
+
+        staticNodes = (set) Nodes known to be static, skipped, and filled with the
+                      nodes of a static walk so later systems do not repeat it
+        '''
+        if staticNodes is None:
+            staticNodes = set()
+        queue = list(nodes)
+        visited = set()
+        while queue:
+            node = queue.pop()
+            if node in visited or node in staticNodes:
+                continue
+            visited.add(node)
+
+            if cmds.ls(node, type='animCurve'):
+                drivers = cmds.listConnections(node+'.input', s=True, d=False, skipConversionNodes=True) or []
+                if drivers == [] or cmds.ls(drivers, type='time'):# Time curve, driven keys are followed
+                    if not self.isCurveStatic(node, start, end):
+                        return node
+                    continue
+
+            sources = cmds.listConnections(node, s=True, d=False, skipConversionNodes=False) or []
+            if cmds.ls(sources, type='time'):
+                return node
+            queue += sources
+            if cmds.ls(node, dag=True):
+                queue += cmds.listRelatives(node, p=True, fullPath=True) or []
+
+        staticNodes.update(visited)
+        return None
+
+    def freezeStaticSystems(self, defs=None, start=None, end=None, apply=True):
+        '''
+        Freezes built systems that do not move over a frame range, so they are
+        not evaluated. A system is static when nothing upstream of its network
+        inputs animates, its tracker, slider parent, stretch start / end parents
+        and global scale, see walkSystemNetwork() and findMotionSource().
+        Frozen nodes are stored on the Def node, thawSystems() unfreezes them.
+
+        defs       = ([]) Def nodes, see getSystemDefs() if None
+        start, end = (float) Shot frame range, playback range if None
+        apply      = (bol) Freeze static systems, only report them if False
+
+        Returns {Def node : motion source, None for static systems}
+        '''
+        if defs is None:
+            defs = self.getSystemDefs()
+        defs = [sysDef for sysDef in defs if not cmds.attributeQuery('volumeBake', node=sysDef, ex=True)
+                                          and not cmds.attributeQuery('volumeFreeze', node=sysDef, ex=True)]
+        if start is None:
+            start = cmds.playbackOptions(q=True, min=True)
+        if end is None:
+            end = cmds.playbackOptions(q=True, max=True)
+
+        results = {}
+        staticNodes = set()
+        sysConnections = {}
+        for sysDef in defs:
+            connections = self.getBakeConnections(sysDef)
+            network, inputs = self.walkSystemNetwork(sysDef, connections)
+            results[sysDef] = self.findMotionSource(inputs, start, end, staticNodes)
+            sysConnections[sysDef] = connections
+
+        static = sorted(sysDef for sysDef, source in results.items() if source is None)
+        if apply and static:
+            cmds.undoInfo(openChunk=True, chunkName='freezeStaticSystems')
+            try:
+                for sysDef in static:
+                    connections = sysConnections[sysDef]
+                    cmds.dgeval([destination for source, destination in connections]) # Frozen nodes keep their last value
+                    network = self.getSystemNetwork(sysDef, connections)
+                    for node in network:
+                        cmds.setAttr(node+'.frozen', True)
+                    cmds.addAttr(sysDef, ln='volumeFreeze', dt='string')
+                    cmds.setAttr(sysDef+'.volumeFreeze', json.dumps(network), type='string')
+            finally:
+                cmds.undoInfo(closeChunk=True)
+
+        scene = cmds.file(q=True, sceneName=True, shortName=True) or 'untitled'
+        with buildLog.buffered():
+            buildLog.info('Volume systems in %s, frames %s..%s: %s static, %s animated%s',
+                          scene, start, end, len(static), len(results) - len(static), ', frozen' if apply else '')
+            for sysDef, source in sorted(results.items()):
+                buildLog.info('  %-40s %s', sysDef, 'STATIC' if source is None else 'animated by '+source.split('|')[-1])
+        return results
+
+    def thawSystems(self, defs=None):
+        '''
+        Unfreezes systems frozen by freezeStaticSystems()
+
+        defs = ([]) Def nodes, see getSystemDefs() if None
+        '''
+        if defs is None:
+            defs = self.getSystemDefs()
+        defs = [sysDef for sysDef in defs if cmds.attributeQuery('volumeFreeze', node=sysDef, ex=True)]
+
+        cmds.undoInfo(openChunk=True, chunkName='thawSystems')
+        try:
+            for sysDef in defs:
+                for node in cmds.ls(json.loads(cmds.getAttr(sysDef+'.volumeFreeze'))):
+                    cmds.setAttr(node+'.frozen', False)
+                cmds.deleteAttr(sysDef+'.volumeFreeze')
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+        buildLog.info('Thawed %s system(s)', len(defs))
+        return defs
+
+
     # Mirror Guides
-    def mirrorGuideMultiple(self):
+    @volumeProfiling.profiled()
+    def mirrorGuideMultiple(self, axis='yz', plane=None, sync=False, guides=None):
+        '''
+        Mirrors selected guides to the opposite side.
+        Start and end matrices of all guides are read in one pass and mirrored
+        with NumPy, then set with one cmds.xform per control so the mirror
+        stays undoable.
+
+        axis   = (str) Plane to mirror across, 'yz', 'zx' or 'xy'
+        plane  = (str, [16]) Optional plane object or matrix to mirror across
+        sync   = (bol) Update existing opposite side guides in place, only
+                 setting transforms and attributes that differ. The UI is
+                 updated per guide instead of being rebuilt.
+        guides = ([]) Guides to mirror, selection if None
+        '''
         sldGde = []
         strGde = []
 
-        for guide in cmds.ls(sl=True):
+        if guides is None:
+            guides = cmds.ls(sl=True)
+
+        for guide in guides:
             if cmds.attributeQuery('guideType', node=guide, ex=True):
                 if cmds.getAttr(guide+'.guideType') == 'slider':
                     guideName = cmds.getAttr(guide+'.guideName')
@@ -1637,20 +2575,76 @@ class VolumeSystemUI(DockableWidget):
                     if not guideName in strGde:
                         strGde.append(guideName)
 
-        if sldGde != []:
-            for gdeNme in sldGde:
-                if gdeNme[0] != 'M':
-                    self.duplicateSymSld(gdeNme)
-        if strGde != []:
-            for gdeNme in strGde:
-                if gdeNme[0] != 'M':
-                    self.duplicateSymStr(gdeNme)
+        # Skip middle guides, and guides without a side to convert
+        mirrGdeLst = [('slider', gdeNme) for gdeNme in sldGde] + [('stretch', gdeNme) for gdeNme in strGde]
+        mirrNmeLst = sideNaming.convertNames([gdeNme for guideType, gdeNme in mirrGdeLst], side_format=1)
+        mirrGdeLst = [(guideType, gdeNme) for (guideType, gdeNme), mirrNme in zip(mirrGdeLst, mirrNmeLst)
+                      if gdeNme[0] != 'M' and mirrNme != gdeNme]
+        if mirrGdeLst == []:
+            return
 
-        self.refreshUI()
+        if isinstance(plane, str):
+            plane = self.getTransform(plane)
+
+        # Gather start / end matrices for all guides and mirror them as one batch
+        prefixDict = {'slider':'_Sld', 'stretch':'_Str'}
+        srcCtls = []
+        for guideType, gdeNme in mirrGdeLst:
+            srcCtls += ['Ctl_'+gdeNme+prefixDict[guideType]+'GuideStart', 'Ctl_'+gdeNme+prefixDict[guideType]+'GuideEnd']
+
+        with volumeProfiling.scope('mirror matrices'):
+            mirrored = sym.mirrorMatrices(self.getTransformsOM(srcCtls), axis=axis, plane=plane)
+            mirrored = mirrored.reshape(-1, 2, 4, 4)
+
+        created = []
+        synced  = []
+        targets = []
+        for i, (guideType, gdeNme) in enumerate(mirrGdeLst):
+            mirrNme = self.convertRLName(gdeNme, side_format=1)
+            if sync and cmds.objExists('Hbfr_'+mirrNme+prefixDict[guideType]+'GuideRoot'):
+                with volumeProfiling.scope('sync', gdeNme):
+                    mirrGde, changed = self.syncSymGuide(guideType, gdeNme)
+                if changed:
+                    synced.append(mirrGde[0])
+            else:
+                with volumeProfiling.scope('create', gdeNme):
+                    if guideType == 'slider':
+                        mirrGde = self.duplicateSymSld(gdeNme, mirrored[i][0], mirrored[i][1], setTransforms=False)
+                    else:
+                        mirrGde = self.duplicateSymStr(gdeNme, mirrored[i][0], mirrored[i][1], setTransforms=False)
+                created.append(mirrGde[0])
+            targets.append([mirrGde[1], mirrGde[2]])
+
+        # Only write guides whose start or end moved. Start and end are
+        # written as a pair, as the end can be a child of the start.
+        with volumeProfiling.scope('place'):
+            current = self.getTransformsOM([ctl for pair in targets for ctl in pair]).reshape(-1, 2, 4, 4)
+            moved = np.abs(current - mirrored).max(axis=(1, 2, 3)) > 1e-6
+            writeCtls = [ctl for i, pair in enumerate(targets) if moved[i] for ctl in pair]
+            if writeCtls != []:
+                self.setTransformsFromMatrices(mirrored[moved], writeCtls)
+
+        if sync:
+            if created != []:
+                self.addGuidesToUI(created)
+            self.refreshGuideFrames(synced)
+        else:
+            self.refreshUI()
 
-    def duplicateSymSld(self, guideName):
+    def duplicateSymSld(self, guideName, startPos=None, endPos=None, axis='yz', plane=None, setTransforms=True):
+        '''
+        Creates the opposite side slider guide.
+
+        guideName     = (str) Name of the guide to mirror
+        startPos      = ([16]) Mirrored start matrix, computed if None
+        endPos        = ([16]) Mirrored end matrix, computed if None
+        axis          = (str) Plane to mirror across when computing matrices
+        plane         = ([16]) Optional plane matrix to mirror across
+        setTransforms = (bol) Set guide transforms, False when batched by caller
+        '''
         # Name guide
         guide = 'Hbfr_'+guideName+'_SldGuideRoot'
+        srcCtls = ['Ctl_'+guideName+'_SldGuideStart', 'Ctl_'+guideName+'_SldGuideEnd']
         guideName = self.convertRLName(guideName, side_format=1)
 
         # Delete if mirror guide exists
@@ -1658,58 +2652,43 @@ class VolumeSystemUI(DockableWidget):
             cmds.delete(cmds.listRelatives('Hbfr_'+guideName+'_SldGuideRoot', p=True), hierarchy=True)
 
         # Mirror the guide
-        sldGdeChild = cmds.listRelatives((cmds.listRelatives(guide, p=True)[0]), ad=True, type='transform')
-        t           = self.getTransform(sldGdeChild[1])
-        startPos    = self.getSymmetricalTransformOM(t, axis="yz")
-        t           = self.getTransform(sldGdeChild[0])
-        endPos      = self.getSymmetricalTransformOM(t, axis="yz")
-        globScl     = cmds.getAttr(guide+'.globalScale')
-        trkRev      = cmds.getAttr(guide+'.trackerRev')
+        if startPos is None or endPos is None:
+            startPos, endPos = sym.mirrorMatrices(self.getTransformsOM(srcCtls), axis=axis, plane=plane)
+        globScl  = cmds.getAttr(guide+'.globalScale')
+        settings = sym.mirrorGuideSettings('slider', self.getGuideSettings(guide, sym.MIRROR_SETTINGS['slider']),
+                                           self.convertRLName)
 
         # mirrGde return = sldGdeRoot, gdeStart, gdeEnd
         mirrGde = self.createSliderGuide(guideName, globScl)
 
-        self.setTransformFromMatrix(startPos, mirrGde[1])
-        self.setTransformFromMatrix(endPos, mirrGde[2])
+        if setTransforms:
+            self.setTransformsFromMatrices([startPos, endPos], [mirrGde[1], mirrGde[2]])
 
-        # Mirror constraints settings
-        if cmds.getAttr(guide+'.guideParent') != None:
-            guidePar = self.convertRLName(cmds.getAttr(guide+'.guideParent'))
-            cmds.setAttr(mirrGde[0]+'.guideParent', guidePar, type='string')
+        # Mirror constraints settings and tracker values
+        self.applyGuideSettings(mirrGde[0], settings)
 
-        if cmds.getAttr(guide+'.guideTracker') != None:
-            guideTrk = self.convertRLName(cmds.getAttr(guide+'.guideTracker'))
-            cmds.setAttr(mirrGde[0]+'.guideTracker', guideTrk, type='string')
-            if cmds.objExists(guideTrk):
-                self.constrainSldTracker(guide=mirrGde[0], sldTrk=guideTrk, mirror=True)
-
-            # # Set tracker axis
-            # axisDict = { 0:'X', 1:'Y', 2:'Z' }
-            # axis = axisDict[cmds.getAttr(guide+'.XYZ')]
-            # if not cmds.isConnected('twist_'+guideName+'_gdeExtract_twistExtractor_q2e.outputRotate'+axis,
-            #                         'eulerConv_'+guideName+'_gdeRotConv.input'):
-            #     cmds.connectAttr('twist_'+guideName+'_gdeExtract_twistExtractor_q2e.outputRotate'+axis,
-            #                      'eulerConv_'+guideName+'_gdeRotConv.input', f=True)
-
-        # Mirror tracker values
-        cmds.setAttr(mirrGde[0]+'.XYZ', cmds.getAttr(guide+'.XYZ'))
-        cmds.setAttr(mirrGde[0]+'.trackerRev', cmds.getAttr(guide+'.trackerRev'))
-
-        if trkRev == 1: # Negative tracker values
-            cmds.setAttr(mirrGde[0]+'.trackerMinRot', cmds.getAttr(guide+'.trackerMinRot')/-1)
-            cmds.setAttr(mirrGde[0]+'.trackerMaxRot', cmds.getAttr(guide+'.trackerMaxRot')/-1)
-        else:
-            cmds.setAttr(mirrGde[0]+'.trackerMinRot', cmds.getAttr(guide+'.trackerMinRot'))
-            cmds.setAttr(mirrGde[0]+'.trackerMaxRot', cmds.getAttr(guide+'.trackerMaxRot'))
-
-        cmds.setAttr(mirrGde[0]+'.sliderJoint', cmds.getAttr(guide+'.sliderJoint'))
-        cmds.setAttr(mirrGde[0]+'.sliderDorito', cmds.getAttr(guide+'.sliderDorito'))
+        # Tracker constraint reads the tracker axis, so it is set after the settings
+        guideTrk = settings['guideTracker']
+        if guideTrk and cmds.objExists(guideTrk):
+            self.constrainSldTracker(guide=mirrGde[0], sldTrk=guideTrk, mirror=True)
 
         cmds.parent('Orig_'+guideName+'_SldGuideRoot', 'volumeGuides')
 
+        return mirrGde
+
+    def duplicateSymStr(self, guideName, startPos=None, endPos=None, axis='yz', plane=None, setTransforms=True):
+        '''
+        Creates the opposite side stretch guide.
 
-    def duplicateSymStr(self, guideName):
+        guideName     = (str) Name of the guide to mirror
+        startPos      = ([16]) Mirrored start matrix, computed if None
+        endPos        = ([16]) Mirrored end matrix, computed if None
+        axis          = (str) Plane to mirror across when computing matrices
+        plane         = ([16]) Optional plane matrix to mirror across
+        setTransforms = (bol) Set guide transforms, False when batched by caller
+        '''
         guide = 'Hbfr_'+guideName+'_StrGuideRoot'
+        srcCtls = ['Ctl_'+guideName+'_StrGuideStart', 'Ctl_'+guideName+'_StrGuideEnd']
         guideName = self.convertRLName(guideName, side_format=1)
 
         # Delete if mirror guide exists
@@ -1717,38 +2696,156 @@ class VolumeSystemUI(DockableWidget):
             cmds.delete(cmds.listRelatives('Hbfr_'+guideName+'_StrGuideRoot', p=True), hierarchy=True)
 
         # Mirror the guide
-        strGdeChild = cmds.listRelatives((cmds.listRelatives(guide, p=True)[0]), ad=True, type='transform')
-        strGdeRoot = strGdeChild[3]
-        strGdeStart = strGdeChild[0]
-        strGdeEnd = strGdeChild[1]
-
-        t           = self.getTransform(strGdeStart)
-        startPos    = self.getSymmetricalTransformOM(t, axis="yz")
-        t           = self.getTransform(strGdeEnd)
-        endPos      = self.getSymmetricalTransformOM(t, axis="yz")
-        globScl = cmds.getAttr(guide+'.globalScale')
+        if startPos is None or endPos is None:
+            startPos, endPos = sym.mirrorMatrices(self.getTransformsOM(srcCtls), axis=axis, plane=plane)
+        globScl  = cmds.getAttr(guide+'.globalScale')
+        settings = sym.mirrorGuideSettings('stretch', self.getGuideSettings(guide, sym.MIRROR_SETTINGS['stretch']),
+                                           self.convertRLName)
         mirrGde = self.createStretchGuide(guideName, globScl)
 
-        self.setTransformFromMatrix(startPos, mirrGde[1])
-        self.setTransformFromMatrix(endPos, mirrGde[2])
-
-        cmds.setAttr(mirrGde[0]+'.snsMultiplier', cmds.getAttr(strGdeRoot+'.snsMultiplier'))
-        cmds.setAttr(mirrGde[0]+'.enableSns', cmds.getAttr(strGdeRoot+'.enableSns'))
-        cmds.setAttr(mirrGde[0]+'.twist', cmds.getAttr(strGdeRoot+'.twist'))
-        cmds.setAttr(mirrGde[0]+'.stretchJoint', cmds.getAttr(strGdeRoot+'.stretchJoint'))
-        cmds.setAttr(mirrGde[0]+'.stretchDorito', cmds.getAttr(strGdeRoot+'.stretchDorito'))
-        cmds.setAttr(mirrGde[0]+'.strDefPos', cmds.getAttr(strGdeRoot+'.strDefPos'))
-        if cmds.getAttr(strGdeRoot+'.startParent') != None:
-            startPar = self.convertRLName(cmds.getAttr(strGdeRoot+'.startParent'))
-            cmds.setAttr(mirrGde[0]+'.startParent', startPar, type='string')
+        if setTransforms:
+            self.setTransformsFromMatrices([startPos, endPos], [mirrGde[1], mirrGde[2]])
 
-        if cmds.getAttr(strGdeRoot+'.endParent') != None:
-            endPar = self.convertRLName(cmds.getAttr(strGdeRoot+'.endParent'))
-            cmds.setAttr(mirrGde[0]+'.endParent', endPar, type='string')
+        self.applyGuideSettings(mirrGde[0], settings)
 
         # Parent
         cmds.parent('Orig_'+guideName+'_StrGuideRoot', 'volumeGuides')
 
+        return mirrGde
+
+    def syncSymGuide(self, guideType, guideName):
+        '''
+        Updates an existing opposite side guide in place.
+        Only attributes that differ are set, and the tracker is only
+        re-constrained when the tracker or its axis changed.
+        Transforms are left to the caller.
+
+        guideType = (str) 'slider' or 'stretch'
+        guideName = (str) Name of the source guide
+
+        Returns (mirrored guide root, start, end), list of changed attrs
+        '''
+        prefix   = {'slider':'_Sld', 'stretch':'_Str'}[guideType]
+        guide    = 'Hbfr_'+guideName+prefix+'GuideRoot'
+        mirrNme  = self.convertRLName(guideName, side_format=1)
+        mirrGde  = ('Hbfr_'+mirrNme+prefix+'GuideRoot', 'Ctl_'+mirrNme+prefix+'GuideStart', 'Ctl_'+mirrNme+prefix+'GuideEnd')
+
+        settings = sym.mirrorGuideSettings(guideType, self.getGuideSettings(guide, sym.MIRROR_SETTINGS[guideType]),
+                                           self.convertRLName)
+        changed  = self.applyGuideSettings(mirrGde[0], settings)
+
+        if guideType == 'slider' and ('guideTracker' in changed or 'XYZ' in changed):
+            guideTrk = settings['guideTracker']
+            if guideTrk and cmds.objExists(guideTrk):
+                self.constrainSldTracker(guide=mirrGde[0], sldTrk=guideTrk, mirror=True)
+
+        return mirrGde, changed
+
+    def getGuideRecords(self, guides=None):
+        '''
+        Returns {guide root : record} with the guides type, name, mirror
+        settings and (2,4,4) start / end world matrices.
+
+        guides = ([]) Guide roots, all guides in the scene if None
+        '''
+        if guides is None:
+            guides = cmds.ls('Hbfr_*_SldGuideRoot', 'Hbfr_*_StrGuideRoot', type='transform')
+
+        records = {}
+        ctls = []
+        for guide in guides:
+            if not cmds.attributeQuery('guideType', node=guide, ex=True):
+                continue
+            guideType = cmds.getAttr(guide+'.guideType')
+            if guideType not in sym.MIRROR_SETTINGS:
+                continue
+            guideName = cmds.getAttr(guide+'.guideName')
+            records[guide] = {'guideType' : guideType,
+                              'guideName' : guideName,
+                              'settings'  : self.getGuideSettings(guide, sym.MIRROR_SETTINGS[guideType])}
+            ctls += self.getGuideCtls(guideType, guideName)
+
+        if records:
+            matrices = self.getTransformsOM(ctls).reshape(-1, 2, 4, 4)
+            for i, guide in enumerate(records):
+                records[guide]['matrices'] = matrices[i]
+
+        return records
+
+    def buildSymmetryIndex(self, axis='yz', plane=None, verbose=True):
+        '''
+        Pairs all L / R guides and compares the mirrored L side with the R side.
+
+        axis    = (str) Plane to mirror across, 'yz', 'zx' or 'xy'
+        plane   = (str, [16]) Optional plane object or matrix to mirror across
+        verbose = (bol) Print the report
+
+        Returns symmetry.SymmetryIndex
+        '''
+        if isinstance(plane, str):
+            plane = self.getTransform(plane)
+
+        index = sym.SymmetryIndex(self.getGuideRecords(), axis=axis, plane=plane)
+        if verbose:
+            buildLog.info(index.report())
+
+        return index
+
+    def mirrorDriftedGuides(self, axis='yz', plane=None, includeUnmatched=True):
+        '''
+        Sync mirrors only the L side guides whose R side drifted,
+        and optionally the L side guides that have no R side yet.
+        '''
+        index = self.buildSymmetryIndex(axis=axis, plane=plane)
+        sources = index.driftedSources(includeUnmatched=includeUnmatched)
+        if sources == []:
+            buildLog.info('All mirrored guides are in sync')
+            return
+
+        self.mirrorGuideMultiple(axis=axis, plane=plane, sync=True, guides=sources)
+
+    def getGuideSettings(self, guide, attrs):
+        '''
+        Returns {attr : value} for the given guide attributes
+
+        guide = (str) Guide root
+        attrs = ([]) Attribute names
+        '''
+        return dict((attr, cmds.getAttr(guide+'.'+attr)) for attr in attrs)
+
+    def applyGuideSettings(self, guide, settings, current=None):
+        '''
+        Sets guide attributes, skipping values that already match.
+        None values are skipped, so unset source values never clear a guide.
+
+        guide    = (str) Guide root
+        settings = ({}) attr : value
+        current  = ({}) attr : value already on the guide, read if None
+
+        Returns list of changed attrs
+        '''
+        if current is None:
+            current = self.getGuideSettings(guide, list(settings))
+
+        changed = []
+        for attr, value in settings.items():
+            if value is None:
+                continue
+            curVal = current.get(attr)
+            if isinstance(value, float) and curVal is not None:
+                if abs(value - curVal) <= 1e-6:
+                    continue
+            elif value == curVal:
+                continue
+
+            if isinstance(value, str):
+                cmds.setAttr(guide+'.'+attr, value, type='string')
+            else:
+                cmds.setAttr(guide+'.'+attr, value)
+            changed.append(attr)
+
+        return changed
+
 
     # Guide Selection
     def getGuideRoot(self, guide=False, select=True):
@@ -1905,98 +3002,82 @@ class VolumeSystemUI(DockableWidget):
     # Load / Save Gides
     def backupGuideDecide(self):
         # New guide backup
-        self.gdeBackupDict = {}
-        slider = cmds.ls('Hbfr_*_SldGuideRoot')
-        stretch = cmds.ls('Hbfr_*_StrGuideRoot')
-        cmds.select(slider, stretch)
-        guideList = cmds.ls(sl=True)
-        sliderList = []
-        stretchList = []
+        guideList = cmds.ls('Hbfr_*_SldGuideRoot', 'Hbfr_*_StrGuideRoot', type='transform')
         if not guideList:
             raise IndexError('No Guides slected for backup')
 
-        for guide in guideList:
-            if cmds.getAttr(guide+'.guideType') == 'slider':
-                sliderList.append(guide)
-            else:
-                stretchList.append(guide)
+        self.gdeBackupDict = self.backupGuidesOM(guideList)
 
-        for guide in sliderList:
-            self.backupGuideSlider(guide)
-        for guide in stretchList:
-            self.backupGuideStretch(guide)
+        fileType = 'Guide JSON (*.json);;Guide Columns (*.npz)'
+        savePath = cmds.fileDialog2(fm=0, okc="Save", fileFilter=fileType, dir=self.getGuideStartingDirectory())
+        if not savePath:
+            return
 
+        guideFile.writeGuideFile(savePath[0], self.gdeBackupDict)
+        if os.path.normpath(savePath[0]).startswith(guideLibrary.LIBRARY_DIR + os.sep):# Saved as a template
+            guideLibrary.getLibrary().refresh()
+        buildLog.info('Seccessfully backed up guide dictionary to %s', savePath[0])
+
+    def getGuideStartingDirectory(self):
+        '''
+        Returns folder the guide file dialogs open in, biped templates of the guide library
+        '''
         dirName = os.path.dirname(__file__)
         startingDirectory = os.path.join(dirName, '../elements/template/biped')
-        fileType = '*.json'
-        savePath = cmds.fileDialog2(fm=0, okc="Save", fileFilter=fileType)
-
-        with open(savePath[0], 'w') as f:
-            data = self.gdeBackupDict
-            json.dump(data, f)
-            print('Seccessfully backed up guide dictionary to', savePath)
-
-    def backupGuideSlider(self, guide):
-        guideChildren = cmds.listRelatives(guide, ad=True, type='transform')
-        guideStart = guideChildren[1]
-        guideEnd = guideChildren[0]
-        guideStartMatrix = list(self.getTransform(guideStart))
-        guideEndMatrix = list(self.getTransform(guideEnd))
-        # guideStartMatrix = [item for items in self.getTransform(guideStart) for item in items] #Flattens matrix to an array
-        # guideEndMatrix = [item for items in self.getTransform(guideEnd) for item in items] #Flattens matrix to an array
-
-        gdeAttrDict = {} # Get guide attrs
-        gdeAttrDict[guide+'.guideType'] = [cmds.getAttr(guide+'.guideType') , cmds.getAttr(guide+'.guideName', type=True)]
-        gdeAttrDict[guide+'.guideName'] = [cmds.getAttr(guide+'.guideName') , cmds.getAttr(guide+'.guideName', type=True)]
-        gdeAttrDict[guide+'.globalScale'] = [cmds.getAttr(guide+'.globalScale') , cmds.getAttr(guide+'.globalScale', type=True)]
-        gdeAttrDict[guide+'.guideParent'] = [cmds.getAttr(guide+'.guideParent') , cmds.getAttr(guide+'.guideParent', type=True)]
-        gdeAttrDict[guide+'.guideTracker'] = [cmds.getAttr(guide+'.guideTracker') , cmds.getAttr(guide+'.guideTracker', type=True)]
-        gdeAttrDict[guide+'.trackerMinRot'] = [cmds.getAttr(guide+'.trackerMinRot') , cmds.getAttr(guide+'.trackerMinRot', type=True)]
-        gdeAttrDict[guide+'.trackerMaxRot'] = [cmds.getAttr(guide+'.trackerMaxRot') , cmds.getAttr(guide+'.trackerMaxRot', type=True)]
-        gdeAttrDict[guide+'.XYZ'] = [cmds.getAttr(guide+'.XYZ') , cmds.getAttr(guide+'.XYZ', type=True)]
-        gdeAttrDict[guide+'.trackerRev'] = [cmds.getAttr(guide+'.trackerRev') , cmds.getAttr(guide+'.trackerRev', type=True)]
-        gdeAttrDict[guide+'.sliderJoint'] = [cmds.getAttr(guide+'.sliderJoint') , cmds.getAttr(guide+'.sliderJoint', type=True)]
-        gdeAttrDict[guide+'.sliderDorito'] = [cmds.getAttr(guide+'.sliderDorito') , cmds.getAttr(guide+'.sliderDorito', type=True)]
+        for folder in [startingDirectory, guideLibrary.LIBRARY_DIR]:
+            if os.path.isdir(folder):
+                return os.path.normpath(folder)
+        return None
 
-        # Matrix need to be added last for restoreGuides()
-        gdeAttrDict[guideStart] = guideStartMatrix
-        gdeAttrDict[guideEnd] = guideEndMatrix
-
-        self.gdeBackupDict[cmds.getAttr(guide+'.guideName')+'_'+cmds.getAttr(guide+'.guideType')] = gdeAttrDict # Add attrs dict to backup dict
-
-    def backupGuideStretch(self, guide):
-        guideChildren = cmds.listRelatives(guide, ad=True, type='transform')
-
-        for child in guideChildren:
-            if child.endswith('Start'):
-                guideStart = child
-            if child.endswith('End'):
-                guideEnd = child
-
-        guideStartMatrix = list(self.getTransform(guideStart))
-        guideEndMatrix = list(self.getTransform(guideEnd))
-        # guideStartMatrix = [item for items in self.getTransform(guideStart) for item in items] #Flattens matrix to an array
-        # guideEndMatrix = [item for items in self.getTransform(guideEnd) for item in items] #Flattens matrix to an array
-
-        gdeAttrDict = {} # Get guide attrs
-        gdeAttrDict[guide+'.guideType'] = [cmds.getAttr(guide+'.guideType') , cmds.getAttr(guide+'.guideName', type=True)]
-        gdeAttrDict[guide+'.guideName'] = [cmds.getAttr(guide+'.guideName') , cmds.getAttr(guide+'.guideName', type=True)]
-        gdeAttrDict[guide+'.globalScale'] = [cmds.getAttr(guide+'.globalScale') , cmds.getAttr(guide+'.globalScale', type=True)]
-        gdeAttrDict[guide+'.startParent'] = [cmds.getAttr(guide+'.startParent') , cmds.getAttr(guide+'.startParent', type=True)]
-        gdeAttrDict[guide+'.endParent'] = [cmds.getAttr(guide+'.endParent') , cmds.getAttr(guide+'.endParent', type=True)]
-        gdeAttrDict[guide+'.snsMultiplier'] = [cmds.getAttr(guide+'.snsMultiplier') , cmds.getAttr(guide+'.snsMultiplier', type=True)]
-        gdeAttrDict[guide+'.enableSns'] = [cmds.getAttr(guide+'.enableSns') , cmds.getAttr(guide+'.enableSns', type=True)]
-        gdeAttrDict[guide+'.twist'] = [cmds.getAttr(guide+'.twist') , cmds.getAttr(guide+'.twist', type=True)]
-        gdeAttrDict[guide+'.strDefPos'] = [cmds.getAttr(guide+'.strDefPos') , cmds.getAttr(guide+'.strDefPos', type=True)]
-        gdeAttrDict[guide+'.stretchDorito'] = [cmds.getAttr(guide+'.stretchDorito') , cmds.getAttr(guide+'.stretchDorito', type=True)]
+    def backupGuidesOM(self, guides):
+        '''
+        Returns backup dict of guides, see restoreGuides(), read in one OpenMaya pass.
+        Attr types come from the guide schema, and the selection is not changed.
+
+        guides = ([str]) Guide roots
+        '''
+        plugReaders = {'string' : lambda plug: plug.asString() or None, # Unset strings are None, as with cmds.getAttr
+                       'float'  : lambda plug: plug.asFloat(),
+                       'double' : lambda plug: plug.asDouble(),
+                       'long'   : lambda plug: plug.asInt(),
+                       'bool'   : lambda plug: plug.asBool()}
+
+        selList = om2.MSelectionList()
+        for guide in guides:
+            selList.add(guide)
+
+        gdeAttrDicts = []
+        ctls = []
+        for i, guide in enumerate(guides):
+            fnNode = om2.MFnDependencyNode(selList.getDependNode(i))
+            guideType = fnNode.findPlug('guideType', False).asString()
+            guideName = fnNode.findPlug('guideName', False).asString()
+
+            gdeAttrDict = {} # Get guide attrs
+            for attr in guideSchema.getSchema(guideType):
+                if attr.backup and fnNode.hasAttribute(attr.name):
+                    gdeAttrDict[guide+'.'+attr.name] = [plugReaders[attr.type](fnNode.findPlug(attr.name, False)), attr.type]
+            gdeAttrDicts.append((guideName+'_'+guideType, gdeAttrDict))
+            ctls += self.getGuideCtls(guideType, guideName)
 
         # Matrix need to be added last for restoreGuides()
-        gdeAttrDict[guideStart] = guideStartMatrix
-        gdeAttrDict[guideEnd] = guideEndMatrix
+        matrices = self.getTransformsOM(ctls).reshape(-1, 16).tolist()
+        gdeBackupDict = {}
+        for i, (key, gdeAttrDict) in enumerate(gdeAttrDicts):
+            gdeAttrDict[ctls[i*2]] = matrices[i*2]
+            gdeAttrDict[ctls[i*2+1]] = matrices[i*2+1]
+            gdeBackupDict[key] = gdeAttrDict # Add attrs dict to backup dict
 
-        self.gdeBackupDict[cmds.getAttr(guide+'.guideName')+'_'+cmds.getAttr(guide+'.guideType')] = gdeAttrDict # Add attrs dict to backup dict
+        return gdeBackupDict
+
+    def getGuideCtls(self, guideType, guideName):
+        '''
+        Returns [start ctl, end ctl] names of a guide
+        '''
+        return list(guideFile.guideNodeNames(guideType, guideName)[1:])
 
-    def restoreGuides(self, fromFile=None):
+    @volumeProfiling.profiled()
+    def restoreGuides(self, fromFile=None, gdeBackupDict=None):
         ''' #gdeBackupDict example:
 
         OrderedDict([('L_TestSys_slider',
@@ -2020,107 +3101,257 @@ class VolumeSystemUI(DockableWidget):
         '''
 
         # Load fromFile arg
-        gdeBackupDict = {}
-        if fromFile:# From postbuild script
-            gdeBackupDict = json.load(open(fromFile))
+        if gdeBackupDict is not None:# Already loaded, ie. from the guide library
+            pass
+        elif fromFile:# From postbuild script, .json or .npz
+            with volumeProfiling.scope('read', fromFile):
+                gdeBackupDict = guideFile.readGuideFile(fromFile)
         else:# From UI
-            dirName = os.path.dirname(__file__)
-            startingDirectory = os.path.join(dirName, '../elements/template/biped')
-            fileType = '*.json'
-            loadPath = cmds.fileDialog2(fm=1, okc="Load", fileFilter=fileType)
-            gdeBackupDict = json.load(open(loadPath[0]))
+            fileType = 'Guide Files (*.json *.npz)'
+            loadPath = cmds.fileDialog2(fm=1, okc="Load", fileFilter=fileType, dir=self.getGuideStartingDirectory())
+            if not loadPath:
+                return
+            with volumeProfiling.scope('read', loadPath[0]):
+                gdeBackupDict = guideFile.readGuideFile(loadPath[0])
 
 
-        # Load guides
+        # Load guides, in one undo chunk
+        cmds.undoInfo(openChunk=True, chunkName='restoreGuides')
+        try:
+            report = self.restoreGuideRecords(gdeBackupDict)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+        self.printRestoreReport(report)
+        self.restoreReport = report
+
+        cmds.select(None)
+        self.refreshUI()
+
+        return report
+
+    def restoreGuideRecords(self, gdeBackupDict):
+        '''
+        Creates the guides of a backup dict, see restoreGuides(). A guide that
+        fails is reported and its partly built nodes are deleted, guides that
+        already exist are skipped.
+
+        Returns restore report, [{'guide', 'time', 'error'}]
+        '''
         if not cmds.objExists('volumeGuides'):
             cmds.createNode('transform', n='volumeGuides')
 
-        for key,value in gdeBackupDict.items():
-            guideType = key.split('_')[-1] #key = 'L_TestSys_slider'
-            guideName = key[:-(len(guideType)+1)]
-            items = list(value.items())
-
-            if guideType == 'slider':
-                #___________________________________
-                for item in items:# Create new guide
-                    if '.globalScale' in list(item)[0]:#get correct tuple (attr, [attrVal, attrTyp])
-                        globalScl = item[1][0] # [attrVal, attrTyp]
-                        newGde = self.createSliderGuide(guideName, globalScl)
-                #___________________________________
-                for item in items[:-2]:# Skip guide position attrs
-                    attr    = item[0]
-                    attrVal = item[1][0]
-                    attrTyp = item[1][1]
-                    if attrVal != None:
-                        if attrTyp == 'string':# Can only set Type, if type == string
-                            cmds.setAttr(attr, l=False)
-                            cmds.setAttr(attr, attrVal, type='string')
-                        else:
-                            cmds.setAttr(attr, l=False)
-                            cmds.setAttr(attr, attrVal)
-                #___________________________________
-                hbfr = items[0][0].split('.')[0]
-                for item in items:# Set guide tracker constraint
-                    if '.guideTracker' in list(item)[0]:#get correct tuple (attr, [attrVal, attrTyp])
-                        tracker = item[1][0] # [attrVal, attrTyp]
-                        if tracker != None:
-                            if cmds.objExists(tracker):
-                                self.selGdeGlobSld = hbfr
-                                self.constrainSldTracker(guide=newGde[0], sldTrk=tracker)
-                #___________________________________
-                for item in items:# Set tracker axis
-                    if '.XYZ' in list(item)[0]:#get correct tuple (attr, [attrVal, attrTyp])
-                        axis = item[1][0] # [attrVal, attrTyp]
-                        axisDict = {0:'X', 1:'Y', 2:'Z'}
-                        try:
-                            a = axisDict.get(axis)
-                            cmds.connectAttr(f'twist_{guideName}_gdeExtract_twistExtractor_q2e.outputRotate.outputRotate{a}',
-                                             f'Hbfr_{guideName}_SldGuideRoot.currentValRef', f=True)
-                        except:
-                            pass
-                #___________________________________
-                for item in items[-2:]:# Guide position attrs
-                    ctl     = item[0]
-                    attrVal = item[1]
-                    if attrVal != None:
-                        self.setTransformFromMatrix(attrVal, ctl) # Slider start position
-                #___________________________________
-                orig = hbfr.replace('Hbfr_', 'Orig_')
-                cmds.parent(orig, 'volumeGuides')
-
-
-            if guideType == 'stretch':
-                #___________________________________
-                for item in items:# Create new guide
-                    if '.globalScale' in list(item)[0]:#get correct tuple (attr, [attrVal, attrTyp])
-                        globalScl = item[1][0] # [attrVal, attrTyp]
-                        newGde = self.createStretchGuide(guideName, globalScl) # guideName , globScl
-                #___________________________________
-                for item in items[:-2]:# Skip guide position attrs
-                    attr    = item[0]
-                    attrVal = item[1][0]
-                    attrTyp = item[1][1]
-                    if attrVal != None:
-                        if attrTyp == 'string':# Can only set Type, if type == string
-                            cmds.setAttr(attr, l=False)
-                            cmds.setAttr(attr, attrVal, type='string')
-                        else:
-                            cmds.setAttr(attr, l=False)
-                            cmds.setAttr(attr, attrVal)
-                #___________________________________
-                for item in items[-2:]:# Guide position attrs
-                    ctl     = item[0]
-                    attrVal = item[1]
-                    if attrVal != None:
-                        self.setTransformFromMatrix(attrVal, ctl) # Slider start position
-                #___________________________________
-                hbfr = items[0][0].split('.')[0]
-                orig = hbfr.replace('Hbfr_', 'Orig_')
-                cmds.parent(orig, 'volumeGuides')
+        report = []
+        created = [] # (record, newGde, report entry)
+        for key, gdeAttrDict in gdeBackupDict.items():# Each guide is parsed once, into a typed record
+            start = time.perf_counter()
+            entry = {'guide':key, 'time':0.0, 'error':None}
+            report.append(entry)
+            building = False
+            try:
+                with volumeProfiling.scope('create', key):
+                    record = guideFile.GuideRecord(key, gdeAttrDict)
+                    if record.guideType not in ['slider', 'stretch']:
+                        raise ValueError('Unknown guide type %r' % record.guideType)
+                    orig = guideFile.guideNodeNames(record.guideType, record.guideName)[0].replace('Hbfr_', 'Orig_')
+                    if cmds.objExists(orig):# Maya would rename the new guide
+                        raise ValueError('Guide %s already exists' % orig)
+                    building = True
+                    if record.guideType == 'slider':
+                        newGde = self.createSliderGuide(record.guideName, record.settings.get('globalScale', 1.0), record.settings)
+                    else:
+                        newGde = self.createStretchGuide(record.guideName, record.settings.get('globalScale', 1.0), record.settings)
+                created.append((record, newGde, entry))
+            except (RuntimeError, ValueError) as error:
+                entry['error'] = str(error)
+                if building:
+                    self.deletePartialGuide(record.guideType, record.guideName)
+            entry['time'] += time.perf_counter() - start
+
+        if created:
+            # Batched writes, guide hierarchy and start / end matrices
+            start = time.perf_counter()
+            with volumeProfiling.scope('place'):
+                cmds.parent([newGde[0].replace('Hbfr_', 'Orig_') for record, newGde, entry in created], 'volumeGuides')
+                matrices = np.concatenate([record.matrices for record, newGde, entry in created])
+                self.setTransformsFromMatrices(matrices, [ctl for record, newGde, entry in created for ctl in newGde[1:]])
+            batchTime = (time.perf_counter() - start) / len(created)
+
+            for record, newGde, entry in created:
+                start = time.perf_counter()
+                if record.guideType == 'slider':
+                    try:
+                        with volumeProfiling.scope('tracker', record.key):
+                            self.restoreSliderTracker(newGde[0], record)
+                    except (RuntimeError, TypeError) as error:
+                        entry['error'] = 'Tracker: %s' % error
+                entry['time'] += time.perf_counter() - start + batchTime
+
+        return report
+
+    def deletePartialGuide(self, guideType, guideName):
+        '''
+        Deletes the nodes of a guide whose creation failed part way
+        '''
+        nodes = [guideFile.guideNodeNames(guideType, guideName)[0].replace('Hbfr_', 'Orig_')]
+        if guideType == 'slider':# Parented under the guide last
+            nodes.append('angBet_'+guideName+'_gdeRoot')
+        nodes = cmds.ls(nodes)
+        if nodes:
+            cmds.delete(nodes, hierarchy=True)
+
+    def loadLibraryGuides(self, template=None, pattern=None, side=None, guideType=None):
+        '''
+        Restores guides from a guide library template, see guideLibrary.
+        Only the matching guides are read from the template file.
+
+        template  = (str) Template name, 'biped', picked in a dialog if None
+        pattern   = (str) Regex searched in guide names, asked for if template is None
+        side      = (str) Side token, 'L', 'R', 'M'
+        guideType = (str) 'slider' or 'stretch'
+
+        Returns restore report, see restoreGuides()
+        '''
+        library = guideLibrary.getLibrary()
+        if template is None:
+            templates = library.templates()
+            if templates == []:
+                cmds.warning('No guide templates in %s' % library.root)
+                return None
+            template, ok = QInputDialog.getItem(self, 'Guide Library', 'Template:', templates, 0, False)
+            if not ok:
+                return None
+            result = cmds.promptDialog(t='Guide Library', m='Guide name filter (regex, empty for all):', b=['Load', 'Cancel'], db='Load', cb='Cancel', ds='Cancel')
+            if result != 'Load':
+                return None
+            pattern = cmds.promptDialog(q=True, text=True) or None
+
+        keys = library.guides(template, pattern, guideType, side)
+        if keys == []:
+            cmds.warning('No guides in template %s match' % template)
+            return None
+        return self.restoreGuides(gdeBackupDict=library.loadGuides(template, keys))
+
+    def mergeGuides(self, fromFile=None, removeExtras=False, confirm=True):
+        '''
+        Merges a guide file into the scene instead of recreating every guide.
+        The file is diffed against the guides in the scene, see guideDiff, and only
+        missing guides are created, changed attrs and matrices updated, and
+        optionally guides missing from the file removed.
+        The diff is previewed, and applied in one undo chunk.
+
+        fromFile     = (str) .json or .npz guide file, file dialog if None
+        removeExtras = (bol) Delete scene guides that are not in the file
+        confirm      = (bol) Ask before applying the previewed diff
+
+        Returns GuideDiff
+        '''
+        if fromFile is None:
+            loadPath = cmds.fileDialog2(fm=1, okc="Merge", fileFilter='Guide Files (*.json *.npz)', dir=self.getGuideStartingDirectory())
+            if not loadPath:
+                return None
+            fromFile = loadPath[0]
+
+        fileRecords = list(guideFile.iterGuideRecords(guideFile.readGuideFile(fromFile)))
+        liveGuides = cmds.ls('Hbfr_*_SldGuideRoot', 'Hbfr_*_StrGuideRoot', type='transform')
+        liveRecords = list(guideFile.iterGuideRecords(self.backupGuidesOM(liveGuides))) if liveGuides else []
+        diff = guideDiff.GuideDiff(fileRecords, liveRecords)
+
+        preview = diff.report(removeExtras)
+        buildLog.info(preview)
+        if diff.isEmpty(removeExtras):
+            return diff
+
+        if confirm:
+            lines = preview.split('\n')
+            if len(lines) > 40:
+                lines = lines[:40] + ['  ... %s more, see script editor' % (len(lines) - 40)]
+            result = cmds.confirmDialog(t='Merge Guides', m='\n'.join(lines), b=['Apply', 'Cancel'], db='Apply', cb='Cancel', ds='Cancel')
+            if result != 'Apply':
+                return diff
+
+        cmds.undoInfo(openChunk=True, chunkName='mergeGuides')
+        try:
+            self.applyGuideDiff(diff, removeExtras)
+        finally:
+            cmds.undoInfo(closeChunk=True)
 
         cmds.select(None)
         self.refreshUI()
 
+        return diff
+
+    def applyGuideDiff(self, diff, removeExtras=False):
+        '''
+        Applies a GuideDiff to the scene. Guides are created, set and placed
+        through cmds only, applyGuideSchema and createGuideCurve included, so
+        the merge undoes in the one chunk mergeGuides opens around it.
+        '''
+        if not cmds.objExists('volumeGuides'):
+            cmds.createNode('transform', n='volumeGuides')
+
+        for record in diff.create:
+            if record.guideType == 'slider':
+                newGde = self.createSliderGuide(record.guideName, record.settings.get('globalScale', 1.0), record.settings)
+            else:
+                newGde = self.createStretchGuide(record.guideName, record.settings.get('globalScale', 1.0), record.settings)
+            cmds.parent(newGde[0].replace('Hbfr_', 'Orig_'), 'volumeGuides')
+            for ctl, matrix in zip(newGde[1:], record.matrices):
+                self.setTransformFromMatrix(matrix.flatten().tolist(), ctl)
+            if record.guideType == 'slider':
+                self.mergeSliderTracker(newGde[0], record)
+
+        for fileRecord, liveRecord, attrs, matrices in diff.update:
+            guide = liveRecord.root
+            settings = dict((attr, new) for attr, (old, new) in attrs.items())
+            tracker = settings.pop('guideTracker', None)
+            self.applyGuideSettings(guide, settings)
+            if fileRecord.guideType == 'slider' and (tracker or 'XYZ' in settings):# Constraint follows tracker and axis
+                self.mergeSliderTracker(guide, fileRecord)
+            if matrices:
+                for ctl, matrix in zip(liveRecord.ctls, fileRecord.matrices):# Start first, slider end is its child
+                    self.setTransformFromMatrix(matrix.flatten().tolist(), ctl)
+
+        if removeExtras and diff.remove:
+            cmds.delete([record.root.replace('Hbfr_', 'Orig_') for record in diff.remove], hierarchy=True)
+
+    def mergeSliderTracker(self, guide, record):
+        # A missing tracker does not stop the merge
+        try:
+            self.restoreSliderTracker(guide, record)
+        except (RuntimeError, TypeError) as error:
+            cmds.warning('%s tracker not restored: %s' % (record.key, error))
+
+    def restoreSliderTracker(self, guide, record):
+        '''
+        Constrains a restored slider guide to its tracker, and connects the
+        current value of the tracker axis
+        '''
+        tracker = record.settings.get('guideTracker')
+        if tracker is None:
+            return
+        if not cmds.objExists(tracker):
+            raise RuntimeError('Tracker %s does not exist' % tracker)
+
+        self.selGdeGlobSld = guide
+        self.constrainSldTracker(guide=guide, sldTrk=tracker)
+
+        axis = {0:'X', 1:'Y', 2:'Z'}[record.settings.get('XYZ', 1)]
+        twistOut = 'twist_%s_gdeExtract_twistExtractor_q2e.outputRotate.outputRotate%s' % (record.guideName, axis)
+        cmds.connectAttr(twistOut, guide+'.currentValRef', f=True)
+
+    def printRestoreReport(self, report):
+        '''
+        Logs restore summary and failed guides, per guide times at DEBUG
+        '''
+        failed = [entry for entry in report if entry['error']]
+        with buildLog.buffered():
+            buildLog.info('Restored %s of %s guide(s) in %.3fs', len(report) - len(failed), len(report), sum(entry['time'] for entry in report))
+            for entry in report:
+                if entry['error']:
+                    buildLog.warning('%-40s FAILED  %s', entry['guide'], entry['error'])
+                else:
+                    buildLog.debug('  %-40s %8.1fms', entry['guide'], entry['time'] * 1000.0)
 
 
     def newDefCheck(self, guideType, guideName):
@@ -2248,9 +3479,9 @@ class VolumeSystemUI(DockableWidget):
                                 cmds.connectAttr(globalObj+'.sx', nde+'.snsSysGlobalScale', f=True)
                         else:
                             cmds.connectAttr(globalObj+'.sx', nde+'.snsSysGlobalScale', f=True)
-            print('***** Volume Sys Global Scale - Done *****')
+            buildLog.debug('Global scale connected to %s', globalObj)
         else:
-            print('Global scale obj not found in the scene')
+            buildLog.warning('Global scale obj %s not found in the scene', globalObj)
 
     def angleRefresh(self, guide, currentValDoubleSpineBox):
         if guide == None:
@@ -2287,59 +3518,11 @@ class VolumeSystemUI(DockableWidget):
         Convert L to R and vise versa
         
         name (str) Strint to convert
-        side_format = (int) Pick l/r naming convention
+        side_format = (int) Pick l/r naming convention, see sideNaming.CONVENTIONS
+                      0 = 'arm_L_jnt', 1 = 'L_arm', 2 = 'arm_L'
+        Names without a side token are returned unchanged.
         '''
-        # if name == "L":
-        #     return "R"
-        # elif name == "R":
-        #     return "L"
-
-        format_list = [
-        ['_l_', '_L_', '_r_', '_R_'],
-        ['l_', 'L_', 'r_', 'R_'],
-        ['_l', '_L', '_r', '_R'],
-        ]
-
-
-        # Test to see if name contains l/r.
-        if [s for s in format_list[side_format] if s in name] == []:
-            return name
-
-
-        for side in format_list[side_format]:
-            if side in name:
-                letter = [char for char in side if char.isalpha()][0]
-                if letter.isupper():
-                    re_str = "_[RL][0-9]+_|^[RL][0-9]+_|_[RL][0-9]+$|_[RL]_|^[RL]_|_[RL]$"
-                    rePattern = re.compile(re_str)
-
-                    reMatch = re.search(rePattern, name)
-                    if reMatch:
-                        instance = reMatch.group(0)
-                        if instance.find("R") != -1:
-                            rep = instance.replace("R", "L")
-                        else:
-                            rep = instance.replace("L", "R")
-
-                        name = re.sub(rePattern, rep, name)
-                        return name
-
-                else:
-                    re_str = "_[rl][0-9]+_|^[rl][0-9]+_|_[rl][0-9]+$|_[rl]_|^[rl]_|_[rl]$"
-                    rePattern = re.compile(re_str)
-
-                    reMatch = re.search(rePattern, name)
-                    if reMatch:
-                        instance = reMatch.group(0)
-                        if instance.find("R") != -1:
-                            rep = instance.replace("r", "l")
-                        else:
-                            rep = instance.replace("l", "r")
-
-                        name = re.sub(rePattern, rep, name)
-                        return name
-
-        
+        return sideNaming.convertName(name, side_format)
 
     def extractTwist(self, root, tip, axis, name='', scaleSupport=False):
         # get the worldMatrix for root and tip, without the scale
@@ -2372,6 +3555,40 @@ class VolumeSystemUI(DockableWidget):
         cmds.connectAttr(outQuat + '.outputQuatW', output + '.inputQuatW')
         return output + '.outputRotate'+axis.upper()
 
+    def verifyTwistEngine(self, samples=100, seed=0):
+        '''
+        Compares swingTwist.extractTwist() to extractTwist() networks, one per
+        axis, on a temporary root / tip posed with random rotations. The
+        temporary nodes are deleted after.
+
+        Returns {axis : largest difference in degrees}
+        '''
+        if not cmds.pluginInfo('quatNodes', q=True, loaded=True):
+            cmds.loadPlugin('quatNodes')
+
+        rng = np.random.RandomState(seed)
+        root = cmds.createNode('transform', n='twistVerify_root', ss=True)
+        tip = cmds.createNode('transform', n='twistVerify_tip', p=root, ss=True)
+        cmds.setAttr(root+'.rotate', *rng.uniform(-180.0, 180.0, 3).tolist())
+        try:
+            outputs = dict((axis, self.extractTwist(root, tip, axis, name='twistVerify_'+axis)) for axis in 'xyz')
+            tipMats, rootMats, values = [], [], []
+            for rotation in rng.uniform(-180.0, 180.0, (samples, 3)).tolist():
+                cmds.setAttr(tip+'.rotate', *rotation)
+                tipMats.append(cmds.getAttr(tip+'.worldMatrix'))
+                rootMats.append(cmds.getAttr(root+'.worldMatrix'))
+                values.append([cmds.getAttr(outputs[axis]) for axis in 'xyz']) # Degrees, UI angle unit
+        finally:
+            cmds.delete(cmds.ls('twistVerify_*'))
+
+        values = np.array(values)
+        errors = {}
+        for i, axis in enumerate('xyz'):
+            twist = np.degrees(swingTwist.extractTwist(tipMats, rootMats, axis))
+            errors[axis] = float(np.abs((twist - values[:, i] + 180.0) % 360.0 - 180.0).max())
+        buildLog.info('Twist engine: %s samples, max difference x %g, y %g, z %g degrees', samples, errors['x'], errors['y'], errors['z'])
+        return errors
+
     def getTransform(self, node):
         """Return the transformation matrix of the dagNode in worldSpace.
 
@@ -2388,13 +3605,8 @@ class VolumeSystemUI(DockableWidget):
         objList = ([]) List of objects to mirror
         axis    = ('') Axis to mirror on, x,y,z
         '''
-        axisDict = {}
-        axisDict['yz'] = [-1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
-        axisDict['zx'] = [1, 0, 0, 0, 0, -1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
-        axisDict['xy'] = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, -1, 0, 0, 0, 0, 1]
-
         mat1 = MMatrix(t)
-        mat2 = MMatrix(axisDict.get(axis))
+        mat2 = MMatrix(sym.MIRROR_AXES.get(axis))
         t = (mat1 * mat2)
 
         return t
@@ -2412,6 +3624,92 @@ class VolumeSystemUI(DockableWidget):
         """
         cmds.xform(target, ws=True, m=matrix)
 
+    def getTransformsOM(self, nodes):
+        """Return the world space matrices of many dagNodes in one pass.
+
+        Arguments:
+            nodes (list): Unique dagNode names
+
+        Returns:
+            array: (N, 4, 4) transformation matrices
+        """
+        selList = om2.MSelectionList()
+        for node in nodes:
+            selList.add(node)
+
+        matrices = np.empty((len(nodes), 4, 4))
+        for i in range(len(nodes)):
+            matrices[i] = np.reshape(list(selList.getDagPath(i).inclusiveMatrix()), (4, 4))
+
+        return matrices
+
+    def getJointHierarchyOM(self, joints):
+        '''
+        Returns ({joint : parent}, {joint : first child joint}) in one pass.
+        Joints without a parent or child joint map to None.
+
+        joints = ([str]) Joints
+        '''
+        selList = om2.MSelectionList()
+        for joint in joints:
+            selList.add(joint)
+
+        parents = {}
+        children = {}
+        for i, joint in enumerate(joints):
+            fnDag = om2.MFnDagNode(selList.getDagPath(i))
+
+            parents[joint] = None
+            if fnDag.parentCount():
+                parentObj = fnDag.parent(0)
+                if not parentObj.hasFn(om2.MFn.kWorld):
+                    parents[joint] = om2.MFnDagNode(parentObj).partialPathName()
+
+            children[joint] = None
+            for c in range(fnDag.childCount()):
+                childObj = fnDag.child(c)
+                if childObj.hasFn(om2.MFn.kJoint):
+                    children[joint] = om2.MFnDagNode(childObj).partialPathName()
+                    break
+
+        return parents, children
+
+    def setTransformsFromMatrices(self, matrices, targets):
+        """Sets many dagNode transformations in world space.
+
+        Local matrices are solved against the parents world matrix. If a
+        parent is also a target, its new matrix is used, so a child and its
+        parent can be written in the same batch. Each local matrix is set
+        with cmds.xform, so the batch is undoable.
+        Meant for plain transforms such as guide controls, joint orients and
+        pivots are not compensated for.
+
+        Arguments:
+            matrices ((N, 4, 4) or [[16]]): World space matrices
+            targets (list): Unique dagNode names, in matching order
+
+        Returns:
+            None
+
+        """
+        matrices = sym.asMatrixArray(matrices)
+
+        selList = om2.MSelectionList()
+        for target in targets:
+            selList.add(target)
+
+        dagPaths = [selList.getDagPath(i) for i in range(len(targets))]
+        newWorld = dict((dagPath.fullPathName(), matrices[i]) for i, dagPath in enumerate(dagPaths))
+
+        for i, dagPath in enumerate(dagPaths):
+            parentPath = dagPath.fullPathName().rpartition('|')[0]
+            if parentPath in newWorld:
+                parentMatrix = newWorld[parentPath]
+            else:
+                parentMatrix = np.reshape(list(dagPath.exclusiveMatrix()), (4, 4))
+            local = matrices[i] @ np.linalg.inv(parentMatrix)
+            cmds.xform(dagPath.fullPathName(), os=True, m=local.flatten().tolist())
+
     def parentConstraint(self, parent, child, t=['x','y','z'], r=['x','y','z'], s=['x','y','z'], mo=True):
         '''
         Node based parent constraint.